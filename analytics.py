@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Position analytics over archived Tic Tac Toe games
+Replays game-log records through the TicTacToe rules in chunks and builds
+per-position and per-first-move outcome tables.  Partial results from
+separate chunks or processes merge into one.
+"""
+
+import argparse
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+import gamelog
+from bitboard import canonical
+from tic_tac_toe import TicTacToe
+
+
+# Column layout of the count lists in the tables below.
+GAMES, X_WINS, O_WINS, DRAWS, MOVES = range(5)
+_OUTCOME = {'X': X_WINS, 'O': O_WINS, None: DRAWS}
+
+
+@dataclass
+class Analytics:
+    """Aggregate tables for one board geometry; mergeable across chunks.
+
+    positions maps a position key to [games, x_wins, o_wins, draws, moves]
+    counted over every game that passed through it.  On the 3x3 board the
+    key is bitboard.canonical's exact symmetry-reduced key, so all 765
+    classes fit; larger boards key on the game's 64-bit canonical Zobrist
+    hash and stop adding new positions once max_positions is reached (later
+    ones are counted in dropped).
+    first_moves holds the same counts per opening cell.
+    """
+
+    size: int = 3
+    win_length: int = 3
+    max_positions: int = 1_000_000
+    games: int = 0
+    invalid: int = 0
+    unfinished: int = 0
+    dropped: int = 0
+    positions: Dict[int, List[int]] = field(default_factory=dict)
+    first_moves: Dict[int, List[int]] = field(default_factory=dict)
+
+    def _count(self, table: Dict[int, List[int]], key: int, outcome: int, length: int) -> None:
+        counts = table.get(key)
+        if counts is None:
+            if table is self.positions and len(table) >= self.max_positions:
+                self.dropped += 1
+                return
+            counts = table[key] = [0, 0, 0, 0, 0]
+        counts[GAMES] += 1
+        counts[outcome] += 1
+        counts[MOVES] += length
+
+    def add_game(self, moves: Sequence[int], game: Optional[TicTacToe] = None) -> None:
+        """Replay one game's cell indices and count it.
+
+        Games with an illegal move or a move after the end are counted in
+        invalid, games that stop before a result in unfinished.
+        """
+        game = game or TicTacToe(self.size, self.win_length)
+        game.reset()
+        size = self.size
+        standard = size == 3 and self.win_length == 3
+        bits = game.bitboard
+        keys = []
+        for cell in moves:
+            if game.game_over or not game.make_move(*divmod(cell, size)):
+                self.invalid += 1
+                return
+            if standard:
+                keys.append(canonical(bits.x, bits.o)[0])
+            else:
+                keys.append(game.canonical_hash)
+            winner = game.check_winner()
+            if winner:
+                game.game_over = True
+                game.winner = winner
+            elif game.is_board_full():
+                game.game_over = True
+            else:
+                game.switch_player()
+        if not game.game_over:
+            self.unfinished += 1
+            return
+        self.games += 1
+        outcome = _OUTCOME[game.winner]
+        length = len(moves)
+        self._count(self.first_moves, moves[0], outcome, length)
+        for key in keys:
+            self._count(self.positions, key, outcome, length)
+
+    def add_games(self, games: Iterable[Sequence[int]]) -> None:
+        """Replay and count many games, reusing one TicTacToe object."""
+        game = TicTacToe(self.size, self.win_length)
+        for moves in games:
+            self.add_game(moves, game)
+
+    def merge(self, other: 'Analytics') -> None:
+        """Fold another set of tables for the same geometry into this one."""
+        if (other.size, other.win_length) != (self.size, self.win_length):
+            raise ValueError("cannot merge analytics for different board geometries")
+        self.games += other.games
+        self.invalid += other.invalid
+        self.unfinished += other.unfinished
+        self.dropped += other.dropped
+        for key, counts in other.first_moves.items():
+            self._merge_counts(self.first_moves, key, counts)
+        for key, counts in other.positions.items():
+            self._merge_counts(self.positions, key, counts)
+
+    def _merge_counts(self, table: Dict[int, List[int]], key: int, counts: List[int]) -> None:
+        mine = table.get(key)
+        if mine is None:
+            if table is self.positions and len(table) >= self.max_positions:
+                self.dropped += counts[GAMES]
+                return
+            table[key] = list(counts)
+        else:
+            for i, value in enumerate(counts):
+                mine[i] += value
+
+    def first_move_report(self) -> List[str]:
+        """One line per opening cell: games, outcome rates, average length."""
+        lines = [f"{'move':>7} {'games':>10} {'X win':>7} {'O win':>7} {'draw':>7} {'length':>7}"]
+        for cell, counts in sorted(self.first_moves.items()):
+            games = counts[GAMES]
+            row, col = divmod(cell, self.size)
+            lines.append(f"{row + 1:>3} {col + 1:<3} {games:>10} "
+                         f"{counts[X_WINS] / games:>7.1%} {counts[O_WINS] / games:>7.1%} "
+                         f"{counts[DRAWS] / games:>7.1%} {counts[MOVES] / games:>7.2f}")
+        return lines
+
+    def summary(self) -> str:
+        """Return a one-line overview of what was counted."""
+        return (f"{self.games} games ({self.invalid} invalid, {self.unfinished} unfinished), "
+                f"{len(self.positions)} distinct positions, {self.dropped} dropped")
+
+
+def _analyze_chunk(games: List[Sequence[int]], size: int, win_length: int,
+                   max_positions: int) -> Analytics:
+    """Worker entry point: count one chunk of games."""
+    result = Analytics(size, win_length, max_positions)
+    result.add_games(games)
+    return result
+
+
+def _chunks(games: Iterable[Sequence[int]], chunk_size: int) -> Iterator[List[Sequence[int]]]:
+    iterator = iter(games)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def analyze(games: Iterable[Sequence[int]], size: int = 3, win_length: Optional[int] = None,
+            workers: int = 1, chunk_size: int = 50_000,
+            max_positions: int = 1_000_000) -> Analytics:
+    """Aggregate a stream of games (e.g. gamelog.iter_games) chunk by chunk.
+
+    At most 2 * workers chunks are in flight at once, so memory stays
+    bounded by the chunk size and the tables however long the stream is.
+    With workers=1 everything runs in-process.
+    """
+    if win_length is None:
+        win_length = size
+    total = Analytics(size, win_length, max_positions)
+    if workers == 1:
+        for chunk in _chunks(games, chunk_size):
+            total.add_games(chunk)
+        return total
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        for chunk in _chunks(games, chunk_size):
+            pending.append(pool.submit(_analyze_chunk, chunk, size, win_length, max_positions))
+            if len(pending) >= 2 * workers:
+                total.merge(pending.pop(0).result())
+        for future in pending:
+            total.merge(future.result())
+    return total
+
+
+def analyze_log(path: str, workers: int = 1, chunk_size: int = 50_000,
+                max_positions: int = 1_000_000) -> Analytics:
+    """Aggregate every game in a game-log segment."""
+    with gamelog.GameLog(path) as log:
+        size, win_length = log.size, log.win_length
+    return analyze(gamelog.iter_games(path), size, win_length, workers, chunk_size,
+                   max_positions)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Outcome tables for a Tic Tac Toe game log")
+    parser.add_argument('log', help="game-log segment written by gamelog.py")
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--chunk-size', type=int, default=50_000)
+    parser.add_argument('--max-positions', type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+
+    result = analyze_log(args.log, args.workers, args.chunk_size, args.max_positions)
+    print(result.summary())
+    for line in result.first_move_report():
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Shared-memory session arena for Tic Tac Toe
+Stores many games as fixed-width records in one multiprocessing.shared_memory
+block, so any worker process that attaches can read and play any session in
+place and a session survives the process that created it.
+
+Layout: a 16-byte arena header (magic, version, slots, size, win_length,
+record size), then one record per slot:
+
+    state      u8   FREE or ACTIVE
+    player     u8   b'X' or b'O', the side to move
+    game_over  u8   0 or 1
+    winner     u8   0, b'X' or b'O'
+    moves      u16  marks on the board
+    reserved   u16
+    generation u32  bumped every time the slot is claimed
+    cells      size * size bytes of b' ', b'X' or b'O' in row order
+
+padded to a multiple of 8 bytes.  Slot i is guarded by lock i % stripes
+(multiprocessing locks made by the creator and handed to the workers it
+starts), so moves in different stripes never wait for each other.  A game
+is addressed by a Session(slot, generation) token, checked under the lock
+on every operation, so a process holding the token of a game that has been
+released or reset cannot touch whatever game uses the slot now.
+"""
+
+import struct
+from collections import namedtuple
+from multiprocessing import Lock, shared_memory
+from typing import List, Optional, Sequence, Tuple
+
+from tic_tac_toe import TicTacToe
+
+
+MAGIC = b'TTTA'
+VERSION = 1
+
+ARENA_HEADER = struct.Struct('<4sHIHHI')
+RECORD_HEADER = struct.Struct('<BBBBHHI')
+
+FREE, ACTIVE = 0, 1
+EMPTY, X, O = ord(' '), ord('X'), ord('O')
+
+# Fields of RECORD_HEADER, as offsets into a record.
+_STATE, _PLAYER, _GAME_OVER, _WINNER, _MOVES, _GENERATION = 0, 1, 2, 3, 4, 8
+_U32 = struct.Struct('<I')
+
+_DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+# A game in the arena: its slot and the generation it was claimed or reset in.
+Session = namedtuple('Session', ['slot', 'generation'])
+
+# A copy of one record; cells is a bytes object of size * size marks.
+GameState = namedtuple('GameState', ['cells', 'current_player', 'game_over', 'winner',
+                                     'moves', 'generation'])
+
+
+class SessionArena:
+    """Fixed-width game records in shared memory.
+
+    Create one with SessionArena.create() in the parent process, start the
+    workers with arena.handle() and have each call SessionArena.attach() on
+    it.  claim() takes a free slot for a new game and returns its Session
+    token, make_move() plays in place under the slot's lock, state() copies
+    a record out and cells() is a zero-copy memoryview of a board.  Every
+    operation on a session raises ValueError once its slot has been
+    released or reset.  The creator calls unlink() (or leaves a with block)
+    when the arena is no longer needed; everyone else calls close().  Views
+    handed out must be released before closing.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, locks: Sequence, owner: bool):
+        self._shm = shm
+        self._buf = shm.buf
+        magic, version, slots, size, win_length, record_size = ARENA_HEADER.unpack_from(self._buf)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"shared memory {shm.name!r} is not a version {VERSION} session arena")
+        self.slots = slots
+        self.size = size
+        self.win_length = win_length
+        self.record_size = record_size
+        self.locks = list(locks)
+        self.owner = owner
+        # Where this process starts looking for a free slot.
+        self._hint = 0
+
+    @classmethod
+    def create(cls, slots: int = 1024, size: int = 3, win_length: Optional[int] = None,
+               stripes: int = 64, name: Optional[str] = None) -> 'SessionArena':
+        """Allocate and initialise a new arena with every slot free."""
+        if win_length is None:
+            win_length = size
+        if not 1 <= win_length <= size:
+            raise ValueError(f"win_length must be between 1 and {size}")
+        record_size = -(-(RECORD_HEADER.size + size * size) // 8) * 8
+        shm = shared_memory.SharedMemory(name=name, create=True,
+                                         size=ARENA_HEADER.size + slots * record_size)
+        ARENA_HEADER.pack_into(shm.buf, 0, MAGIC, VERSION, slots, size, win_length, record_size)
+        # New shared memory is zero-filled, so every slot starts FREE.
+        return cls(shm, [Lock() for _ in range(max(1, min(stripes, slots)))], owner=True)
+
+    @classmethod
+    def attach(cls, handle: Tuple[str, Sequence]) -> 'SessionArena':
+        """Open an arena from another process's handle()."""
+        name, locks = handle
+        return cls(shared_memory.SharedMemory(name=name), locks, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def handle(self) -> Tuple[str, List]:
+        """What a worker needs to attach.
+
+        The locks can only be shared by inheritance, so pass this in a
+        Process's args or a Pool's initializer/initargs.  It cannot be sent
+        through Pool.map or a Queue: pickling the locks raises RuntimeError.
+        """
+        return self.name, self.locks
+
+    def close(self) -> None:
+        """Detach this process from the shared memory."""
+        self._buf = None
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """Close and destroy the shared memory (creator only)."""
+        self.close()
+        self._shm.unlink()
+
+    def __enter__(self) -> 'SessionArena':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self.owner:
+            self.unlink()
+        else:
+            self.close()
+
+    def _offset(self, slot: int) -> int:
+        if not 0 <= slot < self.slots:
+            raise IndexError(f"slot {slot} out of range")
+        return ARENA_HEADER.size + slot * self.record_size
+
+    def lock(self, slot: int):
+        """The lock guarding a slot (hold it to read a consistent record)."""
+        return self.locks[slot % len(self.locks)]
+
+    def claim(self) -> Session:
+        """Take a free slot, start a new game in it and return its token.
+
+        Scans from where this process last found one, checking each slot
+        again under its lock, so two processes never claim the same slot.
+        Raises MemoryError when every slot is in use.
+        """
+        buf = self._buf
+        for step in range(self.slots):
+            slot = (self._hint + step) % self.slots
+            offset = self._offset(slot)
+            if buf[offset + _STATE] != FREE:
+                continue
+            with self.lock(slot):
+                if buf[offset + _STATE] != FREE:
+                    continue
+                generation = self._start(offset)
+            self._hint = slot + 1
+            return Session(slot, generation)
+        raise MemoryError(f"all {self.slots} arena slots are in use")
+
+    def session(self, slot: int) -> Session:
+        """The token of the game now in an active slot."""
+        offset = self._offset(slot)
+        with self.lock(slot):
+            if self._buf[offset + _STATE] != ACTIVE:
+                raise ValueError(f"slot {slot} is not in use")
+            return Session(slot, _U32.unpack_from(self._buf, offset + _GENERATION)[0])
+
+    def release(self, session: Session) -> None:
+        """Give a session's slot back; its game is gone."""
+        with self.lock(session.slot):
+            self._buf[self._check(session) + _STATE] = FREE
+
+    def reset(self, session: Session) -> Session:
+        """Start a session's slot over with a new game and return its token.
+
+        The old token goes stale, so when several processes see a game end
+        and reset it, only the first reset takes effect and the others get
+        ValueError.
+        """
+        with self.lock(session.slot):
+            return Session(session.slot, self._start(self._check(session)))
+
+    def _start(self, offset: int) -> int:
+        """Write a new game into a record under the next generation; return it."""
+        generation = (_U32.unpack_from(self._buf, offset + _GENERATION)[0] + 1) & 0xFFFFFFFF
+        RECORD_HEADER.pack_into(self._buf, offset, ACTIVE, X, 0, 0, 0, 0, generation)
+        start = offset + RECORD_HEADER.size
+        cells = self.size * self.size
+        self._buf[start:start + cells] = b' ' * cells
+        return generation
+
+    def _check(self, session: Session) -> int:
+        """The record offset of a live session; call with its slot's lock held."""
+        slot, generation = session
+        offset = self._offset(slot)
+        if self._buf[offset + _STATE] != ACTIVE:
+            raise ValueError(f"slot {slot} is not in use")
+        current = _U32.unpack_from(self._buf, offset + _GENERATION)[0]
+        if current != generation:
+            raise ValueError(f"session {generation} of slot {slot} has ended "
+                             f"(the slot is on {current})")
+        return offset
+
+    def make_move(self, session: Session, row: int, col: int) -> bool:
+        """Play a move for the side to move in a session's game.
+
+        Like TicTacToe.play_game, a win or full board ends the game and any
+        other move passes the turn.  Returns False, changing nothing, for an
+        occupied or out-of-range cell or a finished game.
+        """
+        size = self.size
+        if not (0 <= row < size and 0 <= col < size):
+            return False
+        buf = self._buf
+        index = row * size + col
+        with self.lock(session.slot):
+            offset = self._check(session)
+            start = offset + RECORD_HEADER.size
+            if buf[offset + _GAME_OVER] or buf[start + index] != EMPTY:
+                return False
+            player = buf[offset + _PLAYER]
+            buf[start + index] = player
+            moves = buf[offset + _MOVES] | buf[offset + _MOVES + 1] << 8
+            moves += 1
+            buf[offset + _MOVES] = moves & 0xFF
+            buf[offset + _MOVES + 1] = moves >> 8
+            if self._wins_at(start, row, col, player):
+                buf[offset + _WINNER] = player
+                buf[offset + _GAME_OVER] = 1
+            elif moves == size * size:
+                buf[offset + _GAME_OVER] = 1
+            else:
+                buf[offset + _PLAYER] = O if player == X else X
+        return True
+
+    def _wins_at(self, start: int, row: int, col: int, player: int) -> bool:
+        """Whether the mark at (row, col) completes a line of win_length."""
+        buf = self._buf
+        size = self.size
+        for dr, dc in _DIRECTIONS:
+            count = 1
+            for sign in (1, -1):
+                r, c = row + sign * dr, col + sign * dc
+                while 0 <= r < size and 0 <= c < size and buf[start + r * size + c] == player:
+                    count += 1
+                    r += sign * dr
+                    c += sign * dc
+            if count >= self.win_length:
+                return True
+        return False
+
+    def state(self, session: Session) -> GameState:
+        """A consistent copy of a session's record."""
+        with self.lock(session.slot):
+            offset = self._check(session)
+            _, player, game_over, winner, moves, _, generation = \
+                RECORD_HEADER.unpack_from(self._buf, offset)
+            start = offset + RECORD_HEADER.size
+            cells = bytes(self._buf[start:start + self.size * self.size])
+        return GameState(cells, chr(player), bool(game_over), chr(winner) if winner else None,
+                         moves, generation)
+
+    def game_over(self, session: Session) -> bool:
+        """Whether a session's game has ended."""
+        with self.lock(session.slot):
+            return bool(self._buf[self._check(session) + _GAME_OVER])
+
+    def cells(self, session: Session) -> memoryview:
+        """A zero-copy view of a session's size * size cell bytes.
+
+        The session is checked once, when the view is made, and reads are
+        not locked, so the view can show a move in progress or, after a
+        release or reset, a later game in the same slot; take
+        lock(session.slot) around reads that must be consistent.
+        """
+        with self.lock(session.slot):
+            start = self._check(session) + RECORD_HEADER.size
+        return self._buf[start:start + self.size * self.size]
+
+    def board(self, session: Session) -> List[List[str]]:
+        """A session's board as rows of ' '/'X'/'O' cells, like TicTacToe.board."""
+        return self._rows(self.state(session).cells)
+
+    def _rows(self, cells: bytes) -> List[List[str]]:
+        cells = cells.decode('ascii')
+        size = self.size
+        return [list(cells[row * size:(row + 1) * size]) for row in range(size)]
+
+    def as_array(self):
+        """A zero-copy NumPy view of every slot's cells, shape (slots, size, size).
+
+        Needs NumPy; includes free slots, whose cells are stale.
+        """
+        import numpy as np
+        return np.ndarray((self.slots, self.size, self.size), dtype=np.uint8, buffer=self._buf,
+                          offset=ARENA_HEADER.size + RECORD_HEADER.size,
+                          strides=(self.record_size, self.size, 1))
+
+    def load(self, session: Session, game: TicTacToe) -> None:
+        """Copy a TicTacToe's position and result into a session's slot."""
+        if (game.size, game.win_length) != (self.size, self.win_length):
+            raise ValueError(f"arena holds {self.size}x{self.size} games with "
+                             f"{self.win_length} in a row")
+        cells = ''.join(''.join(row) for row in game.board).encode('ascii')
+        winner = ord(game.winner) if game.winner else 0
+        with self.lock(session.slot):
+            offset = self._check(session)
+            RECORD_HEADER.pack_into(self._buf, offset, ACTIVE, ord(game.current_player),
+                                    int(game.game_over), winner, len(cells) - cells.count(b' '),
+                                    0, session.generation)
+            start = offset + RECORD_HEADER.size
+            self._buf[start:start + len(cells)] = cells
+
+    def to_game(self, session: Session) -> TicTacToe:
+        """A new TicTacToe in a session's position, e.g. to run a policy on it."""
+        state = self.state(session)
+        game = TicTacToe(self.size, self.win_length)
+        game.board = self._rows(state.cells)
+        game.current_player = state.current_player
+        game.game_over = state.game_over
+        game.winner = state.winner
+        return game
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Batched Tic Tac Toe evaluation with NumPy
+Boards are rows of an (N, 9) int8 array: 0 for an empty cell, 1 for X and
+2 for O, cell (row, col) at column row * 3 + col.
+"""
+
+from collections import namedtuple
+from typing import Iterable, Optional, Tuple, Union
+
+import numpy as np
+
+from bitboard import FULL_MASK, WINNING, require_standard
+from tic_tac_toe import TicTacToe
+
+
+EMPTY, X, O = 0, 1, 2
+PLAYER_CODES = {'X': X, 'O': O}
+PLAYER_NAMES = {X: 'X', O: 'O'}
+
+# Same line order as TicTacToe.check_winner, so ties between two winning
+# lines on a hand-edited board are broken the same way.
+LINES = np.array([
+    [0, 1, 2], [3, 4, 5], [6, 7, 8],
+    [0, 3, 6], [1, 4, 7], [2, 5, 8],
+    [0, 4, 8], [2, 4, 6],
+], dtype=np.intp)
+
+_BITS = np.arange(9)
+_WEIGHTS = (1 << _BITS).astype(np.int16)
+
+# The bitboard engine's 512-entry "mask contains a line" table as an array.
+_WINNING = np.frombuffer(WINNING, dtype=np.uint8).astype(bool)
+
+BatchResult = namedtuple('BatchResult', ['winner', 'full', 'legal'])
+
+
+def _as_boards(boards) -> np.ndarray:
+    """Validate and return boards as an (N, 9) int8 array."""
+    boards = np.asarray(boards, dtype=np.int8)
+    if boards.ndim != 2 or boards.shape[1] != 9:
+        raise ValueError(f"expected an (N, 9) array of boards, got shape {boards.shape}")
+    return boards
+
+
+def _masks(boards: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the (N,) 9-bit X and O masks of every board."""
+    return ((boards == X).astype(np.int16) @ _WEIGHTS,
+            (boards == O).astype(np.int16) @ _WEIGHTS)
+
+
+def _first_line_winner(boards: np.ndarray) -> np.ndarray:
+    """Return the owner of the first complete line, scanning in LINES order."""
+    lines = boards[:, LINES]                       # (N, 8, 3)
+    first = lines[:, :, 0]
+    won = (first != EMPTY) & (first == lines[:, :, 1]) & (first == lines[:, :, 2])
+    result = first[np.arange(len(boards)), won.argmax(axis=1)]
+    return np.where(won.any(axis=1), result, EMPTY).astype(np.int8)
+
+
+def _winners(boards: np.ndarray, x: np.ndarray, o: np.ndarray) -> np.ndarray:
+    x_wins = _WINNING[x]
+    o_wins = _WINNING[o]
+    result = np.where(x_wins, X, np.where(o_wins, O, EMPTY)).astype(np.int8)
+    # Both sides own a line only on hand-edited boards; fall back to the
+    # ordered line scan for those rows so results match check_winner.
+    both = np.flatnonzero(x_wins & o_wins)
+    if len(both):
+        result[both] = _first_line_winner(boards[both])
+    return result
+
+
+def winners(boards) -> np.ndarray:
+    """Return an (N,) int8 array: the winning side's code, or 0."""
+    boards = _as_boards(boards)
+    return _winners(boards, *_masks(boards))
+
+
+def is_full(boards) -> np.ndarray:
+    """Return an (N,) bool array: True where every cell is filled."""
+    return (_as_boards(boards) != EMPTY).all(axis=1)
+
+
+def legal_moves(boards) -> np.ndarray:
+    """Return an (N, 9) bool array: True for every empty cell."""
+    return _as_boards(boards) == EMPTY
+
+
+def evaluate(boards) -> BatchResult:
+    """Return winner, is-full and legal-move masks for every board at once."""
+    boards = _as_boards(boards)
+    x, o = _masks(boards)
+    return BatchResult(_winners(boards, x, o), (x | o) == FULL_MASK, boards == EMPTY)
+
+
+def side_to_move(boards) -> np.ndarray:
+    """Return an (N,) int8 array of X or O, assuming X moved first."""
+    boards = _as_boards(boards)
+    x_count = (boards == X).sum(axis=1)
+    o_count = (boards == O).sum(axis=1)
+    return np.where(x_count == o_count, X, O).astype(np.int8)
+
+
+def apply_moves(boards, moves, players: Optional[Union[int, Iterable[int]]] = None,
+                inplace: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """Play one move on every board.
+
+    moves is an (N,) array of cell indices.  players is a side code, an (N,)
+    array of side codes, or None to use side_to_move().  Moves that are off
+    the board or onto a filled cell are skipped.  Returns (boards, applied)
+    where applied is an (N,) bool mask of the moves that were played.
+    """
+    boards = _as_boards(boards)
+    if not inplace:
+        boards = boards.copy()
+    moves = np.asarray(moves, dtype=np.intp)
+    if moves.shape != (len(boards),):
+        raise ValueError(f"expected {len(boards)} moves, got shape {moves.shape}")
+    if players is None:
+        players = side_to_move(boards)
+    players = np.broadcast_to(np.asarray(players, dtype=np.int8), moves.shape)
+
+    rows = np.arange(len(boards))
+    on_board = (moves >= 0) & (moves < 9)
+    safe = np.where(on_board, moves, 0)
+    applied = on_board & (boards[rows, safe] == EMPTY)
+    boards[rows[applied], moves[applied]] = players[applied]
+    return boards, applied
+
+
+def from_games(games: Iterable[TicTacToe]) -> np.ndarray:
+    """Encode TicTacToe games as an (N, 9) int8 board array."""
+    pairs = []
+    for game in games:
+        bits = game.bitboard
+        require_standard(bits, "batch evaluation")
+        pairs.append((bits.x, bits.o))
+    masks = np.array(pairs, dtype=np.int64).reshape(-1, 2)
+    x_cells = (masks[:, :1] >> _BITS) & 1
+    o_cells = (masks[:, 1:] >> _BITS) & 1
+    return (x_cells * X + o_cells * O).astype(np.int8)
+
+
+def to_game(board, current_player: str = 'X') -> TicTacToe:
+    """Decode one board row into a TicTacToe game."""
+    cells = [PLAYER_NAMES.get(int(value), ' ') for value in board]
+    game = TicTacToe()
+    game.board = [cells[0:3], cells[3:6], cells[6:9]]
+    game.current_player = current_player
+    return game
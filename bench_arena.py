@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Arena benchmark: cross-process move throughput on a shared-memory SessionArena
+Each worker process attaches to one arena and plays random games in it
+(claim a slot, play until the game ends, release it), and the benchmark
+reports total moves per second for 1..N workers.  --shared makes every
+worker play in the same few slots, so they contend for the same locks.
+A single-process TicTacToe loop is the baseline.
+"""
+
+import argparse
+import multiprocessing
+import random
+import time
+
+from arena import Session, SessionArena
+from tic_tac_toe import TicTacToe
+
+
+def play_random(arena: SessionArena, session: Session, rng: random.Random) -> int:
+    """Play random moves in a session until its game ends; return the moves made."""
+    cells = arena.size * arena.size
+    moves = 0
+    while not arena.game_over(session):
+        if arena.make_move(session, *divmod(rng.randrange(cells), arena.size)):
+            moves += 1
+    return moves
+
+
+def worker(handle, moves: int, seed: int, shared_slots, start, results) -> None:
+    """Process entry point: play at least moves moves, report (moves, seconds)."""
+    arena = SessionArena.attach(handle)
+    rng = random.Random(seed)
+    sessions = {slot: arena.session(slot) for slot in shared_slots or ()}
+    start.wait()
+    began = time.perf_counter()
+    played = 0
+    while played < moves:
+        if shared_slots:
+            slot = rng.choice(shared_slots)
+            session = sessions[slot]
+            try:
+                if arena.make_move(session, *divmod(rng.randrange(arena.size ** 2), arena.size)):
+                    played += 1
+                elif arena.game_over(session):
+                    sessions[slot] = arena.reset(session)
+            except ValueError:
+                # Another worker reset the game since this one last played
+                # in it; pick up the new one.
+                sessions[slot] = arena.session(slot)
+        else:
+            session = arena.claim()
+            played += play_random(arena, session, rng)
+            arena.release(session)
+    results.put((played, time.perf_counter() - began))
+    arena.close()
+
+
+def run(arena: SessionArena, workers: int, moves: int, shared_slots) -> float:
+    """Total moves per second with workers processes."""
+    start = multiprocessing.Event()
+    results = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=worker, args=(arena.handle(), moves, seed,
+                                                              shared_slots, start, results))
+                 for seed in range(workers)]
+    for process in processes:
+        process.start()
+    start.set()
+    reports = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return sum(played for played, _ in reports) / max(seconds for _, seconds in reports)
+
+
+def baseline(moves: int, size: int, win_length) -> float:
+    """Moves per second for random games on private TicTacToe objects."""
+    rng = random.Random(0)
+    played = 0
+    began = time.perf_counter()
+    while played < moves:
+        game = TicTacToe(size, win_length)
+        while not (game.check_winner() or game.is_board_full()):
+            if game.make_move(*divmod(rng.randrange(size * size), size)):
+                game.switch_player()
+                played += 1
+    return played / (time.perf_counter() - began)
+
+
+def main():
+    """Print moves per second for a growing number of workers."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--workers', type=int, default=multiprocessing.cpu_count())
+    parser.add_argument('--moves', type=int, default=100_000, help="moves per worker")
+    parser.add_argument('--slots', type=int, default=1024)
+    parser.add_argument('--stripes', type=int, default=64)
+    parser.add_argument('--shared', type=int, metavar='N',
+                        help="all workers play in the same N slots")
+    parser.add_argument('--size', type=int, default=3)
+    parser.add_argument('--win-length', type=int)
+    args = parser.parse_args()
+
+    print(f"{'in-process TicTacToe':>22}: {baseline(args.moves, args.size, args.win_length):>12,.0f}"
+          " moves/s")
+    with SessionArena.create(args.slots, args.size, args.win_length, args.stripes) as arena:
+        shared_slots = [arena.claim().slot for _ in range(args.shared)] if args.shared else None
+        for workers in range(1, args.workers + 1):
+            rate = run(arena, workers, args.moves, shared_slots)
+            print(f"{f'arena, {workers} worker(s)':>22}: {rate:>12,.0f} moves/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Boards-per-second benchmark: batch.evaluate vs. a TicTacToe.check_winner loop
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import batch
+
+
+def main():
+    """Run the benchmark and print boards per second for both paths."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--boards', type=int, default=200_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    boards = rng.integers(0, 3, size=(args.boards, 9), dtype=np.int8)
+
+    start = time.perf_counter()
+    result = batch.evaluate(boards)
+    vectorized = time.perf_counter() - start
+
+    sample = [batch.to_game(board) for board in boards[:min(len(boards), 50_000)]]
+    start = time.perf_counter()
+    for game in sample:
+        game.check_winner()
+        game.is_board_full()
+    looped = (time.perf_counter() - start) * len(boards) / len(sample)
+
+    print(f"batch.evaluate : {len(boards) / vectorized:,.0f} boards/s")
+    print(f"python loop    : {len(boards) / looped:,.0f} boards/s (extrapolated)")
+    print(f"speedup        : {looped / vectorized:.1f}x "
+          f"({int(result.winner.astype(bool).sum())} boards have a winner)")
+
+
+if __name__ == "__main__":
+    main()
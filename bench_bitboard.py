@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Per-move benchmark: bitboard engine vs. the original list-of-lists board
+Replays the same pseudo-random games through both implementations.
+"""
+
+import argparse
+import random
+import time
+from typing import List, Optional, Tuple
+
+from tic_tac_toe import TicTacToe
+
+
+class ListBoardTicTacToe:
+    """The original nested-list game logic, kept only as a benchmark baseline."""
+
+    def __init__(self):
+        self.board = [[' ' for _ in range(3)] for _ in range(3)]
+        self.current_player = 'X'
+        self.game_over = False
+        self.winner = None
+
+    def is_valid_move(self, row: int, col: int) -> bool:
+        return (0 <= row < 3 and
+                0 <= col < 3 and
+                self.board[row][col] == ' ')
+
+    def make_move(self, row: int, col: int) -> bool:
+        if self.is_valid_move(row, col):
+            self.board[row][col] = self.current_player
+            return True
+        return False
+
+    def check_winner(self) -> Optional[str]:
+        for row in self.board:
+            if row[0] == row[1] == row[2] != ' ':
+                return row[0]
+        for col in range(3):
+            if self.board[0][col] == self.board[1][col] == self.board[2][col] != ' ':
+                return self.board[0][col]
+        if self.board[0][0] == self.board[1][1] == self.board[2][2] != ' ':
+            return self.board[0][0]
+        if self.board[0][2] == self.board[1][1] == self.board[2][0] != ' ':
+            return self.board[0][2]
+        return None
+
+    def is_board_full(self) -> bool:
+        return all(cell != ' ' for row in self.board for cell in row)
+
+    def switch_player(self) -> None:
+        self.current_player = 'O' if self.current_player == 'X' else 'X'
+
+
+def make_scripts(games: int, seed: int) -> List[List[Tuple[int, int]]]:
+    """Return one shuffled list of all nine cells per game."""
+    rng = random.Random(seed)
+    cells = [(r, c) for r in range(3) for c in range(3)]
+    scripts = []
+    for _ in range(games):
+        order = cells[:]
+        rng.shuffle(order)
+        scripts.append(order)
+    return scripts
+
+
+def replay(factory, scripts) -> Tuple[int, float]:
+    """Play every script to completion; return (moves played, seconds)."""
+    moves = 0
+    start = time.perf_counter()
+    for script in scripts:
+        game = factory()
+        for row, col in script:
+            game.make_move(row, col)
+            moves += 1
+            if game.check_winner() or game.is_board_full():
+                break
+            game.switch_player()
+    return moves, time.perf_counter() - start
+
+
+def replay_large(games: int, size: int, win_length: int, seed: int) -> None:
+    """Compare incremental win checks with full rescans on a large board."""
+    rng = random.Random(seed)
+    scripts = []
+    for _ in range(games):
+        order = [(r, c) for r in range(size) for c in range(size)]
+        rng.shuffle(order)
+        scripts.append(order)
+
+    for name, full_scan in (('incremental', False), ('full rescan', True)):
+        moves = 0
+        start = time.perf_counter()
+        for script in scripts:
+            game = TicTacToe(size, win_length)
+            for row, col in script:
+                game.make_move(row, col)
+                moves += 1
+                winner = game.bitboard.winner() if full_scan else game.check_winner()
+                if winner or game.is_board_full():
+                    break
+                game.switch_player()
+        elapsed = time.perf_counter() - start
+        print(f"{size}x{size}/{win_length} {name:>11}: {moves} moves "
+              f"({elapsed / moves * 1e9:.0f} ns/move)")
+
+
+def main():
+    """Run the benchmark and print per-move timings."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--games', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--size', type=int, default=15,
+                        help="board size for the large-board comparison")
+    parser.add_argument('--win-length', type=int, default=5)
+    args = parser.parse_args()
+
+    scripts = make_scripts(args.games, args.seed)
+    results = {}
+    for name, factory in (('list-of-lists', ListBoardTicTacToe), ('bitboard', TicTacToe)):
+        moves, elapsed = replay(factory, scripts)
+        results[name] = elapsed / moves
+        print(f"{name:>14}: {moves} moves in {elapsed:.3f}s "
+              f"({elapsed / moves * 1e9:.0f} ns/move)")
+
+    print(f"speedup: {results['list-of-lists'] / results['bitboard']:.2f}x per move")
+
+    replay_large(max(1, args.games // 100), args.size, args.win_length, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Game-log benchmark: binary records vs. JSON lines
+Writes the same games in both formats, then streams them back, and reports
+games per second and bytes per game.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import tempfile
+import time
+
+import gamelog
+from policies import random_policy
+from simulate import play_headless
+
+
+def main():
+    """Run the benchmark and print write/read throughput for both formats."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--games', type=int, default=10_000_000)
+    parser.add_argument('--distinct', type=int, default=20_000,
+                        help="distinct random games to cycle through (default: 20000)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--dir', default=None, help="where to write the files (default: temp dir)")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    pool = [play_headless(random_policy, random_policy, rng).moves for _ in range(args.distinct)]
+
+    def games():
+        return itertools.islice(itertools.cycle(pool), args.games)
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        binary_path = os.path.join(tmp, 'games.tttl')
+        json_path = os.path.join(tmp, 'games.jsonl')
+
+        start = time.perf_counter()
+        gamelog.write_games(binary_path, games())
+        binary_write = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with open(json_path, 'w', buffering=1 << 20) as f:
+            for moves in games():
+                f.write(json.dumps(moves) + "\n")
+        json_write = time.perf_counter() - start
+
+        start = time.perf_counter()
+        count = sum(1 for _ in gamelog.iter_games(binary_path))
+        binary_read = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with open(json_path) as f:
+            json_count = sum(1 for line in f if json.loads(line) is not None)
+        json_read = time.perf_counter() - start
+        assert count == json_count == args.games
+
+        rows = [("binary", binary_write, binary_read, os.path.getsize(binary_path)),
+                ("json lines", json_write, json_read, os.path.getsize(json_path))]
+    print(f"{args.games:,} games")
+    for name, write, read, size in rows:
+        print(f"{name:<11}: write {args.games / write:>12,.0f} games/s, "
+              f"read {args.games / read:>12,.0f} games/s, {size / args.games:.2f} bytes/game")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Search benchmark: make/unmake on one TicTacToe vs. copying it at every node
+Both walk the same game tree depth-first (stopping at wins and full boards)
+and report nodes per second.
+"""
+
+import argparse
+import copy
+import time
+
+from bitboard import iter_bits
+from tic_tac_toe import TicTacToe
+
+
+def count_make_unmake(game: TicTacToe, depth: int) -> int:
+    """Count nodes by playing and taking back moves on a single object."""
+    nodes = 1
+    if depth == 0 or game.check_winner() or game.is_board_full():
+        return nodes
+    size = game.size
+    for cell in iter_bits(game.bitboard.legal_mask()):
+        game.make_move(*divmod(cell, size))
+        game.switch_player()
+        nodes += count_make_unmake(game, depth - 1)
+        game.unmake_move()
+    return nodes
+
+
+def count_copying(game: TicTacToe, depth: int) -> int:
+    """Count nodes by deep-copying the game for every child."""
+    nodes = 1
+    if depth == 0 or game.check_winner() or game.is_board_full():
+        return nodes
+    size = game.size
+    for cell in iter_bits(game.bitboard.legal_mask()):
+        child = copy.deepcopy(game)
+        child.make_move(*divmod(cell, size))
+        child.switch_player()
+        nodes += count_copying(child, depth - 1)
+    return nodes
+
+
+def main():
+    """Run both searches and print nodes per second."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--depth', type=int, default=6,
+                        help="plies to search (default: 6; 9 walks the whole 3x3 tree)")
+    parser.add_argument('--size', type=int, default=3)
+    parser.add_argument('--win-length', type=int)
+    args = parser.parse_args()
+
+    results = {}
+    for name, search in (("make/unmake", count_make_unmake), ("deepcopy", count_copying)):
+        game = TicTacToe(args.size, args.win_length)
+        start = time.perf_counter()
+        nodes = search(game, args.depth)
+        elapsed = time.perf_counter() - start
+        results[name] = nodes / elapsed
+        print(f"{name:>12}: {nodes} nodes in {elapsed:.3f}s ({nodes / elapsed:,.0f} nodes/s)")
+    print(f"speedup: {results['make/unmake'] / results['deepcopy']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark: traced bytes per live game for each game representation
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from bench_bitboard import ListBoardTicTacToe
+from compact import CompactGame, GamePool
+from tic_tac_toe import TicTacToe
+
+# A few opening moves so every game holds a realistic mid-game position.
+OPENING = [(1, 1), (0, 0), (2, 2), (0, 2)]
+
+
+def _mid_game(game):
+    for row, col in OPENING:
+        game.make_move(row, col)
+        game.switch_player()
+    return game
+
+
+def _with_board_view(game):
+    game.board  # materialise the list-of-lists view, as display_board would
+    return game
+
+
+CASES = [
+    ('original nested lists', lambda: _mid_game(ListBoardTicTacToe())),
+    ('TicTacToe (bitboard)', lambda: _mid_game(TicTacToe())),
+    ('TicTacToe + board view', lambda: _with_board_view(_mid_game(TicTacToe()))),
+    ('CompactGame (__slots__)', lambda: _mid_game(CompactGame())),
+]
+
+
+def bytes_per_game(factory, count: int) -> float:
+    """Return traced bytes allocated per live game for count games."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    games = [factory() for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # The list holding the games is bookkeeping, not per-game state.
+    overhead = games.__sizeof__()
+    del games
+    return (after - before - overhead) / count
+
+
+def pool_churn(rounds: int) -> GamePool:
+    """Play and recycle games through a pool; return it for its counters."""
+    pool = GamePool()
+    for _ in range(rounds):
+        pool.release(_mid_game(pool.acquire()))
+    return pool
+
+
+def main():
+    """Print bytes per live game for every representation."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--games', type=int, default=50_000)
+    args = parser.parse_args()
+
+    baseline = None
+    for name, factory in CASES:
+        size = bytes_per_game(factory, args.games)
+        baseline = baseline or size
+        print(f"{name:>24}: {size:7.1f} bytes/game ({size / baseline:.0%} of original)")
+
+    pool = pool_churn(args.games)
+    print(f"{'GamePool':>24}: {pool.created} allocated, {pool.reused} reused "
+          f"over {args.games} games")
+
+
+if __name__ == "__main__":
+    main()
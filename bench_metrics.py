@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Instrumentation benchmark: the hot paths before, during and after metrics.enable()
+Times the make_move / check_winner / is_board_full / unmake_move cycle a
+search runs at every node and reports nanoseconds per cycle.  Once
+disable() has run, TicTacToe holds its original functions again, so the
+"disabled" figure should match "never enabled" to within timing noise.
+"""
+
+import argparse
+import time
+
+import metrics
+from tic_tac_toe import TicTacToe
+
+
+def time_cycle(cycles: int, repeats: int) -> float:
+    """Best-of-repeats ns per make/check/unmake cycle over every empty cell."""
+    game = TicTacToe()
+    game.make_move(1, 1)
+    game.switch_player()
+    cells = game.available_moves()
+    rounds = max(cycles // len(cells), 1)
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        for _ in range(rounds):
+            for row, col in cells:
+                game.make_move(row, col)
+                game.check_winner()
+                game.is_board_full()
+                game.unmake_move()
+        best = min(best, (time.perf_counter_ns() - start) / (rounds * len(cells)))
+    return best
+
+
+def main():
+    """Time the cycle with instrumentation never enabled, enabled and disabled."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--cycles', type=int, default=200_000)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    originals = {name: TicTacToe.__dict__[name] for name in metrics.INSTRUMENTED}
+    baseline = time_cycle(args.cycles, args.repeats)
+    with metrics.instrumented():
+        enabled = time_cycle(args.cycles, args.repeats)
+    disabled = time_cycle(args.cycles, args.repeats)
+    restored = all(TicTacToe.__dict__[name] is original for name, original in originals.items())
+
+    for name, ns in (("never enabled", baseline), ("enabled", enabled), ("disabled", disabled)):
+        print(f"{name:>14}: {ns:7.0f} ns/cycle ({(ns - baseline) / baseline:+.1%})")
+    print(f"original methods restored: {'yes' if restored else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the tic_tac_toe module
+Measures `python -X importtime` for "import tic_tac_toe" with a cold bytecode
+cache (every module compiled from source) and a warm one, and the time from
+spawning `python tic_tac_toe.py` to its first move prompt.  test_startup.py
+runs the same measurements against the budgets below.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Set
+
+
+HERE = Path(__file__).resolve().parent
+
+# Budgets in milliseconds, about 3x the medians on a developer machine
+# (cold 66, warm 9, first prompt 50) to leave room for busy CI hosts.
+IMPORT_BUDGET_MS = {'cold': 200.0, 'warm': 30.0}
+FIRST_PROMPT_BUDGET_MS = 150.0
+
+# Subsystems that must not be loaded by "import tic_tac_toe".
+HEAVY_MODULES = ('analytics', 'arena', 'argparse', 'asyncio', 'batch', 'cache', 'concurrent.futures',
+                 'gamelog', 'mcts', 'metrics', 'numpy', 'openings', 'oracle', 'policies', 'random',
+                 'search', 'server', 'simulate', 'solver', 'typing')
+
+PROMPT = b"enter your move"
+
+
+def _env(prefix: str, warm: bool) -> Dict[str, str]:
+    """Environment that keeps bytecode in prefix (populated only when warm)."""
+    env = dict(os.environ, PYTHONPYCACHEPREFIX=prefix)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    if not warm:
+        env['PYTHONDONTWRITEBYTECODE'] = '1'
+    return env
+
+
+def _prime(env: Dict[str, str]) -> None:
+    """Run the program once so the bytecode cache in env is populated."""
+    subprocess.run([sys.executable, '-c', 'import tic_tac_toe'], env=env, cwd=HERE, check=True)
+
+
+def import_times_ms(warm: bool, runs: int = 5) -> List[float]:
+    """Cumulative -X importtime for "import tic_tac_toe", one value per run."""
+    times = []
+    with tempfile.TemporaryDirectory() as prefix:
+        env = _env(prefix, warm)
+        if warm:
+            _prime(env)
+        for _ in range(runs):
+            result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import tic_tac_toe'],
+                                    env=env, cwd=HERE, capture_output=True, text=True, check=True)
+            for line in result.stderr.splitlines():
+                fields = line.split('|')
+                if len(fields) == 3 and fields[2].strip() == 'tic_tac_toe' \
+                        and not fields[2].startswith('  '):
+                    times.append(int(fields[1]) / 1000)
+    return times
+
+
+def first_prompt_ms(warm: bool = True, runs: int = 5) -> List[float]:
+    """Wall time from spawning the game until its first move prompt, per run."""
+    times = []
+    with tempfile.TemporaryDirectory() as prefix:
+        env = _env(prefix, warm)
+        if warm:
+            _prime(env)
+        for _ in range(runs):
+            start = time.perf_counter()
+            proc = subprocess.Popen([sys.executable, 'tic_tac_toe.py'], env=env, cwd=HERE,
+                                    stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                    stderr=subprocess.DEVNULL)
+            try:
+                output = b''
+                while PROMPT not in output:
+                    chunk = os.read(proc.stdout.fileno(), 4096)
+                    if not chunk:
+                        raise RuntimeError(f"game exited before prompting: {output!r}")
+                    output += chunk
+                times.append((time.perf_counter() - start) * 1000)
+            finally:
+                proc.kill()
+                proc.wait()
+                proc.stdin.close()
+                proc.stdout.close()
+    return times
+
+
+def loaded_modules() -> Set[str]:
+    """Modules that "import tic_tac_toe" adds to sys.modules."""
+    code = ("import sys; before = set(sys.modules); import tic_tac_toe; "
+            "print('\\n'.join(sorted(set(sys.modules) - before)))")
+    result = subprocess.run([sys.executable, '-c', code], cwd=HERE, capture_output=True,
+                            text=True, check=True)
+    return set(result.stdout.split())
+
+
+def main():
+    """Print median startup times against their budgets."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=9)
+    args = parser.parse_args()
+
+    for mode in ('cold', 'warm'):
+        median = statistics.median(import_times_ms(mode == 'warm', args.runs))
+        print(f"import tic_tac_toe ({mode}): {median:7.1f} ms "
+              f"(budget {IMPORT_BUDGET_MS[mode]:.0f} ms)")
+    median = statistics.median(first_prompt_ms(True, args.runs))
+    print(f"first prompt (warm)      : {median:7.1f} ms (budget {FIRST_PROMPT_BUDGET_MS:.0f} ms)")
+    heavy = sorted(loaded_modules() & set(HEAVY_MODULES))
+    print(f"heavy modules on import  : {', '.join(heavy) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Bitboard game-state engine for Tic Tac Toe
+Each side is held as an integer mask; cell (row, col) is bit row * size + col.
+The standard game is 3x3 with three in a row, but any N x N board with a
+K-in-a-row win condition is described by a Geometry.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+from type_checking import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import List, Optional, Tuple
+
+
+# Directions scanned for winning lines, in the order TicTacToe.check_winner
+# has always used: rows, columns, the main diagonal, the anti-diagonal.
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+
+class Geometry:
+    """Precomputed line masks for an N x N board with a K-in-a-row win.
+
+    lines holds every K-cell window in scan order; cell_lines[i] holds just
+    the windows through cell i (at most 4 * K of them), so checking whether
+    the last move won costs O(K) mask tests instead of a full-board scan.
+    """
+
+    __slots__ = ('size', 'win_length', 'cells', 'full', 'lines', 'cell_lines', 'winning')
+
+    def __init__(self, size: int, win_length: int):
+        if size < 1 or not 1 <= win_length <= size:
+            raise ValueError(f"need 1 <= win_length <= size, got size={size}, "
+                             f"win_length={win_length}")
+        self.size = size
+        self.win_length = win_length
+        self.cells = size * size
+        self.full = (1 << self.cells) - 1
+
+        lines = []
+        for dr, dc in DIRECTIONS:
+            for r in range(size):
+                for c in range(size):
+                    end_r = r + dr * (win_length - 1)
+                    end_c = c + dc * (win_length - 1)
+                    if 0 <= end_r < size and 0 <= end_c < size:
+                        lines.append(sum(1 << ((r + dr * i) * size + c + dc * i)
+                                         for i in range(win_length)))
+        self.lines: Tuple[int, ...] = tuple(lines)
+        self.cell_lines: Tuple[Tuple[int, ...], ...] = tuple(
+            tuple(line for line in lines if line >> cell & 1) for cell in range(self.cells))
+
+        # Small boards get a table: winning[mask] is 1 when mask holds a line,
+        # so a side's win test is a single lookup.
+        self.winning: Optional[bytes] = None
+        if self.cells <= 9:
+            self.winning = bytes(
+                1 if any(mask & line == line for line in lines) else 0
+                for mask in range(1 << self.cells))
+
+    def __repr__(self):
+        return f"Geometry(size={self.size}, win_length={self.win_length})"
+
+    def line_through(self, mask: int, index: int) -> bool:
+        """Check whether mask completes a line that passes through cell index."""
+        for line in self.cell_lines[index]:
+            if mask & line == line:
+                return True
+        return False
+
+
+def board_geometry(size: int = 3, win_length: Optional[int] = None) -> Geometry:
+    """Return the shared Geometry for a board; win_length defaults to size."""
+    return _cached_geometry(size, size if win_length is None else win_length)
+
+
+@lru_cache(maxsize=None)
+def _cached_geometry(size: int, win_length: int) -> Geometry:
+    return Geometry(size, win_length)
+
+
+STANDARD = board_geometry(3, 3)
+
+SIZE = STANDARD.size
+CELLS = STANDARD.cells
+FULL_MASK = STANDARD.full
+
+# The standard game's eight lines: rows, then columns, then the diagonals.
+WIN_MASKS: Tuple[int, ...] = STANDARD.lines
+
+# WINNING[mask] is 1 when the 9-bit mask contains at least one winning line.
+WINNING: bytes = STANDARD.winning
+
+
+def board_symmetries(size: int) -> Tuple[Tuple[int, ...], ...]:
+    """The 8 symmetries of a size x size board as cell permutations.
+
+    Entry [s][i] is where cell i lands under symmetry s; index 0 is the
+    identity.
+    """
+    last = size - 1
+    return tuple(
+        tuple(f(i // size, i % size) for i in range(size * size))
+        for f in (
+            lambda r, c: r * size + c,                        # identity
+            lambda r, c: c * size + (last - r),               # rotate 90
+            lambda r, c: (last - r) * size + (last - c),      # rotate 180
+            lambda r, c: (last - c) * size + r,               # rotate 270
+            lambda r, c: r * size + (last - c),               # mirror left/right
+            lambda r, c: (last - r) * size + c,               # mirror top/bottom
+            lambda r, c: c * size + r,                        # main diagonal
+            lambda r, c: (last - c) * size + (last - r),      # anti-diagonal
+        )
+    )
+
+
+# The 8 symmetries of the standard board: SYMMETRIES[s][i] is where cell i
+# lands under symmetry s.
+SYMMETRIES: Tuple[Tuple[int, ...], ...] = board_symmetries(SIZE)
+
+# INVERSE_SYMMETRIES[s][j] is the cell that symmetry s moves onto cell j.
+INVERSE_SYMMETRIES: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(perm.index(j) for j in range(CELLS)) for perm in SYMMETRIES
+)
+
+
+def _symmetry_table(perm: Tuple[int, ...]) -> Tuple[int, ...]:
+    """Map every 9-bit mask to its image under a cell permutation."""
+    table = [0] * (1 << CELLS)
+    for mask in range(1, 1 << CELLS):
+        low = mask & -mask
+        table[mask] = table[mask ^ low] | (1 << perm[low.bit_length() - 1])
+    return tuple(table)
+
+
+SYMMETRY_TABLES = tuple(_symmetry_table(perm) for perm in SYMMETRIES)
+
+
+def canonical(me: int, opp: int) -> Tuple[int, int]:
+    """Return (key, symmetry) for the symmetry-reduced form of a position.
+
+    The key packs the two transformed masks as me | opp << 9 and is the
+    smallest such value over all 8 symmetries; symmetry is the index into
+    SYMMETRIES that produced it.
+    """
+    best_key = -1
+    best_sym = 0
+    for sym, table in enumerate(SYMMETRY_TABLES):
+        key = table[me] | table[opp] << CELLS
+        if best_key < 0 or key < best_key:
+            best_key = key
+            best_sym = sym
+    return best_key, best_sym
+
+
+def require_standard(bits: 'BitBoard', feature: str) -> None:
+    """Raise ValueError unless bits is a standard 3x3, three-in-a-row board."""
+    if bits.geometry is not STANDARD:
+        raise ValueError(f"{feature} only supports the standard 3x3 game, "
+                         f"not {bits.geometry}")
+
+
+def cell_index(row: int, col: int) -> int:
+    """Return the bit index of a (row, col) cell."""
+    return row * SIZE + col
+
+
+def iter_bits(mask: int):
+    """Yield the index of each set bit in mask, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class BitBoard:
+    """Compact board state: one integer bitmask per side."""
+
+    __slots__ = ('x', 'o', 'geometry')
+
+    def __init__(self, x: int = 0, o: int = 0, geometry: Geometry = STANDARD):
+        self.x = x
+        self.o = o
+        self.geometry = geometry
+
+    @classmethod
+    def from_rows(cls, rows: List[List[str]], geometry: Optional[Geometry] = None) -> 'BitBoard':
+        """Build a bitboard from a list-of-lists of ' '/'X'/'O' cells.
+
+        Without a geometry, the board is square with a full row to win.
+        """
+        geo = geometry or board_geometry(len(rows))
+        if len(rows) != geo.size or any(len(row) != geo.size for row in rows):
+            raise ValueError(f"expected a {geo.size}x{geo.size} board")
+        bits = cls(geometry=geo)
+        for r, row in enumerate(rows):
+            for c, value in enumerate(row):
+                bits.set_cell(r * geo.size + c, value)
+        return bits
+
+    def copy(self) -> 'BitBoard':
+        """Return an independent copy of this board."""
+        return BitBoard(self.x, self.o, self.geometry)
+
+    @property
+    def occupied(self) -> int:
+        """Mask of all filled cells."""
+        return self.x | self.o
+
+    def legal_mask(self) -> int:
+        """Mask of all empty cells."""
+        return self.geometry.full & ~(self.x | self.o)
+
+    def legal_moves(self) -> List[int]:
+        """Return the indices of all empty cells."""
+        return list(iter_bits(self.geometry.full & ~(self.x | self.o)))
+
+    def is_empty(self, index: int) -> bool:
+        """Check whether a cell is empty."""
+        return not ((self.x | self.o) >> index) & 1
+
+    def get_cell(self, index: int) -> str:
+        """Return the ' '/'X'/'O' value of a cell."""
+        if (self.x >> index) & 1:
+            return 'X'
+        if (self.o >> index) & 1:
+            return 'O'
+        return ' '
+
+    def set_cell(self, index: int, value: str) -> None:
+        """Overwrite a cell with ' ', 'X' or 'O'."""
+        bit = 1 << index
+        self.x &= ~bit
+        self.o &= ~bit
+        if value == 'X':
+            self.x |= bit
+        elif value == 'O':
+            self.o |= bit
+
+    def play(self, index: int, player: str) -> None:
+        """Place player's mark on an empty cell."""
+        if player == 'X':
+            self.x |= 1 << index
+        else:
+            self.o |= 1 << index
+
+    def wins_at(self, index: int) -> Optional[str]:
+        """Return the side on cell index if that mark completes a line.
+
+        This is the incremental win test for the move just played on a board
+        that had no complete line before it: only the lines through the
+        moved-to cell need checking.
+        """
+        if (self.x >> index) & 1:
+            side, mask = 'X', self.x
+        elif (self.o >> index) & 1:
+            side, mask = 'O', self.o
+        else:
+            return None
+        geo = self.geometry
+        if geo.winning is not None:
+            return side if geo.winning[mask] else None
+        return side if geo.line_through(mask, index) else None
+
+    def winner(self) -> Optional[str]:
+        """Return the winning side, if any, scanning the whole board."""
+        table = self.geometry.winning
+        if table is not None:
+            x_wins = table[self.x]
+            o_wins = table[self.o]
+            if not (x_wins and o_wins):
+                return 'X' if x_wins else 'O' if o_wins else None
+        # Large boards, or both sides own a line (only possible on hand-edited
+        # boards): report whichever line the classic scan order reaches first.
+        for line in self.geometry.lines:
+            if self.x & line == line:
+                return 'X'
+            if self.o & line == line:
+                return 'O'
+        return None
+
+    def is_full(self) -> bool:
+        """Check whether every cell is filled."""
+        return (self.x | self.o) == self.geometry.full
+
+    def rows(self) -> List[List[str]]:
+        """Return the board as a list-of-lists of ' '/'X'/'O' cells."""
+        size = self.geometry.size
+        return [[self.get_cell(r * size + c) for c in range(size)]
+                for r in range(size)]
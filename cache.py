@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Shared best-move cache for Tic Tac Toe move policies
+Caches each policy's chosen move per canonical position, with LRU eviction,
+optional expiry for stochastic policies, hit/miss counters and snapshot
+files for warm starts.
+"""
+
+import json
+import math
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from bitboard import INVERSE_SYMMETRIES, STANDARD, SYMMETRIES, canonical
+
+
+SNAPSHOT_VERSION = 1
+
+# A ttl for put that never expires, even when the cache has a default ttl.
+NEVER = math.inf
+
+# (board size, win length, position) where position is bitboard.canonical's
+# symmetry-reduced key on 3x3 and x | o << cells on larger boards.
+PositionKey = Tuple[int, int, int]
+
+
+def position_key(game) -> Tuple[PositionKey, int]:
+    """Return (key, symmetry) for the cache slot of game's position.
+
+    Moves are stored as the cell they become in the canonical form, so one
+    entry serves all 8 symmetric positions on the standard board; symmetry
+    is the index into bitboard.SYMMETRIES that maps the game onto that form.
+    Larger boards are cached as-is (symmetry 0, the identity).
+    """
+    bits = game.bitboard
+    geo = bits.geometry
+    if geo is STANDARD:
+        key, sym = canonical(bits.x, bits.o)
+        return (3, 3, key), sym
+    return (geo.size, geo.win_length, bits.x | bits.o << geo.cells), 0
+
+
+class MoveCache:
+    """Thread-safe LRU cache of best moves keyed by (policy id, position).
+
+    At most max_entries moves are kept; the least recently used is evicted
+    first.  Entries stored with a ttl (the cache-wide default or one given
+    to put) expire that many seconds later, so stochastic policies get a
+    fresh sample now and then.  hits, misses, evictions and expirations
+    count what happened since the cache was created.
+    """
+
+    def __init__(self, max_entries: int = 100_000, ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        # (policy id, position key) -> (canonical cell, expiry time or None)
+        self._entries: 'OrderedDict[Tuple[str, PositionKey], Tuple[int, Optional[float]]]' = \
+            OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, policy_id: str, key: PositionKey) -> Optional[int]:
+        """Return the cached canonical cell, or None on a miss."""
+        slot = (policy_id, key)
+        with self._lock:
+            entry = self._entries.get(slot)
+            if entry is not None:
+                cell, expires = entry
+                if expires is None or expires > self._clock():
+                    self._entries.move_to_end(slot)
+                    self.hits += 1
+                    return cell
+                del self._entries[slot]
+                self.expirations += 1
+            self.misses += 1
+            return None
+
+    def put(self, policy_id: str, key: PositionKey, cell: int,
+            ttl: Optional[float] = None) -> None:
+        """Store a canonical cell, evicting the least recently used if full.
+
+        ttl defaults to the cache-wide one; NEVER stores it with no expiry.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        expires = self._clock() + ttl if ttl is not None and ttl != NEVER else None
+        slot = (policy_id, key)
+        with self._lock:
+            self._entries[slot] = (cell, expires)
+            self._entries.move_to_end(slot)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def best_move(self, game, policy_id: str, policy, rng: random.Random) -> Tuple[int, int]:
+        """Return policy's (row, col) for game, asking the policy only on a miss."""
+        key, sym = position_key(game)
+        size = game.size
+        cell = self.get(policy_id, key)
+        if cell is not None:
+            return divmod(INVERSE_SYMMETRIES[sym][cell] if sym else cell, size)
+        # The policy runs outside the lock; a concurrent miss on the same
+        # position just computes it twice.
+        row, col = policy(game, rng)
+        cell = row * size + col
+        self.put(policy_id, key, SYMMETRIES[sym][cell] if sym else cell)
+        return row, col
+
+    def stats(self) -> Dict[str, int]:
+        """Return the counters and current size."""
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses,
+                    'evictions': self.evictions, 'expirations': self.expirations}
+
+    def clear(self) -> None:
+        """Drop every entry (the counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def save(self, path: str) -> int:
+        """Write the live entries to a snapshot file; return how many.
+
+        Entries are written least recently used first, with the seconds
+        each has left to live (null for entries that never expire), and the
+        file is replaced atomically.
+        """
+        now = self._clock()
+        with self._lock:
+            rows = [[policy_id, list(key), cell, None if expires is None else expires - now]
+                    for (policy_id, key), (cell, expires) in self._entries.items()
+                    if expires is None or expires > now]
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump({'version': SNAPSHOT_VERSION, 'entries': rows}, f)
+        os.replace(tmp, path)
+        return len(rows)
+
+    def load(self, path: str) -> int:
+        """Add the entries of a snapshot file written by save; return how many.
+
+        Entries saved with no expiry are loaded with none, whatever this
+        cache's ttl.
+        """
+        with open(path) as f:
+            snapshot = json.load(f)
+        if snapshot.get('version') != SNAPSHOT_VERSION:
+            raise ValueError(f"{path} is not a version {SNAPSHOT_VERSION} cache snapshot")
+        count = 0
+        for policy_id, key, cell, remaining in snapshot['entries']:
+            if remaining is not None and remaining <= 0:
+                continue
+            self.put(policy_id, tuple(key), cell, NEVER if remaining is None else remaining)
+            count += 1
+        return count
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Compact game sessions for Tic Tac Toe
+CompactGame is a __slots__ sibling of TicTacToe for processes that hold many
+live games at once; GamePool recycles finished games instead of reallocating.
+"""
+
+from typing import Callable, List, Optional, Tuple
+
+from bitboard import BitBoard, FULL_MASK
+
+
+class CompactGame:
+    """A headless game state: a bitboard plus whose turn it is and the result.
+
+    The nine cells of the standard 3x3 board live in the two bitmasks of the
+    BitBoard the game holds, so an instance is a small fixed-size object
+    with no __dict__ and no per-cell allocations.  It implements the
+    TicTacToe game-state API (make_move, check_winner, is_board_full,
+    switch_player, ...) but not terminal I/O.
+    """
+
+    __slots__ = ('_bits', 'current_player', 'game_over', 'winner')
+
+    # Compact games are always the standard board.
+    size = 3
+    win_length = 3
+
+    def __init__(self):
+        self._bits = BitBoard()
+        self.current_player = 'X'
+        self.game_over = False
+        self.winner: Optional[str] = None
+
+    def reset(self) -> None:
+        """Return to the starting position so the object can be reused."""
+        self._bits.x = 0
+        self._bits.o = 0
+        self.current_player = 'X'
+        self.game_over = False
+        self.winner = None
+
+    @property
+    def bitboard(self) -> BitBoard:
+        """The game's bitboard."""
+        return self._bits
+
+    @property
+    def board(self) -> List[List[str]]:
+        """A snapshot of the board as rows of ' '/'X'/'O' cells."""
+        return self._bits.rows()
+
+    def is_valid_move(self, row: int, col: int) -> bool:
+        """Check if a move is valid."""
+        bits = self._bits
+        return (0 <= row < 3 and
+                0 <= col < 3 and
+                not ((bits.x | bits.o) >> (row * 3 + col)) & 1)
+
+    def available_moves(self) -> List[Tuple[int, int]]:
+        """List every empty (row, col) cell."""
+        return [divmod(cell, 3) for cell in self._bits.legal_moves()]
+
+    def make_move(self, row: int, col: int) -> bool:
+        """Make a move on the board."""
+        if self.is_valid_move(row, col):
+            self._bits.play(row * 3 + col, self.current_player)
+            return True
+        return False
+
+    def check_winner(self) -> Optional[str]:
+        """Check if there's a winner."""
+        return self._bits.winner()
+
+    def is_board_full(self) -> bool:
+        """Check if the board is full."""
+        bits = self._bits
+        return (bits.x | bits.o) == FULL_MASK
+
+    def switch_player(self) -> None:
+        """Switch to the other player."""
+        self.current_player = 'O' if self.current_player == 'X' else 'X'
+
+
+class GamePool:
+    """Free list of reusable game objects.
+
+    acquire() hands out a game in its starting position, reusing a released
+    one when available; release() resets a finished game and keeps it for
+    the next acquire(), up to max_size spare games.
+    """
+
+    def __init__(self, factory: Callable[[], CompactGame] = CompactGame, max_size: int = 1024):
+        self.factory = factory
+        self.max_size = max_size
+        self._free: List[CompactGame] = []
+        self.created = 0
+        self.reused = 0
+
+    def __len__(self) -> int:
+        return len(self._free)
+
+    def acquire(self) -> CompactGame:
+        """Return a game in its starting position."""
+        if self._free:
+            self.reused += 1
+            return self._free.pop()
+        self.created += 1
+        return self.factory()
+
+    def release(self, game: CompactGame) -> None:
+        """Give a game back to the pool."""
+        if len(self._free) < self.max_size:
+            game.reset()
+            self._free.append(game)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Pluggable input and output backends for the Tic Tac Toe game loop
+Renderers draw the board and show messages; move sources supply moves.
+TicTacToe.play_game uses the terminal backends unless others are passed in.
+"""
+
+from __future__ import annotations
+
+import sys
+
+from type_checking import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import IO, Iterable, Iterator, List, Optional, Tuple, Union
+
+
+QUIT_WORDS = ('quit', 'exit', 'q')
+
+
+def parse_move(text: str, game) -> Optional[Tuple[int, int]]:
+    """Parse a "row col" move for game; return None for a quit command.
+
+    Rows and columns are 1-based in the text and 0-based in the result.
+    Raises ValueError with a player-facing message for anything invalid.
+    """
+    text = text.strip()
+    if text.lower() in QUIT_WORDS:
+        return None
+    parts = text.split()
+    if len(parts) != 2:
+        raise ValueError("Please enter two numbers separated by a space (row col)")
+    try:
+        row, col = int(parts[0]) - 1, int(parts[1]) - 1
+    except ValueError:
+        raise ValueError("Please enter valid numbers") from None
+    if not (0 <= row < game.size and 0 <= col < game.size):
+        raise ValueError(f"Please enter numbers between 1 and {game.size}")
+    if not game.is_valid_move(row, col):
+        raise ValueError("That position is already taken! Choose another.")
+    return row, col
+
+
+def board_lines(game) -> List[str]:
+    """Return the column header, then each board row and separator line."""
+    size = game.size
+    width = len(str(size))
+    lines = [" " * (width + 2) + "".join(f"{c + 1:<4}" for c in range(size)).rstrip()]
+    for i, row in enumerate(game.board):
+        lines.append(f"{i + 1:>{width}}  " + " | ".join(row))
+        if i < size - 1:
+            lines.append(" " * (width + 1) + "-" * (4 * size - 1))
+    return lines
+
+
+def format_board(game) -> str:
+    """Return one frame exactly as TicTacToe.display_board prints it."""
+    return "\n" + "\n".join(board_lines(game)) + "\n\n"
+
+
+class TerminalRenderer:
+    """Default renderer: game.display_board() and print()."""
+
+    def render(self, game) -> None:
+        game.display_board()
+
+    def message(self, text: str) -> None:
+        print(text)
+
+
+class BufferedRenderer:
+    """Builds each frame in memory and emits it with a single write."""
+
+    def __init__(self, stream: Optional[IO[str]] = None):
+        self.stream = stream
+
+    def render(self, game) -> None:
+        (self.stream or sys.stdout).write(format_board(game))
+
+    def message(self, text: str) -> None:
+        (self.stream or sys.stdout).write(text + "\n")
+
+
+class NullRenderer:
+    """Discards all output, for headless runs."""
+
+    def render(self, game) -> None:
+        pass
+
+    def message(self, text: str) -> None:
+        pass
+
+
+class TerminalInput:
+    """Default move source: game.get_player_input() on stdin."""
+
+    def read_move(self, game) -> Optional[Tuple[int, int]]:
+        return game.get_player_input()
+
+
+class ScriptedInput:
+    """Reads "row col" lines from an iterable of strings or an open file.
+
+    Lines that don't parse as a legal move are skipped and kept in errors.
+    read_move returns None on a quit command or when the script runs out.
+    """
+
+    def __init__(self, lines: Union[Iterable[str], IO[str]]):
+        self._lines: Iterator[str] = iter(lines)
+        self.errors: List[Tuple[str, str]] = []
+
+    @classmethod
+    def from_file(cls, path: str) -> 'ScriptedInput':
+        """Read the whole script from a file."""
+        with open(path) as f:
+            return cls(f.read().splitlines())
+
+    def read_move(self, game) -> Optional[Tuple[int, int]]:
+        for line in self._lines:
+            if not line.strip():
+                continue
+            try:
+                return parse_move(line, game)
+            except ValueError as e:
+                self.errors.append((line, str(e)))
+        return None
+
+
+RENDERERS = {
+    'terminal': TerminalRenderer,
+    'buffered': BufferedRenderer,
+    'null': NullRenderer,
+}
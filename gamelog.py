@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Compact binary game log for Tic Tac Toe
+Every make_move is one byte (cell | side << 7) and each game is a record of
+one length byte followed by its moves.  Records are appended to a segment
+file behind a small header naming the board geometry.
+"""
+
+import mmap
+import os
+import struct
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Segment header: magic, format version, board size, win length.
+HEADER = struct.Struct('<4sHBB')
+MAGIC = b'TTTL'
+VERSION = 1
+
+SIDE_BIT = 0x80
+CELL_MASK = 0x7f
+MAX_CELLS = CELL_MASK + 1
+MAX_MOVES = 0xff
+
+# bytes.translate tables: strip the side bit, set it, and (as a delete set)
+# every byte that is a plain cell index.
+_CELLS_ONLY = bytes(b & CELL_MASK for b in range(256))
+_WITH_SIDE = bytes((b | SIDE_BIT) & 0xff for b in range(256))
+_CELL_BYTES = bytes(range(MAX_CELLS))
+
+
+def encode_game(cells: Sequence[int], sides: Optional[Sequence[str]] = None) -> bytes:
+    """Encode one game's cell indices as a record.
+
+    sides gives the mover ('X' or 'O') of each move; without it the sides
+    alternate starting with X, as in every game played through make_move
+    and switch_player.
+    """
+    n = len(cells)
+    if n > MAX_MOVES:
+        raise ValueError(f"a record holds at most {MAX_MOVES} moves, got {n}")
+    try:
+        data = bytes(cells)
+        valid = not data.translate(None, _CELL_BYTES)
+    except ValueError:
+        valid = False
+    if not valid:
+        raise ValueError(f"cells must be below {MAX_CELLS} to fit in a move byte")
+    record = bytearray(n + 1)
+    record[0] = n
+    if sides is None:
+        record[1::2] = data[0::2]
+        record[2::2] = data[1::2].translate(_WITH_SIDE)
+        return bytes(record)
+    if len(sides) != n:
+        raise ValueError(f"got {len(sides)} sides for {n} moves")
+    for i, (cell, side) in enumerate(zip(data, sides), start=1):
+        if side == 'O':
+            cell |= SIDE_BIT
+        elif side != 'X':
+            raise ValueError(f"side must be 'X' or 'O', got {side!r}")
+        record[i] = cell
+    return bytes(record)
+
+
+def game_sides(game) -> List[str]:
+    """The mover of each of a game's moves, read from the marks on its board."""
+    x = game.bitboard.x
+    return ['X' if x >> cell & 1 else 'O' for cell in game.moves]
+
+
+def decode_moves(data: bytes) -> List[Tuple[int, str]]:
+    """Decode move bytes (without the length prefix) into (cell, side) pairs."""
+    return [(b & CELL_MASK, 'O' if b & SIDE_BIT else 'X') for b in data]
+
+
+def _read_header(f) -> Tuple[int, int]:
+    raw = f.read(HEADER.size)
+    if len(raw) != HEADER.size:
+        raise ValueError("truncated game log header")
+    magic, version, size, win_length = HEADER.unpack(raw)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"not a version {VERSION} game log")
+    return size, win_length
+
+
+class GameLogWriter:
+    """Appends games to a segment file in buffered batches.
+
+    A new file gets a header for the given geometry; an existing one must
+    match it.  append returns each record's byte offset in the file, which
+    GameLog.read accepts.  Use as a context manager or call close().
+    """
+
+    def __init__(self, path: str, size: int = 3, win_length: Optional[int] = None,
+                 buffer_size: int = 1 << 20):
+        if win_length is None:
+            win_length = size
+        if size * size > MAX_CELLS:
+            raise ValueError(f"boards with more than {MAX_CELLS} cells cannot be logged")
+        self.size = size
+        self.win_length = win_length
+        self.buffer_size = buffer_size
+        self._buffer = bytearray()
+        self._file = open(path, 'a+b')
+        self._file.seek(0, os.SEEK_END)
+        if self._file.tell() == 0:
+            self._file.write(HEADER.pack(MAGIC, VERSION, size, win_length))
+        else:
+            self._file.seek(0)
+            if _read_header(self._file) != (size, win_length):
+                self._file.close()
+                raise ValueError(f"{path} logs a different board geometry")
+            self._file.seek(0, os.SEEK_END)
+        self._offset = self._file.tell()
+
+    def append(self, cells: Sequence[int], sides: Optional[Sequence[str]] = None) -> int:
+        """Buffer one game (cell indices in play order); return its offset.
+
+        sides is each move's mover, as for encode_game (default: X, O, X, ...).
+        """
+        offset = self._offset
+        record = encode_game(cells, sides)
+        self._buffer += record
+        self._offset += len(record)
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+        return offset
+
+    def append_game(self, game) -> int:
+        """Buffer a TicTacToe game's move history with the side that made each move."""
+        return self.append(game.moves, game_sides(game))
+
+    def flush(self) -> None:
+        """Write buffered records to the file."""
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+        self._file.flush()
+
+    def close(self) -> None:
+        """Flush and close the segment file."""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self) -> 'GameLogWriter':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def iter_records(path: str, chunk_size: int = 1 << 20) -> Iterator[Tuple[int, Tuple[int, ...]]]:
+    """Stream (offset, cells) for every record, reading chunk_size bytes at a time."""
+    with open(path, 'rb') as f:
+        _read_header(f)
+        base = f.tell()
+        pending = b''
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            data = pending + chunk
+            pos = 0
+            end = len(data)
+            while pos < end:
+                n = data[pos]
+                if pos + 1 + n > end:
+                    break
+                yield base + pos, tuple(data[pos + 1:pos + 1 + n].translate(_CELLS_ONLY))
+                pos += 1 + n
+            base += pos
+            pending = data[pos:]
+        if pending:
+            raise ValueError(f"truncated record at offset {base}")
+
+
+def iter_games(path: str, chunk_size: int = 1 << 20) -> Iterator[Tuple[int, ...]]:
+    """Stream each game's cell indices without loading the whole file."""
+    for _, cells in iter_records(path, chunk_size):
+        yield cells
+
+
+class GameLog:
+    """Memory-mapped, read-only view of a segment for random access by offset."""
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            self.size, self.win_length = _read_header(f)
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def read(self, offset: int) -> Tuple[int, ...]:
+        """Return the cell indices of the record at offset."""
+        n = self._map[offset]
+        return tuple(self._map[offset + 1:offset + 1 + n].translate(_CELLS_ONLY))
+
+    def read_moves(self, offset: int) -> List[Tuple[int, str]]:
+        """Return the record at offset as (cell, side) pairs."""
+        n = self._map[offset]
+        return decode_moves(self._map[offset + 1:offset + 1 + n])
+
+    def offsets(self) -> Iterator[int]:
+        """Yield the offset of every record in order."""
+        data = self._map
+        pos = HEADER.size
+        end = len(data)
+        while pos < end:
+            yield pos
+            pos += 1 + data[pos]
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.offsets())
+
+    def __iter__(self) -> Iterator[Tuple[int, ...]]:
+        for offset in self.offsets():
+            yield self.read(offset)
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __enter__(self) -> 'GameLog':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def write_games(path: str, games: Iterable[Sequence[int]], size: int = 3,
+                win_length: Optional[int] = None) -> int:
+    """Append every game in games to path; return how many were written."""
+    count = 0
+    with GameLogWriter(path, size, win_length) as writer:
+        for cells in games:
+            writer.append(cells)
+            count += 1
+    return count
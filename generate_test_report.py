@@ -1,65 +1,179 @@
 #!/usr/bin/env python3
 """
 Test Report Generator for Tic-Tac-Toe
-Automatically generates comprehensive test reports
+Automatically generates comprehensive test reports: test results with
+per-test durations, performance-suite throughput, a profile of a simulated
+batch of games, and changes since the previous report.
 """
 
-import subprocess
+import argparse
+import cProfile
+import io
+import json
+import pstats
+import re
 import sys
 import time
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
+from typing import List, Optional, Tuple
 
 
-def run_tests():
-    """Run the test suite and capture output."""
+REPORT_FILE = Path('TEST_REPORT.md')
+
+# The numbers later reports compare against, stored as an HTML comment so
+# they don't show up when the Markdown is rendered.
+METRICS_PATTERN = re.compile(r'<!-- report-metrics: (\{.*?\}) -->', re.DOTALL)
+
+
+class TimedTestResult(unittest.TextTestResult):
+    """TextTestResult that also records how long each test took."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.durations: List[Tuple[str, float]] = []
+        self._started = 0.0
+
+    def startTest(self, test):
+        self._started = time.perf_counter()
+        super().startTest(test)
+
+    def stopTest(self, test):
+        super().stopTest(test)
+        self.durations.append((test.id(), time.perf_counter() - self._started))
+
+
+@dataclass
+class TestRun:
+    """Outcome of one run of the test suite."""
+
+    total: int
+    failed: List[str]
+    errors: List[str]
+    skipped: List[str]
+    durations: List[Tuple[str, float]]
+    execution_time: float
+    output: str
+
+    @property
+    def success(self) -> bool:
+        return not self.failed and not self.errors
+
+    @property
+    def passed(self) -> int:
+        return self.total - len(self.failed) - len(self.errors) - len(self.skipped)
+
+    def slowest(self, count: int = 10) -> List[Tuple[str, float]]:
+        return sorted(self.durations, key=lambda item: -item[1])[:count]
+
+
+@dataclass
+class ProfileSummary:
+    """Hottest functions while simulating a batch of games."""
+
+    games: int
+    seconds: float
+    # (function, calls, own seconds, cumulative seconds), by own time
+    rows: List[Tuple[str, int, float, float]] = field(default_factory=list)
+
+
+def run_tests(pattern: str = 'test_*.py', start_dir: str = '.') -> Optional[TestRun]:
+    """Run the test suite in-process and collect its structured results."""
     print("Running tests...")
     start_time = time.time()
-    
+    output = io.StringIO()
     try:
-        result = subprocess.run(
-            [sys.executable, 'run_tests.py'],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-        execution_time = time.time() - start_time
-        return result, execution_time
-    except subprocess.TimeoutExpired:
-        print("❌ Tests timed out after 30 seconds")
-        return None, 30
+        suite = unittest.TestLoader().discover(start_dir, pattern=pattern)
+        runner = unittest.TextTestRunner(stream=output, verbosity=2,
+                                         resultclass=TimedTestResult)
+        # Tests that print (game prompts and messages) go into the output too.
+        with redirect_stdout(output), redirect_stderr(output):
+            result = runner.run(suite)
     except Exception as e:
         print(f"❌ Error running tests: {e}")
-        return None, 0
-
-
-def parse_test_results(output):
-    """Parse test output to extract results."""
-    lines = output.split('\n')
-    test_count = 0
-    failed_tests = []
-    
-    for line in lines:
-        if line.strip().startswith('test_') and '... ok' in line:
-            test_count += 1
-        elif line.strip().startswith('test_') and '... FAIL' in line:
-            test_count += 1
-            failed_tests.append(line.split('...')[0].strip())
-    
-    return test_count, failed_tests
-
-
-def generate_report(test_result, execution_time):
+        return None
+    return TestRun(
+        total=result.testsRun,
+        failed=[test.id() for test, _ in result.failures]
+               + [test.id() for test in result.unexpectedSuccesses],
+        errors=[test.id() for test, _ in result.errors],
+        skipped=[test.id() for test, _ in result.skipped],
+        durations=result.durations,
+        execution_time=time.time() - start_time,
+        output=output.getvalue(),
+    )
+
+
+def run_benchmarks(round_time: float = 0.05, rounds: int = 5):
+    """Run the performance suite and return its BenchResults."""
+    import perf_tic_tac_toe
+
+    print("Running benchmarks...")
+    return perf_tic_tac_toe.run_suite(round_time=round_time, rounds=rounds)
+
+
+def profile_games(games: int = 2000, top: int = 15, policy_x: str = 'random',
+                  policy_o: str = 'heuristic') -> ProfileSummary:
+    """Profile simulate.simulate for a batch of games; keep the top functions."""
+    import simulate
+
+    print(f"Profiling {games} simulated games...")
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    profiler.runcall(simulate.simulate, games, policy_x, policy_o)
+    seconds = time.perf_counter() - start
+    stats = pstats.Stats(profiler).stats
+    rows = []
+    for (filename, line, name), (_, calls, own, cumulative, _) in stats.items():
+        label = f"{name} ({Path(filename).name}:{line})" if line else name
+        rows.append((label, calls, own, cumulative))
+    rows.sort(key=lambda row: -row[2])
+    return ProfileSummary(games, seconds, rows[:top])
+
+
+def collect_metrics(test_run: TestRun, benchmarks=None,
+                    profile: Optional[ProfileSummary] = None) -> dict:
+    """The numbers a later report shows its deltas against."""
+    return {
+        'tests': test_run.total,
+        'execution_time': round(test_run.execution_time, 3),
+        'durations': {name: round(seconds, 4) for name, seconds in test_run.durations},
+        'benchmarks': {r.name: round(r.median_ns, 1) for r in benchmarks or []},
+        'profile_seconds': round(profile.seconds, 3) if profile else None,
+    }
+
+
+def load_previous_metrics(path: Path = REPORT_FILE) -> Optional[dict]:
+    """Read the metrics embedded in an earlier report, if there is one."""
+    try:
+        match = METRICS_PATTERN.search(Path(path).read_text())
+    except OSError:
+        return None
+    return json.loads(match.group(1)) if match else None
+
+
+def _delta(current: float, previous: Optional[float]) -> str:
+    """Relative change as "+12.5%", or "–" with nothing to compare with."""
+    if not previous:
+        return "–"
+    return f"{(current / previous - 1) * 100:+.1f}%"
+
+
+def generate_report(test_run: Optional[TestRun], benchmarks=None,
+                    profile: Optional[ProfileSummary] = None,
+                    previous: Optional[dict] = None, slowest: int = 10):
     """Generate the test report."""
-    if test_result is None:
+    if test_run is None:
         return generate_error_report()
-    
-    output = test_result.stdout
-    return_code = test_result.returncode
-    
-    test_count, failed_tests = parse_test_results(output)
-    success = return_code == 0
-    
+
+    previous = previous or {}
+    success = test_run.success
+    execution_time = test_run.execution_time
+    failed_tests = test_run.failed + test_run.errors
+
     report = f"""# Tic-Tac-Toe Test Report
 
 ## Executive Summary
@@ -67,16 +181,17 @@ def generate_report(test_result, execution_time):
 **Date:** {datetime.now().strftime('%B %Y')}  
 **Project:** Tic-Tac-Toe Game  
 **Test Framework:** Python unittest  
-**Total Tests:** {test_count}  
+**Total Tests:** {test_run.total}  
 **Test Status:** {'✅ ALL TESTS PASSING' if success else '❌ TESTS FAILED'}  
 **Execution Time:** {execution_time:.3f}s  
 
 ## Test Results
 
 ### Overall Status
-- **Success Rate:** {((test_count - len(failed_tests)) / max(test_count, 1) * 100):.1f}% ({test_count - len(failed_tests)}/{test_count})
+- **Success Rate:** {(test_run.passed / max(test_run.total - len(test_run.skipped), 1) * 100):.1f}% ({test_run.passed}/{test_run.total - len(test_run.skipped)})
 - **Failed Tests:** {len(failed_tests)}
-- **Execution Time:** {execution_time:.3f} seconds
+- **Skipped Tests:** {len(test_run.skipped)}
+- **Execution Time:** {execution_time:.3f} seconds ({_delta(execution_time, previous.get('execution_time'))} vs previous report)
 
 """
 
@@ -87,11 +202,48 @@ def generate_report(test_result, execution_time):
 
 """
 
+    previous_durations = previous.get('durations', {})
+    report += """
+### Slowest Tests
+
+| Test | Time | vs previous |
+|------|-----:|------------:|
+"""
+    for name, seconds in test_run.slowest(slowest):
+        report += f"| `{name}` | {seconds:.3f}s | {_delta(seconds, previous_durations.get(name))} |\n"
+
+    if benchmarks:
+        previous_benchmarks = previous.get('benchmarks', {})
+        report += """
+## Performance Benchmarks
+
+Per-operation times from `perf_tic_tac_toe.py` (median of the rounds).
+
+| Benchmark | Median | Min | Ops/sec | vs previous |
+|-----------|-------:|----:|--------:|------------:|
+"""
+        for r in benchmarks:
+            report += (f"| {r.name} | {r.median_ns:,.0f} ns | {r.min_ns:,.0f} ns "
+                       f"| {r.ops_per_sec:,.0f} | {_delta(r.median_ns, previous_benchmarks.get(r.name))} |\n")
+
+    if profile:
+        report += f"""
+## Profile
+
+Top {len(profile.rows)} functions by own time while simulating {profile.games:,} games
+({profile.seconds:.2f}s under cProfile, {_delta(profile.seconds, previous.get('profile_seconds'))} vs previous report).
+
+| Function | Calls | Own time | Cumulative |
+|----------|------:|---------:|-----------:|
+"""
+        for name, calls, own, cumulative in profile.rows:
+            report += f"| `{name}` | {calls:,} | {own:.3f}s | {cumulative:.3f}s |\n"
+
     report += f"""
 ## Test Output
 
 ```
-{output}
+{test_run.output}
 ```
 
 ## Recommendations
@@ -106,7 +258,7 @@ def generate_report(test_result, execution_time):
 
 ### Future Enhancements
 1. Add coverage reporting with coverage.py
-2. Add performance benchmarks
+2. Track benchmark regressions with `perf_tic_tac_toe.py --compare`
 3. Consider adding stress tests
 4. Add cross-platform testing
 """
@@ -131,6 +283,8 @@ def generate_report(test_result, execution_time):
 - **Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 - **Test Runner:** {sys.executable}
 - **Python Version:** {sys.version.split()[0]}
+
+<!-- report-metrics: {json.dumps(collect_metrics(test_run, benchmarks, profile))} -->
 """
 
     return report
@@ -176,30 +330,42 @@ The test suite failed to execute properly. This could be due to:
 """
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """Main function to generate test report."""
+    parser = argparse.ArgumentParser(description="Generate the Tic-Tac-Toe test report")
+    parser.add_argument('--output', type=Path, default=REPORT_FILE)
+    parser.add_argument('--no-bench', action='store_true', help="skip the performance suite")
+    parser.add_argument('--no-profile', action='store_true', help="skip the profile")
+    parser.add_argument('--games', type=int, default=2000, help="games to profile")
+    parser.add_argument('--top', type=int, default=15, help="functions in the profile table")
+    parser.add_argument('--slowest', type=int, default=10, help="tests in the slowest table")
+    args = parser.parse_args(argv)
+
     print("🧪 Generating Tic-Tac-Toe Test Report...")
-    
-    # Run tests
-    test_result, execution_time = run_tests()
-    
-    # Generate report
-    report = generate_report(test_result, execution_time)
-    
-    # Write report to file
-    report_file = Path('TEST_REPORT.md')
-    report_file.write_text(report)
-    
-    print(f"📊 Test report generated: {report_file}")
-    print(f"⏱️  Execution time: {execution_time:.3f}s")
-    
-    if test_result and test_result.returncode == 0:
-        print("✅ All tests passed!")
-    elif test_result:
-        print("❌ Some tests failed. Check the report for details.")
-    else:
+    previous = load_previous_metrics(args.output)
+
+    test_run = run_tests()
+    benchmarks = profile = None
+    if test_run is not None:
+        if not args.no_bench:
+            benchmarks = run_benchmarks()
+        if not args.no_profile:
+            profile = profile_games(args.games, args.top)
+
+    report = generate_report(test_run, benchmarks, profile, previous, args.slowest)
+    args.output.write_text(report)
+
+    print(f"📊 Test report generated: {args.output}")
+    if test_run is None:
         print("❌ Test execution failed. Check the report for details.")
+        return 1
+    print(f"⏱️  Execution time: {test_run.execution_time:.3f}s")
+    if test_run.success:
+        print("✅ All tests passed!")
+        return 0
+    print("❌ Some tests failed. Check the report for details.")
+    return 1
 
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Load generator for the Tic Tac Toe server
+Opens many concurrent connections, plays random legal moves as fast as the
+server answers, and reports moves/sec and latency percentiles.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from typing import List, Optional
+
+from server import DEFAULT_HOST, DEFAULT_PORT
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of a list of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, round(fraction * len(ordered)) - 1))
+    return ordered[rank]
+
+
+async def _client(host: str, port: int, moves: int, seed: int, latencies: List[float]) -> None:
+    """Play random games over one connection until moves have been sent."""
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    reply = (await reader.readline()).decode().split()
+    for _ in range(moves):
+        cells, status = reply[2], reply[3]
+        if status != 'TURN':
+            request = "new"
+        else:
+            cell = rng.choice([i for i, value in enumerate(cells) if value == '.'])
+            request = f"{cell // 3 + 1} {cell % 3 + 1}"
+        start = time.perf_counter()
+        writer.write((request + "\n").encode())
+        reply = (await reader.readline()).decode().split()
+        latencies.append(time.perf_counter() - start)
+    writer.write(b"quit\n")
+    await writer.drain()
+    writer.close()
+
+
+async def run_load(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, clients: int = 100,
+                   moves: int = 200, seed: int = 0) -> dict:
+    """Drive the server with concurrent clients; return throughput and latency stats."""
+    latencies: List[float] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, moves, seed + i, latencies)
+                           for i in range(clients)))
+    elapsed = time.perf_counter() - start
+    return {
+        'requests': len(latencies),
+        'seconds': elapsed,
+        'requests_per_sec': len(latencies) / elapsed,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--clients', type=int, default=100)
+    parser.add_argument('--moves', type=int, default=200, help="requests per client")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    stats = asyncio.run(run_load(args.host, args.port, args.clients, args.moves, args.seed))
+    print(f"{stats['requests']} requests from {args.clients} clients in {stats['seconds']:.2f}s")
+    print(f"{stats['requests_per_sec']:,.0f} moves/s, "
+          f"p50 {stats['p50_ms']:.2f} ms, p99 {stats['p99_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo Tree Search player for Tic Tac Toe and its larger-board variants
+UCT selection, random rollouts on raw bitmasks, tree reuse between moves and
+optional root-parallel search across processes.
+"""
+
+import math
+import random
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import openings
+from bitboard import Geometry, board_geometry, iter_bits
+
+
+SearchStats = namedtuple('SearchStats', ['playouts', 'seconds', 'playouts_per_sec',
+                                         'reused_visits', 'workers'])
+
+
+class Node:
+    """One position in the search tree.
+
+    x and o are the position's masks and to_move the side about to play.
+    wins counts results for the side that moved *into* this node (1 for a
+    win, 0.5 for a draw), which is what its parent maximises.
+    """
+
+    __slots__ = ('x', 'o', 'to_move', 'move', 'parent', 'children', 'untried',
+                 'visits', 'wins', 'result')
+
+    def __init__(self, x: int, o: int, to_move: str, geo: Geometry,
+                 move: Optional[int] = None, parent: Optional['Node'] = None):
+        self.x = x
+        self.o = o
+        self.to_move = to_move
+        self.move = move
+        self.parent = parent
+        self.children: Dict[int, 'Node'] = {}
+        self.visits = 0
+        self.wins = 0.0
+        # result is 'X'/'O' for a won position, 'draw' for a full board,
+        # None while the game goes on.
+        self.result: Optional[str] = None
+        if move is not None:
+            mover = 'O' if to_move == 'X' else 'X'
+            if geo.line_through(x if mover == 'X' else o, move):
+                self.result = mover
+        if self.result is None and (x | o) == geo.full:
+            self.result = 'draw'
+        self.untried: List[int] = [] if self.result else list(iter_bits(geo.full & ~(x | o)))
+
+    def child(self, cell: int, geo: Geometry) -> 'Node':
+        """Create, attach and return the child reached by playing cell."""
+        bit = 1 << cell
+        if self.to_move == 'X':
+            node = Node(self.x | bit, self.o, 'O', geo, cell, self)
+        else:
+            node = Node(self.x, self.o | bit, 'X', geo, cell, self)
+        self.children[cell] = node
+        return node
+
+
+def _rollout(x: int, o: int, to_move: str, geo: Geometry, rng: random.Random) -> str:
+    """Play random moves to the end; return 'X', 'O' or 'draw'."""
+    empty = list(iter_bits(geo.full & ~(x | o)))
+    rng.shuffle(empty)
+    for cell in empty:
+        if to_move == 'X':
+            x |= 1 << cell
+            if geo.line_through(x, cell):
+                return 'X'
+            to_move = 'O'
+        else:
+            o |= 1 << cell
+            if geo.line_through(o, cell):
+                return 'O'
+            to_move = 'X'
+    return 'draw'
+
+
+def _run(root: Node, geo: Geometry, rng: random.Random, exploration: float,
+         playouts: Optional[int], deadline: Optional[float]) -> int:
+    """Run UCT iterations on root until a budget runs out; return the count."""
+    done = 0
+    log = math.log
+    sqrt = math.sqrt
+    while (playouts is None or done < playouts) and \
+            (deadline is None or time.perf_counter() < deadline):
+        node = root
+        # Selection: descend through fully expanded nodes by UCT.
+        while not node.untried and node.children:
+            scale = exploration * sqrt(log(node.visits))
+            best = None
+            best_score = -1.0
+            for child in node.children.values():
+                score = child.wins / child.visits + scale / sqrt(child.visits)
+                if score > best_score:
+                    best, best_score = child, score
+            node = best
+        # Expansion.
+        if node.untried:
+            cell = node.untried.pop(rng.randrange(len(node.untried)))
+            node = node.child(cell, geo)
+        # Simulation.
+        result = node.result or _rollout(node.x, node.o, node.to_move, geo, rng)
+        # Backpropagation.
+        while node is not None:
+            node.visits += 1
+            if result == 'draw':
+                node.wins += 0.5
+            elif result != node.to_move:
+                node.wins += 1.0
+            node = node.parent
+        done += 1
+    return done
+
+
+def _worker_search(x: int, o: int, to_move: str, size: int, win_length: int, seed: int,
+                   exploration: float, playouts: Optional[int],
+                   time_limit: Optional[float]) -> Tuple[Dict[int, Tuple[int, float]], int]:
+    """Process-pool entry point: search a fresh tree, return root child stats."""
+    geo = board_geometry(size, win_length)
+    root = Node(x, o, to_move, geo)
+    deadline = time.perf_counter() + time_limit if time_limit else None
+    done = _run(root, geo, random.Random(seed), exploration, playouts, deadline)
+    return {cell: (child.visits, child.wins) for cell, child in root.children.items()}, done
+
+
+class MCTS:
+    """UCT search with tree reuse between consecutive moves.
+
+    Budgets: stop after playouts iterations and/or time_limit seconds
+    (whichever comes first; at least one must be set).  With workers > 1,
+    workers - 1 extra processes each search an independent tree from the
+    same root while this process searches its reused tree, and the root
+    visit counts are summed before choosing the most-visited move.
+    """
+
+    def __init__(self, playouts: Optional[int] = 1000, time_limit: Optional[float] = None,
+                 exploration: float = math.sqrt(2), workers: int = 1,
+                 rng: Optional[random.Random] = None):
+        if playouts is None and time_limit is None:
+            raise ValueError("MCTS needs a playout budget, a time limit or both")
+        self.playouts = playouts
+        self.time_limit = time_limit
+        self.exploration = exploration
+        self.workers = workers
+        self.rng = rng or random.Random()
+        self.root: Optional[Node] = None
+        # The board the saved tree was grown on; Node cells mean nothing on another.
+        self._geometry: Optional[Geometry] = None
+        self.stats: Optional[SearchStats] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def close(self) -> None:
+        """Shut down the worker processes, if any were started."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _reuse_root(self, x: int, o: int, to_move: str, geo: Geometry) -> Node:
+        """Return the subtree for (x, o) from the previous search, or a new root."""
+        node = self.root
+        if self._geometry is None or \
+                (self._geometry.size, self._geometry.win_length) != (geo.size, geo.win_length):
+            node = None
+        while node is not None and (node.x, node.o) != (x, o):
+            mine = x if node.to_move == 'X' else o
+            have = node.x if node.to_move == 'X' else node.o
+            new = mine & ~have
+            if (node.x & ~x) or (node.o & ~o) or new & (new - 1) or not new:
+                node = None
+                break
+            node = node.children.get(new.bit_length() - 1)
+        if node is None or node.to_move != to_move:
+            return Node(x, o, to_move, geo)
+        node.parent = None
+        return node
+
+    def search(self, game, rng: Optional[random.Random] = None) -> Tuple[int, int]:
+        """Return the chosen (row, col) for game.current_player."""
+        bits = game.bitboard
+        geo = bits.geometry
+        rng = rng or self.rng
+        root = self._reuse_root(bits.x, bits.o, game.current_player, geo)
+        if root.result:
+            raise ValueError("the game is already over")
+        reused = root.visits
+        self.root = root
+        self._geometry = geo
+
+        start = time.perf_counter()
+        deadline = start + self.time_limit if self.time_limit else None
+        futures = []
+        if self.workers > 1:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers - 1)
+            futures = [self._pool.submit(_worker_search, bits.x, bits.o, game.current_player,
+                                         geo.size, geo.win_length, rng.getrandbits(64),
+                                         self.exploration, self.playouts, self.time_limit)
+                       for _ in range(self.workers - 1)]
+        done = _run(root, geo, rng, self.exploration, self.playouts, deadline)
+
+        visits = {cell: child.visits for cell, child in root.children.items()}
+        for future in futures:
+            child_stats, worker_done = future.result()
+            done += worker_done
+            for cell, (child_visits, _) in child_stats.items():
+                visits[cell] = visits.get(cell, 0) + child_visits
+        elapsed = time.perf_counter() - start
+        self.stats = SearchStats(done, elapsed, done / elapsed if elapsed else 0.0,
+                                 reused, self.workers)
+
+        cell = max(visits, key=lambda c: (visits[c], -c))
+        return divmod(cell, geo.size)
+
+
+class MCTSPolicy:
+    """Move policy wrapper: policy(game, rng) -> (row, col).
+
+    Keeps one MCTS per process so consecutive moves of a game reuse the tree.
+    While the position is in the opening book for the board (see
+    openings.py), the book move is played instead of searching.
+    """
+
+    def __init__(self, use_book: bool = True, **options):
+        self.use_book = use_book
+        self.options = options
+        self.searcher: Optional[MCTS] = None
+
+    def __call__(self, game, rng: random.Random) -> Tuple[int, int]:
+        if self.use_book:
+            book = openings.get_book(game.size, game.win_length)
+            move = book.best_move(game, rng) if book else None
+            if move is not None:
+                return move
+        if self.searcher is None:
+            self.searcher = MCTS(**self.options)
+        return self.searcher.search(game, rng)
+
+
+def main() -> None:
+    """Time one search from the opening of a board and report playouts/sec."""
+    import argparse
+    from tic_tac_toe import TicTacToe
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=3)
+    parser.add_argument('--win-length', type=int)
+    parser.add_argument('--playouts', type=int)
+    parser.add_argument('--time-limit', type=float, default=1.0)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    game = TicTacToe(args.size, args.win_length)
+    searcher = MCTS(args.playouts, args.time_limit, workers=args.workers,
+                    rng=random.Random(args.seed))
+    try:
+        move = searcher.search(game)
+    finally:
+        searcher.close()
+    stats = searcher.stats
+    print(f"{args.size}x{args.size}: best move {move[0] + 1} {move[1] + 1} after "
+          f"{stats.playouts} playouts in {stats.seconds:.2f}s "
+          f"({stats.playouts_per_sec:,.0f} playouts/s, {stats.workers} worker(s))")
+
+
+if __name__ == "__main__":
+    main()
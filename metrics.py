@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Opt-in instrumentation of the TicTacToe hot paths
+enable() swaps TicTacToe's methods for wrappers that count calls and record
+their latency in histograms, plus counters of moves made and games finished;
+disable() puts the original functions back.  While disabled nothing is
+wrapped, so the game runs exactly the code it runs without this module.
+Snapshots export as Prometheus text or JSON, optionally dumped to a file
+periodically.
+
+    python3 metrics.py --games 2000 --format prometheus
+    python3 metrics.py -x mcts -o heuristic --games 50 --dump metrics.json --interval 1
+"""
+
+import argparse
+import functools
+import json
+import os
+import random
+import sys
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from tic_tac_toe import TicTacToe
+
+
+# Methods wrapped by default: the rules engine and the terminal I/O.
+INSTRUMENTED = ('make_move', 'unmake_move', 'is_valid_move', 'available_moves',
+                'check_winner', 'is_board_full', 'display_board', 'get_player_input')
+
+# Upper bounds of the latency buckets: powers of two from 64 ns to about
+# 34 s, so one set covers a cached check_winner and a human typing a move.
+BUCKETS_NS = tuple(2 ** k for k in range(6, 36))
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+PREFIX = 'tictactoe'
+
+
+class Histogram:
+    """Call count, total and bucketed distribution of latencies in ns."""
+
+    __slots__ = ('counts', 'count', 'total', 'max')
+
+    def __init__(self):
+        # One count per bucket in BUCKETS_NS, then one for larger values.
+        self.counts = [0] * (len(BUCKETS_NS) + 1)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def observe(self, ns: int) -> None:
+        """Record one call that took ns nanoseconds."""
+        self.counts[bisect_left(BUCKETS_NS, ns)] += 1
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+
+    def percentile(self, q: float) -> float:
+        """Estimate the q-quantile (0 < q <= 1) in ns.
+
+        Interpolates linearly inside the bucket holding it, so the error is
+        at most the width of that bucket; never reports more than the
+        largest observation.
+        """
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        below = 0
+        for index, count in enumerate(self.counts):
+            if count and below + count >= target:
+                lower = BUCKETS_NS[index - 1] if index else 0
+                upper = BUCKETS_NS[index] if index < len(BUCKETS_NS) else self.max
+                value = lower + (target - below) / count * (upper - lower)
+                return min(value, self.max)
+            below += count
+        return float(self.max)
+
+
+class Metrics:
+    """Everything recorded since enable() (or the last reset())."""
+
+    def __init__(self, methods: Sequence[str] = INSTRUMENTED):
+        self.histograms: Dict[str, Histogram] = {name: Histogram() for name in methods}
+        self.moves = 0
+        self.games = 0
+        self.started = time.perf_counter()
+
+    def reset(self) -> None:
+        """Zero every counter and restart the clock for the rates."""
+        for name in self.histograms:
+            self.histograms[name] = Histogram()
+        self.moves = self.games = 0
+        self.started = time.perf_counter()
+
+    def snapshot(self) -> dict:
+        """The current values as plain data (what the JSON dump contains)."""
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        methods = {}
+        for name, histogram in self.histograms.items():
+            entry = {'calls': histogram.count, 'seconds': histogram.total / 1e9,
+                     'max_ns': histogram.max}
+            for q in QUANTILES:
+                entry[f'p{q * 100:g}_ns'] = histogram.percentile(q)
+            methods[name] = entry
+        return {'elapsed': elapsed, 'games': self.games, 'moves': self.moves,
+                'games_per_sec': self.games / elapsed, 'moves_per_sec': self.moves / elapsed,
+                'methods': methods}
+
+    def prometheus(self) -> str:
+        """The current values in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines = []
+
+        def metric(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {PREFIX}_{name} {kind}")
+
+        for name, kind, text in (('games', 'counter', 'Games finished.'),
+                                 ('moves', 'counter', 'Successful make_move calls.')):
+            metric(f'{name}_total', kind, text)
+            lines.append(f"{PREFIX}_{name}_total {snapshot[name]}")
+        for name in ('games', 'moves'):
+            metric(f'{name}_per_second', 'gauge', f"Mean {name} per second since enabled.")
+            lines.append(f"{PREFIX}_{name}_per_second {snapshot[f'{name}_per_sec']:.6g}")
+
+        metric('call_duration_seconds', 'histogram', "Latency of TicTacToe method calls.")
+        for method, histogram in self.histograms.items():
+            label = f'method="{method}"'
+            cumulative = 0
+            for bound, count in zip(BUCKETS_NS, histogram.counts):
+                cumulative += count
+                lines.append(f'{PREFIX}_call_duration_seconds_bucket{{{label},le="{bound / 1e9:.6g}"}} '
+                             f'{cumulative}')
+            lines.append(f'{PREFIX}_call_duration_seconds_bucket{{{label},le="+Inf"}} '
+                         f'{histogram.count}')
+            lines.append(f'{PREFIX}_call_duration_seconds_sum{{{label}}} {histogram.total / 1e9:.9g}')
+            lines.append(f'{PREFIX}_call_duration_seconds_count{{{label}}} {histogram.count}')
+
+        metric('call_duration_quantile_seconds', 'gauge',
+               "Latency percentiles estimated from the histogram buckets.")
+        for method, histogram in self.histograms.items():
+            for q in QUANTILES:
+                lines.append(f'{PREFIX}_call_duration_quantile_seconds'
+                             f'{{method="{method}",quantile="{q:g}"}} '
+                             f'{histogram.percentile(q) / 1e9:.6g}')
+        return "\n".join(lines) + "\n"
+
+
+# The Metrics being recorded and the functions the wrappers replaced, or
+# None while instrumentation is off.
+_current: Optional[Metrics] = None
+_originals: Dict[str, object] = {}
+
+
+def _timed(method, histogram: Histogram):
+    clock = time.perf_counter_ns
+    observe = histogram.observe
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        start = clock()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            observe(clock() - start)
+    return wrapper
+
+
+def _timed_make_move(method, histogram: Histogram, metrics: Metrics):
+    clock = time.perf_counter_ns
+    observe = histogram.observe
+
+    @functools.wraps(method)
+    def make_move(self, row, col):
+        start = clock()
+        moved = method(self, row, col)
+        observe(clock() - start)
+        if moved:
+            metrics.moves += 1
+        return moved
+    return make_move
+
+
+def _game_over_property(metrics: Metrics) -> property:
+    """A game_over that counts each False -> True change as a finished game.
+
+    As a data descriptor on the class it takes precedence over the plain
+    instance attribute, which it keeps storing the value in; so games
+    created before enable() carry on, and deleting it restores the plain
+    attribute.
+    """
+    def get(self):
+        return self.__dict__['game_over']
+
+    def set(self, value):
+        if value and not self.__dict__.get('game_over'):
+            metrics.games += 1
+        self.__dict__['game_over'] = value
+
+    return property(get, set)
+
+
+def enable(methods: Sequence[str] = INSTRUMENTED) -> Metrics:
+    """Start instrumenting TicTacToe and return the Metrics being recorded.
+
+    Calls are recorded from every thread, but counters are not locked, so
+    concurrent games may occasionally lose an increment.  Nested calls
+    (make_move calling is_valid_move) are each recorded, so a caller's
+    time includes its callees'.  Enabling again starts a fresh Metrics.
+    """
+    global _current
+    disable()
+    metrics = Metrics(methods)
+    for name in methods:
+        original = TicTacToe.__dict__[name]
+        _originals[name] = original
+        if name == 'make_move':
+            wrapper = _timed_make_move(original, metrics.histograms[name], metrics)
+        else:
+            wrapper = _timed(original, metrics.histograms[name])
+        setattr(TicTacToe, name, wrapper)
+    TicTacToe.game_over = _game_over_property(metrics)
+    _current = metrics
+    return metrics
+
+
+def disable() -> Optional[Metrics]:
+    """Restore TicTacToe's original methods; return what was recorded."""
+    global _current
+    metrics, _current = _current, None
+    if metrics is not None:
+        for name, original in _originals.items():
+            setattr(TicTacToe, name, original)
+        _originals.clear()
+        del TicTacToe.game_over
+    return metrics
+
+
+def current() -> Optional[Metrics]:
+    """The Metrics being recorded, or None while instrumentation is off."""
+    return _current
+
+
+@contextmanager
+def instrumented(methods: Sequence[str] = INSTRUMENTED) -> Iterator[Metrics]:
+    """Instrument TicTacToe for the duration of a with block."""
+    metrics = enable(methods)
+    try:
+        yield metrics
+    finally:
+        disable()
+
+
+def write_json(metrics: Metrics, path: str) -> None:
+    """Write a snapshot to path, replacing it atomically."""
+    temporary = f"{path}.tmp"
+    with open(temporary, 'w') as f:
+        json.dump(metrics.snapshot(), f, indent=2)
+    os.replace(temporary, path)
+
+
+class PeriodicDump:
+    """Write a JSON snapshot to a file every interval seconds.
+
+    Runs in a daemon thread from start() until stop(), which writes one
+    final snapshot; also usable as a context manager.
+    """
+
+    def __init__(self, metrics: Metrics, path: str, interval: float = 10.0):
+        self.metrics = metrics
+        self.path = path
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='metrics-dump', daemon=True)
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            write_json(self.metrics, self.path)
+
+    def start(self) -> 'PeriodicDump':
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._thread.join()
+        write_json(self.metrics, self.path)
+
+    def __enter__(self) -> 'PeriodicDump':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Play instrumented headless games and print the metrics."""
+    from policies import get_policy
+    from simulate import play_headless
+
+    parser = argparse.ArgumentParser(description="Instrumented headless Tic Tac Toe games")
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('-x', '--policy-x', default='random')
+    parser.add_argument('-o', '--policy-o', default='random')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--size', type=int, default=3)
+    parser.add_argument('--win-length', type=int)
+    parser.add_argument('--format', choices=('prometheus', 'json'), default='prometheus')
+    parser.add_argument('--dump', metavar='FILE', help="also write a JSON snapshot to FILE")
+    parser.add_argument('--interval', type=float, default=10.0,
+                        help="seconds between --dump snapshots (default: 10)")
+    args = parser.parse_args(argv)
+
+    policy_x, policy_o = get_policy(args.policy_x), get_policy(args.policy_o)
+    rng = random.Random(args.seed)
+    with instrumented() as metrics:
+        dump = PeriodicDump(metrics, args.dump, args.interval).start() if args.dump else None
+        try:
+            for _ in range(args.games):
+                play_headless(policy_x, policy_o, rng, TicTacToe(args.size, args.win_length))
+        finally:
+            if dump is not None:
+                dump.stop()
+    if args.format == 'json':
+        print(json.dumps(metrics.snapshot(), indent=2))
+    else:
+        print(metrics.prometheus(), end='')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
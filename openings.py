@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Opening book for Tic Tac Toe
+Maps the symmetry-reduced positions of the first few plies to ranked moves,
+built from the solver or from self-play statistics and stored in a compact
+binary file that is only read the first time a book is asked for.
+
+File layout (little-endian):
+
+    header   16 bytes   magic b'TTTB', version u16, board size u8,
+                        win length u8, plies u16, entry count u32, 4 bytes padding
+    entries             position key (key_bytes(size) bytes), move count u8,
+                        then per move: canonical cell u16, score i16
+
+Scores are from the mover's point of view, from -1000 (always loses) to
+1000 (always wins); moves are stored best first.
+"""
+
+import argparse
+import random
+import struct
+import sys
+from collections import defaultdict
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from bitboard import INVERSE_SYMMETRIES, SYMMETRIES, board_symmetries, canonical
+
+
+MAGIC = b'TTTB'
+VERSION = 1
+HEADER = struct.Struct('<4sHBBHI4x')
+MOVE = struct.Struct('<Hh')
+SCALE = 1000
+
+DEFAULT_DIR = Path(__file__).parent
+
+# A ranked move: (canonical cell, score).
+BookMove = Tuple[int, int]
+
+
+def default_path(size: int = 3, win_length: Optional[int] = None) -> Path:
+    """Where the book for a board geometry lives next to this module."""
+    win_length = size if win_length is None else win_length
+    if (size, win_length) == (3, 3):
+        return DEFAULT_DIR / 'tic_tac_toe_book.bin'
+    return DEFAULT_DIR / f'tic_tac_toe_book_{size}x{size}_{win_length}.bin'
+
+
+def key_bytes(size: int) -> int:
+    """Bytes needed for a position key (two bits per cell)."""
+    return (2 * size * size + 7) // 8
+
+
+@lru_cache(maxsize=None)
+def _symmetries(size: int) -> Tuple[Tuple[Tuple[int, ...], ...], Tuple[Tuple[int, ...], ...]]:
+    """(forward, inverse) cell permutations for the 8 symmetries of a board."""
+    if size == 3:
+        return SYMMETRIES, INVERSE_SYMMETRIES
+    forward = board_symmetries(size)
+    inverse = tuple(tuple(perm.index(j) for j in range(size * size)) for perm in forward)
+    return forward, inverse
+
+
+def canonical_position(x: int, o: int, size: int) -> Tuple[int, int]:
+    """Return (key, symmetry) of the symmetry-reduced position.
+
+    The key is min over symmetries of image(x) | image(o) << cells, as in
+    bitboard.canonical (which is used directly for 3x3).
+    """
+    if size == 3:
+        return canonical(x, o)
+    cells = size * size
+    marks_x = [i for i in range(cells) if x >> i & 1]
+    marks_o = [i for i in range(cells) if o >> i & 1]
+    best_key, best_sym = -1, 0
+    for sym, perm in enumerate(_symmetries(size)[0]):
+        key = 0
+        for cell in marks_x:
+            key |= 1 << perm[cell]
+        for cell in marks_o:
+            key |= 1 << (perm[cell] + cells)
+        if best_key < 0 or key < best_key:
+            best_key, best_sym = key, sym
+    return best_key, best_sym
+
+
+class OpeningBook:
+    """Ranked moves for the early canonical positions of one board geometry."""
+
+    def __init__(self, size: int = 3, win_length: Optional[int] = None, plies: int = 0,
+                 entries: Optional[Dict[int, List[BookMove]]] = None):
+        self.size = size
+        self.win_length = size if win_length is None else win_length
+        self.plies = plies
+        self.entries: Dict[int, List[BookMove]] = entries or {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def moves(self, game) -> List[Tuple[Tuple[int, int], int]]:
+        """Return [((row, col), score), ...] best first; [] if out of book."""
+        if (game.size, game.win_length) != (self.size, self.win_length):
+            return []
+        bits = game.bitboard
+        key, sym = canonical_position(bits.x, bits.o, self.size)
+        ranked = self.entries.get(key)
+        if not ranked:
+            return []
+        inverse = _symmetries(self.size)[1][sym]
+        return [(divmod(inverse[cell], self.size), score) for cell, score in ranked]
+
+    def best_move(self, game, rng: Optional[random.Random] = None) -> Optional[Tuple[int, int]]:
+        """Return a top-scoring book move (random among ties with rng), or None."""
+        ranked = self.moves(game)
+        if not ranked:
+            return None
+        top = [move for move, score in ranked if score == ranked[0][1]]
+        return rng.choice(top) if rng else top[0]
+
+    def save(self, path) -> int:
+        """Write the book; return the file size in bytes."""
+        width = key_bytes(self.size)
+        out = bytearray(HEADER.pack(MAGIC, VERSION, self.size, self.win_length, self.plies,
+                                    len(self.entries)))
+        for key in sorted(self.entries):
+            ranked = self.entries[key]
+            out += key.to_bytes(width, 'little')
+            out.append(len(ranked))
+            for cell, score in ranked:
+                out += MOVE.pack(cell, score)
+        Path(path).write_bytes(out)
+        return len(out)
+
+    @classmethod
+    def load(cls, path) -> 'OpeningBook':
+        """Read a book written by save."""
+        data = Path(path).read_bytes()
+        magic, version, size, win_length, plies, count = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} opening book")
+        width = key_bytes(size)
+        entries = {}
+        pos = HEADER.size
+        for _ in range(count):
+            key = int.from_bytes(data[pos:pos + width], 'little')
+            n = data[pos + width]
+            pos += width + 1
+            entries[key] = [MOVE.unpack_from(data, pos + i * MOVE.size) for i in range(n)]
+            pos += n * MOVE.size
+        return cls(size, win_length, plies, entries)
+
+
+def build_from_solver(plies: int = 3) -> OpeningBook:
+    """Rank every move of the positions before ply plies by solver value.
+
+    Ties keep the solver's centre/corner/edge move order.  3x3 only.
+    """
+    import solver
+
+    engine = solver.default_solver()
+    entries: Dict[int, List[BookMove]] = {}
+    frontier = {(0, 0)}
+    for ply in range(plies):
+        next_frontier = set()
+        for x, o in frontier:
+            key, sym = canonical(x, o)
+            if key in entries:
+                continue
+            me, opp = (x, o) if ply % 2 == 0 else (o, x)
+            values = engine.move_values(me, opp)
+            ranked = sorted(values.items(), key=lambda item: -item[1])
+            entries[key] = [(SYMMETRIES[sym][cell], value * SCALE) for cell, value in ranked]
+            for cell in values:
+                if ply % 2 == 0:
+                    next_frontier.add((x | 1 << cell, o))
+                else:
+                    next_frontier.add((x, o | 1 << cell))
+        frontier = next_frontier
+    return OpeningBook(3, 3, plies, entries)
+
+
+def build_from_games(records: Iterable[Tuple[Sequence[int], Optional[str]]], size: int = 3,
+                     win_length: Optional[int] = None, plies: int = 3,
+                     min_games: int = 1) -> OpeningBook:
+    """Rank the early moves seen in finished games by their average result.
+
+    records are (cell indices in play order, winner or None) pairs such as
+    simulate.GameRecord.  A move scores 1 when its mover went on to win,
+    0 for a draw and -1 for a loss; moves seen in fewer than min_games games
+    are left out.
+    """
+    # canonical key -> canonical cell -> [games, total score]
+    stats: Dict[int, Dict[int, List[int]]] = defaultdict(lambda: defaultdict(lambda: [0, 0]))
+    forward = _symmetries(size)[0]
+    for moves, winner in records:
+        x = o = 0
+        for ply, cell in enumerate(moves[:plies]):
+            key, sym = canonical_position(x, o, size)
+            mover = 'X' if ply % 2 == 0 else 'O'
+            counts = stats[key][forward[sym][cell]]
+            counts[0] += 1
+            counts[1] += 0 if winner is None else 1 if winner == mover else -1
+            if mover == 'X':
+                x |= 1 << cell
+            else:
+                o |= 1 << cell
+    entries = {}
+    for key, cells in stats.items():
+        ranked = sorted(((cell, round(SCALE * total / games))
+                         for cell, (games, total) in cells.items() if games >= min_games),
+                        key=lambda item: (-item[1], item[0]))
+        if ranked:
+            entries[key] = ranked
+    return OpeningBook(size, win_length, plies, entries)
+
+
+def selfplay_records(games: int, policy_x: str, policy_o: str, size: int = 3,
+                     win_length: Optional[int] = None, seed: int = 0, workers: int = 1):
+    """Yield (moves, winner) for games between two named policies."""
+    if (size, size if win_length is None else win_length) == (3, 3):
+        from simulate import iter_chunks
+        for chunk in iter_chunks(games, policy_x, policy_o, seed, workers):
+            yield from chunk
+        return
+    from policies import get_policy
+    from simulate import play_headless
+    from tic_tac_toe import TicTacToe
+    rng = random.Random(seed)
+    px, po = get_policy(policy_x), get_policy(policy_o)
+    for _ in range(games):
+        yield play_headless(px, po, rng, TicTacToe(size, win_length))
+
+
+_books: Dict[Path, Optional[OpeningBook]] = {}
+
+
+def get_book(size: int = 3, win_length: Optional[int] = None) -> Optional[OpeningBook]:
+    """Return the process-wide book for a geometry, read on first use.
+
+    Returns None when no book file exists for that geometry.
+    """
+    path = default_path(size, win_length)
+    if path not in _books:
+        _books[path] = OpeningBook.load(path) if path.exists() else None
+    return _books[path]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point: build a book or show its summary."""
+    parser = argparse.ArgumentParser(description="Tic Tac Toe opening book")
+    parser.add_argument('command', choices=['solver', 'selfplay', 'info'])
+    parser.add_argument('--path', type=Path, help="book file (default: next to this module)")
+    parser.add_argument('--plies', type=int, default=3)
+    parser.add_argument('--size', type=int, default=3)
+    parser.add_argument('--win-length', type=int)
+    parser.add_argument('--games', type=int, default=100_000)
+    parser.add_argument('-x', '--policy-x', default='random')
+    parser.add_argument('-o', '--policy-o', default='random')
+    parser.add_argument('--min-games', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=1)
+    args = parser.parse_args(argv)
+    path = args.path or default_path(args.size, args.win_length)
+
+    if args.command == 'info':
+        book = OpeningBook.load(path)
+        print(f"{path}: {book.size}x{book.size}, {book.win_length} in a row, "
+              f"{book.plies} plies, {len(book)} positions")
+        return 0
+    if args.command == 'solver':
+        book = build_from_solver(args.plies)
+    else:
+        records = selfplay_records(args.games, args.policy_x, args.policy_o, args.size,
+                                   args.win_length, args.seed, args.workers)
+        book = build_from_games(records, args.size, args.win_length, args.plies, args.min_games)
+    size = book.save(path)
+    print(f"Wrote {len(book)} positions to {path} ({size} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
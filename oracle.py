@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Precomputed game-tree oracle for Tic Tac Toe
+Every legal position's outcome, distance-to-end and optimal moves, stored in a
+fixed-layout binary table that is memory-mapped at runtime.
+
+File layout (little-endian):
+
+    header   16 bytes   magic b'TTTO', version u16, record size u16,
+                        record count u32, 4 bytes padding
+    records  3^9 x 4    one record per base-3 position index:
+                        outcome u8, distance u8, optimal-move mask u16
+
+The index of a position is sum(digit * 3**cell) with digit 0 for an empty
+cell, 1 for X and 2 for O.  Outcome is 0 for a position that cannot arise in
+legal play, 1 if X wins, 2 if O wins and 3 for a draw under perfect play.
+Distance is the number of plies to the end of the game when the winner wins
+as fast as possible and the loser holds out as long as possible.
+"""
+
+import argparse
+import mmap
+import struct
+import sys
+from collections import namedtuple
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from bitboard import CELLS, BitBoard, iter_bits, require_standard
+from tic_tac_toe import TicTacToe
+
+
+MAGIC = b'TTTO'
+VERSION = 1
+HEADER = struct.Struct('<4sHHI4x')
+RECORD = struct.Struct('<BBH')
+RECORD_COUNT = 3 ** CELLS
+
+UNREACHABLE, X_WINS, O_WINS, DRAW = 0, 1, 2, 3
+OUTCOMES = {X_WINS: 'X', O_WINS: 'O', DRAW: 'draw'}
+
+DEFAULT_PATH = Path(__file__).with_name('tic_tac_toe_oracle.bin')
+
+# TERNARY[mask] is sum(3**cell) over the cells set in a 9-bit mask.
+TERNARY = tuple(sum(3 ** cell for cell in iter_bits(mask)) for mask in range(1 << CELLS))
+
+OracleEntry = namedtuple('OracleEntry', ['outcome', 'distance', 'moves'])
+
+
+def position_index(x: int, o: int) -> int:
+    """Return the base-3 index of a position given its X and O masks."""
+    return TERNARY[x] + 2 * TERNARY[o]
+
+
+def reachable_positions() -> Dict[int, Tuple[int, int]]:
+    """Enumerate every position reachable under the TicTacToe rules.
+
+    Walks the game tree with a single TicTacToe instance, using make_move
+    and switch_player exactly as play_game does (and unmake_move to back
+    up), stopping at wins and full boards.  Returns {index: (x_mask, o_mask)}.
+    """
+    game = TicTacToe()
+    found: Dict[int, Tuple[int, int]] = {}
+
+    def visit() -> None:
+        bits = game.bitboard
+        index = position_index(bits.x, bits.o)
+        if index in found:
+            return
+        found[index] = (bits.x, bits.o)
+        if game.check_winner() or game.is_board_full():
+            return
+        for row in range(3):
+            for col in range(3):
+                if game.make_move(row, col):
+                    game.switch_player()
+                    visit()
+                    game.unmake_move()
+
+    visit()
+    return found
+
+
+def _solve_all(positions: Dict[int, Tuple[int, int]]) -> Dict[int, Tuple[int, int, int]]:
+    """Return {index: (outcome, distance, move_mask)} for every position."""
+    results: Dict[int, Tuple[int, int, int]] = {}
+
+    def solve(x: int, o: int) -> Tuple[int, int, int]:
+        index = position_index(x, o)
+        if index in results:
+            return results[index]
+        bits = BitBoard(x, o)
+        winner = bits.winner()
+        if winner:
+            result = (X_WINS if winner == 'X' else O_WINS, 0, 0)
+        elif bits.is_full():
+            result = (DRAW, 0, 0)
+        else:
+            mover_x = bin(x).count('1') == bin(o).count('1')
+            mover_wins = X_WINS if mover_x else O_WINS
+            best_score = None
+            best_moves = 0
+            best_distance = 0
+            for cell in iter_bits(~(x | o) & ((1 << CELLS) - 1)):
+                if mover_x:
+                    outcome, distance, _ = solve(x | 1 << cell, o)
+                else:
+                    outcome, distance, _ = solve(x, o | 1 << cell)
+                distance += 1
+                # Win fast, lose slow: prefer short wins and long losses.
+                if outcome == mover_wins:
+                    score = 100 - distance
+                elif outcome == DRAW:
+                    score = 0
+                else:
+                    score = distance - 100
+                if best_score is None or score > best_score:
+                    best_score = score
+                    best_moves = 1 << cell
+                    best_distance = distance
+                    best_outcome = outcome
+                elif score == best_score:
+                    best_moves |= 1 << cell
+            result = (best_outcome, best_distance, best_moves)
+        results[index] = result
+        return result
+
+    for x, o in positions.values():
+        solve(x, o)
+    return results
+
+
+def build(path: Path = DEFAULT_PATH) -> int:
+    """Write the oracle table to path; return the number of legal positions."""
+    positions = reachable_positions()
+    results = _solve_all(positions)
+    table = bytearray(HEADER.size + RECORD_COUNT * RECORD.size)
+    HEADER.pack_into(table, 0, MAGIC, VERSION, RECORD.size, RECORD_COUNT)
+    for index in positions:
+        RECORD.pack_into(table, HEADER.size + index * RECORD.size, *results[index])
+    Path(path).write_bytes(bytes(table))
+    return len(positions)
+
+
+class Oracle:
+    """Read-only, memory-mapped view of an oracle table.
+
+    Opening the file only maps it and checks the 16-byte header, so worker
+    processes share one page-cache copy and a lookup is a single read.
+    """
+
+    def __init__(self, path: Path = DEFAULT_PATH):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, record_size, count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size \
+                or count != RECORD_COUNT:
+            self._map.close()
+            raise ValueError(f"{path} is not a version {VERSION} oracle table")
+
+    def close(self) -> None:
+        """Unmap the table."""
+        self._map.close()
+
+    def __enter__(self) -> 'Oracle':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def lookup(self, x: int, o: int) -> OracleEntry:
+        """Return the entry for a position; KeyError if it is not legal."""
+        outcome, distance, moves = RECORD.unpack_from(
+            self._map, HEADER.size + (TERNARY[x] + 2 * TERNARY[o]) * RECORD.size)
+        if outcome == UNREACHABLE:
+            raise KeyError(f"position x={x:#05x} o={o:#05x} is not reachable")
+        return OracleEntry(OUTCOMES[outcome], distance, moves)
+
+    def lookup_game(self, game: TicTacToe) -> OracleEntry:
+        """Return the entry for a TicTacToe game's current position."""
+        bits = game.bitboard
+        require_standard(bits, "the oracle")
+        return self.lookup(bits.x, bits.o)
+
+    def best_moves(self, game: TicTacToe) -> List[Tuple[int, int]]:
+        """Return every optimal (row, col) move in a game's position."""
+        return [divmod(cell, 3) for cell in iter_bits(self.lookup_game(game).moves)]
+
+
+_oracle: Optional[Oracle] = None
+
+
+def get_oracle() -> Oracle:
+    """Return a process-wide Oracle over DEFAULT_PATH, opened on first use."""
+    global _oracle
+    if _oracle is None:
+        _oracle = Oracle(DEFAULT_PATH)
+    return _oracle
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point: build the table or show its summary."""
+    parser = argparse.ArgumentParser(description="Tic Tac Toe oracle table")
+    parser.add_argument('command', choices=['build', 'info'])
+    parser.add_argument('--path', type=Path, default=DEFAULT_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        count = build(args.path)
+        print(f"Wrote {count} positions to {args.path} "
+              f"({args.path.stat().st_size} bytes)")
+        return 0
+
+    with Oracle(args.path) as table:
+        entry = table.lookup(0, 0)
+        print(f"{args.path}: empty board is a {entry.outcome}, "
+              f"{entry.distance} plies, optimal moves mask {entry.moves:#011b}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Performance suite for Tic Tac Toe
+Times the core TicTacToe operations, scripted playthroughs and the AI
+searches in the style of pytest-benchmark: each benchmark is calibrated to a
+minimum round time, run for several rounds and summarised per operation.
+Results can be saved as a JSON baseline and compared against one, failing
+when anything got slower than the regression threshold.
+
+    python3 perf_tic_tac_toe.py --save              # record perf_baseline.json
+    python3 perf_tic_tac_toe.py --compare           # check against it
+    python3 perf_tic_tac_toe.py -k make --threshold 0.2
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from tic_tac_toe import TicTacToe
+
+
+DEFAULT_BASELINE = Path(__file__).with_name('perf_baseline.json')
+DEFAULT_THRESHOLD = 0.10
+
+# name -> setup function returning (callable to time, operations per call)
+BENCHMARKS: Dict[str, Callable[[], Tuple[Callable[[], object], int]]] = {}
+
+
+def benchmark(name: str):
+    """Register a benchmark setup function under name."""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+@dataclass
+class BenchResult:
+    """Timing summary for one benchmark; times are nanoseconds per operation."""
+
+    name: str
+    ops: int
+    iterations: int
+    rounds: int
+    min_ns: float
+    median_ns: float
+    mean_ns: float
+    stddev_ns: float
+
+    @property
+    def ops_per_sec(self) -> float:
+        return 1e9 / self.median_ns if self.median_ns else 0.0
+
+
+@dataclass
+class Comparison:
+    """One benchmark's median against the baseline's."""
+
+    name: str
+    baseline_ns: float
+    current_ns: float
+    threshold: float
+
+    @property
+    def change(self) -> float:
+        """Relative change in time per operation (+0.25 means 25% slower)."""
+        return self.current_ns / self.baseline_ns - 1
+
+    @property
+    def regressed(self) -> bool:
+        return self.change > self.threshold
+
+
+def _random_games(count: int, size: int = 3, seed: int = 0) -> List[List[Tuple[int, int]]]:
+    """(row, col) sequences of random games played to the end."""
+    rng = random.Random(seed)
+    games = []
+    for _ in range(count):
+        game = TicTacToe(size, min(size, 5))
+        while not game.check_winner() and not game.is_board_full():
+            game.make_move(*rng.choice(game.available_moves()))
+            game.switch_player()
+        games.append([divmod(cell, size) for cell in game.moves])
+    return games
+
+
+def _positions(count: int) -> List[TicTacToe]:
+    """Games stopped at random points of random playthroughs."""
+    rng = random.Random(1)
+    positions = []
+    for moves in _random_games(count):
+        game = TicTacToe()
+        for row, col in moves[:rng.randrange(len(moves) + 1)]:
+            game.make_move(row, col)
+            game.switch_player()
+        positions.append(game)
+    return positions
+
+
+def _replay(games: List[List[Tuple[int, int]]], size: int):
+    """Setup result that replays games move by move, checking for a winner."""
+    game = TicTacToe(size, min(size, 5))
+
+    def run():
+        for moves in games:
+            game.reset()
+            for row, col in moves:
+                game.make_move(row, col)
+                game.check_winner()
+                game.switch_player()
+    return run, sum(len(moves) for moves in games)
+
+
+@benchmark('check_winner')
+def bench_check_winner():
+    positions = _positions(1000)
+
+    def run():
+        for game in positions:
+            game.check_winner()
+    return run, len(positions)
+
+
+@benchmark('bitboard_winner')
+def bench_bitboard_winner():
+    # The full scan check_winner falls back to after direct board edits.
+    boards = [game.bitboard for game in _positions(1000)]
+
+    def run():
+        for bits in boards:
+            bits.winner()
+    return run, len(boards)
+
+
+@benchmark('is_valid_move')
+def bench_is_valid_move():
+    positions = _positions(200)
+    cells = [divmod(cell, 3) for cell in range(9)]
+
+    def run():
+        for game in positions:
+            for row, col in cells:
+                game.is_valid_move(row, col)
+    return run, len(positions) * len(cells)
+
+
+@benchmark('is_board_full')
+def bench_is_board_full():
+    positions = _positions(1000)
+
+    def run():
+        for game in positions:
+            game.is_board_full()
+    return run, len(positions)
+
+
+@benchmark('make_move')
+def bench_make_move():
+    return _replay(_random_games(200), 3)
+
+
+@benchmark('make_move_15x15')
+def bench_make_move_large():
+    return _replay(_random_games(20, size=15), 15)
+
+
+@benchmark('make_unmake_move')
+def bench_make_unmake_move():
+    positions = [game for game in _positions(300) if not game.check_winner()][:100]
+    replies = [game.available_moves() for game in positions]
+
+    def run():
+        for game, moves in zip(positions, replies):
+            for row, col in moves:
+                game.make_move(row, col)
+                game.unmake_move()
+    return run, sum(len(moves) for moves in replies)
+
+
+@benchmark('perft_depth_4')
+def bench_perft():
+    # Counted per node: is_valid_move over every cell, make/check/unmake.
+    import perft
+
+    game = TicTacToe()
+
+    def run():
+        perft.perft(game, 4, distinct=False)
+    return run, perft.perft(game, 4, distinct=False).nodes
+
+
+@benchmark('scripted_game')
+def bench_scripted_game():
+    from game_io import NullRenderer, ScriptedInput
+
+    scripts = [[f"{row + 1} {col + 1}" for row, col in moves] for moves in _random_games(100)]
+    renderer = NullRenderer()
+    game = TicTacToe()
+
+    def run():
+        for script in scripts:
+            game.reset()
+            game.play_game(renderer, ScriptedInput(script))
+    return run, len(scripts)
+
+
+@benchmark('solver_cold_solve')
+def bench_solver():
+    import solver
+
+    def run():
+        solver.Solver().value(0, 0)
+    return run, 1
+
+
+@benchmark('mcts_200_playouts')
+def bench_mcts():
+    from mcts import MCTS
+
+    game = TicTacToe()
+
+    def run():
+        MCTS(200, rng=random.Random(0)).search(game)
+    return run, 1
+
+
+def measure(name: str, round_time: float = 0.05, rounds: int = 7) -> BenchResult:
+    """Calibrate and time one registered benchmark."""
+    run, ops = BENCHMARKS[name]()
+    iterations = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            run()
+        elapsed = time.perf_counter() - start
+        if elapsed >= round_time:
+            break
+        iterations *= 2 if elapsed == 0 else max(2, min(10, int(round_time / elapsed) + 1))
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            run()
+        samples.append((time.perf_counter() - start) * 1e9 / (iterations * ops))
+    return BenchResult(name, ops, iterations, rounds, min(samples), statistics.median(samples),
+                       statistics.mean(samples),
+                       statistics.stdev(samples) if len(samples) > 1 else 0.0)
+
+
+def run_suite(names: Optional[List[str]] = None, round_time: float = 0.05,
+              rounds: int = 7) -> List[BenchResult]:
+    """Run the named benchmarks (default: all) and return their results."""
+    return [measure(name, round_time, rounds) for name in (names or list(BENCHMARKS))]
+
+
+def to_json(results: List[BenchResult]) -> dict:
+    """The saved form of a run: machine info plus every result."""
+    return {
+        'datetime': datetime.now().isoformat(timespec='seconds'),
+        'machine_info': {'python': platform.python_version(),
+                         'implementation': platform.python_implementation(),
+                         'platform': platform.platform()},
+        'benchmarks': [asdict(result) for result in results],
+    }
+
+
+def load_results(path: Path) -> Dict[str, BenchResult]:
+    """Read a saved run, keyed by benchmark name."""
+    data = json.loads(Path(path).read_text())
+    return {entry['name']: BenchResult(**entry) for entry in data['benchmarks']}
+
+
+def compare(results: List[BenchResult], baseline: Dict[str, BenchResult],
+            threshold: float = DEFAULT_THRESHOLD) -> List[Comparison]:
+    """Compare medians with the baseline's; benchmarks it lacks are skipped."""
+    return [Comparison(result.name, baseline[result.name].median_ns, result.median_ns, threshold)
+            for result in results if result.name in baseline]
+
+
+def format_results(results: List[BenchResult]) -> List[str]:
+    """Table lines: per-operation times and throughput."""
+    lines = [f"{'benchmark':<22} {'min':>12} {'median':>12} {'stddev':>10} {'ops/s':>14}"]
+    for r in results:
+        lines.append(f"{r.name:<22} {r.min_ns:>10,.0f}ns {r.median_ns:>10,.0f}ns "
+                     f"{r.stddev_ns:>8,.0f}ns {r.ops_per_sec:>14,.0f}")
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point; exits 1 when a benchmark regressed."""
+    parser = argparse.ArgumentParser(description="Tic Tac Toe performance suite")
+    parser.add_argument('-k', dest='pattern', help="only run benchmarks whose name contains this")
+    parser.add_argument('--rounds', type=int, default=7)
+    parser.add_argument('--round-time', type=float, default=0.05,
+                        help="minimum seconds per round (default: 0.05)")
+    parser.add_argument('--save', nargs='?', const=DEFAULT_BASELINE, type=Path, metavar='FILE',
+                        help=f"write the results as a baseline (default: {DEFAULT_BASELINE.name})")
+    parser.add_argument('--compare', nargs='?', const=DEFAULT_BASELINE, type=Path,
+                        metavar='FILE', help="compare against a saved baseline")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown before failing (default: 0.10 = 10%%)")
+    args = parser.parse_args(argv)
+
+    names = [name for name in BENCHMARKS if not args.pattern or args.pattern in name]
+    results = run_suite(names, args.round_time, args.rounds)
+    for line in format_results(results):
+        print(line)
+
+    if args.save:
+        args.save.write_text(json.dumps(to_json(results), indent=2) + "\n")
+        print(f"\nSaved baseline to {args.save}")
+
+    if args.compare:
+        comparisons = compare(results, load_results(args.compare), args.threshold)
+        print(f"\nAgainst {args.compare} (threshold {args.threshold:.0%}):")
+        for c in comparisons:
+            flag = "REGRESSED" if c.regressed else "ok"
+            print(f"{c.name:<22} {c.baseline_ns:>10,.0f}ns -> {c.current_ns:>10,.0f}ns "
+                  f"{c.change:>+8.1%}  {flag}")
+        if any(c.regressed for c in comparisons):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Move policies for headless Tic Tac Toe play
+A policy is a callable policy(game, rng) -> (row, col) that picks a legal move
+for game.current_player, drawing any randomness from rng (a random.Random).
+"""
+
+import random
+from typing import Callable, Dict, Tuple
+
+import solver
+from mcts import MCTSPolicy
+from search import AlphaBetaPolicy
+from tic_tac_toe import TicTacToe
+
+
+Policy = Callable[[TicTacToe, random.Random], Tuple[int, int]]
+
+
+def random_policy(game: TicTacToe, rng: random.Random) -> Tuple[int, int]:
+    """Pick uniformly among the legal moves."""
+    return rng.choice(game.available_moves())
+
+
+def solver_policy(game: TicTacToe, rng: random.Random) -> Tuple[int, int]:
+    """Pick uniformly among the perfect-play moves."""
+    return rng.choice(solver.best_moves(game))
+
+
+def heuristic_policy(game: TicTacToe, rng: random.Random) -> Tuple[int, int]:
+    """Win if possible, else block, else prefer centre, corners, edges."""
+    bits = game.bitboard
+    geo = bits.geometry
+    size = geo.size
+    me, opp = (bits.x, bits.o) if game.current_player == 'X' else (bits.o, bits.x)
+    empty = bits.legal_moves()
+    for mask in (me, opp):
+        for cell in empty:
+            if geo.line_through(mask | 1 << cell, cell):
+                return divmod(cell, size)
+    center = (size // 2) * size + size // 2
+    if center in empty:
+        return divmod(center, size)
+    corners = (0, size - 1, geo.cells - size, geo.cells - 1)
+    candidates = [cell for cell in empty if cell in corners]
+    return divmod(rng.choice(candidates or empty), size)
+
+
+POLICIES: Dict[str, Policy] = {
+    'random': random_policy,
+    'solver': solver_policy,
+    'heuristic': heuristic_policy,
+    # One searcher per process, so a game's consecutive moves reuse the tree.
+    'mcts': MCTSPolicy(playouts=500),
+    # Searches the whole remaining tree on 3x3; larger boards hit the deadline.
+    'alphabeta': AlphaBetaPolicy(time_limit=0.1),
+}
+
+
+def register_policy(name: str, policy: Policy) -> None:
+    """Make a policy available by name (e.g. to simulation workers)."""
+    POLICIES[name] = policy
+
+
+def get_policy(name: str) -> Policy:
+    """Look up a policy by name."""
+    try:
+        return POLICIES[name]
+    except KeyError:
+        raise ValueError(f"unknown policy {name!r}; choose from {', '.join(sorted(POLICIES))}") from None
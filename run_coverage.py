@@ -1,39 +1,27 @@
 #!/usr/bin/env python3
 """
-Simple coverage runner using coverage.py command line interface
+Simple coverage runner
+Runs the tests sharded across processes with one coverage data file per
+shard, combines them once and writes the console, HTML and XML reports from
+that single load (see run_tests_parallel.py).  Extra options such as -j 2
+or --changed are passed through.
 """
 
-import subprocess
 import sys
-import os
 
-def run_coverage():
-    """Run tests with coverage using coverage.py CLI."""
-    
-    # Run coverage
-    result = subprocess.run([
-        sys.executable, '-m', 'coverage', 'run', 
-        '--source=tic_tac_toe',
-        'run_tests.py'
-    ], capture_output=True, text=True)
-    
-    # Print test output
-    print(result.stdout)
-    if result.stderr:
-        print("STDERR:", result.stderr)
-    
-    # Generate reports
-    subprocess.run([sys.executable, '-m', 'coverage', 'report'])
-    subprocess.run([sys.executable, '-m', 'coverage', 'html'])
-    subprocess.run([sys.executable, '-m', 'coverage', 'xml'])
-    
-    print("\nCoverage reports generated:")
-    print("- Console report above")
-    print("- HTML report: htmlcov/index.html")
-    print("- XML report: coverage.xml")
-    
-    return result.returncode == 0
+import run_tests_parallel
+
+
+def run_coverage(argv=None):
+    """Run tests with coverage and write every report format."""
+    status = run_tests_parallel.main(['--coverage', *(argv or [])])
+    if status != 2:
+        print("\nCoverage reports generated:")
+        print("- Console report above")
+        print("- HTML report: htmlcov/index.html")
+        print("- XML report: coverage.xml")
+    return status == 0
 
 if __name__ == '__main__':
-    success = run_coverage()
-    sys.exit(not success) 
\ No newline at end of file
+    success = run_coverage(sys.argv[1:])
+    sys.exit(not success) 
@@ -1,12 +1,18 @@
 #!/usr/bin/env python3
 """
 Test runner for Tic Tac Toe unit tests
+Runs everything serially in this process; any options (such as -j 4 or
+--changed) hand the run to run_tests_parallel.py instead.
 """
 
 import unittest
 import sys
 
 if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        import run_tests_parallel
+        sys.exit(run_tests_parallel.main(sys.argv[1:]))
+
     # Discover and run all tests
     loader = unittest.TestLoader()
     start_dir = '.'
@@ -16,4 +22,4 @@ if __name__ == '__main__':
     result = runner.run(suite)
     
     # Exit with appropriate code
-    sys.exit(not result.wasSuccessful()) 
\ No newline at end of file
+    sys.exit(not result.wasSuccessful()) 
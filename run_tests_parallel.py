@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Parallel test runner for Tic Tac Toe unit tests
+Shards the discovered test classes across worker processes, optionally
+measures coverage with one data file per shard that are combined once at
+the end, and can restrict the run to the tests affected by changed modules.
+
+    python3 run_tests_parallel.py                   # all tests, one worker per CPU
+    python3 run_tests_parallel.py --coverage        # plus report, htmlcov/ and coverage.xml
+    python3 run_tests_parallel.py --changed         # tests affected by uncommitted changes
+    python3 run_tests_parallel.py --changed main    # ... by changes since main
+"""
+
+import argparse
+import ast
+import io
+import os
+import re
+import subprocess
+import sys
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stderr, redirect_stdout
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+
+COVERAGE_FILE = '.coverage'
+
+# Module names mentioned in string literals, as in subprocess command lines
+# ("tic_tac_toe.py") and code run with -c ("import tic_tac_toe").
+STRING_REFERENCE = re.compile(r'(?:\bimport\s+|\bfrom\s+)(\w+)|\b(\w+)\.py\b')
+
+
+@dataclass
+class ShardResult:
+    """Outcome of running one test class (or a module that failed to import)."""
+
+    name: str
+    tests_run: int = 0
+    # (test id, formatted traceback)
+    failures: List[Tuple[str, str]] = field(default_factory=list)
+    errors: List[Tuple[str, str]] = field(default_factory=list)
+    skipped: int = 0
+    seconds: float = 0.0
+    output: str = ''
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures and not self.errors
+
+
+def _iter_tests(suite) -> Iterator[unittest.TestCase]:
+    """Yield the individual tests of a (nested) suite."""
+    for item in suite:
+        if isinstance(item, unittest.TestSuite):
+            yield from _iter_tests(item)
+        else:
+            yield item
+
+
+def _shard_name(test: unittest.TestCase) -> str:
+    """The loadTestsFromName name of the shard a test belongs to."""
+    if type(test).__module__ == 'unittest.loader':
+        # A module that failed to import; loading it by name reports the error.
+        return test.id().rsplit('.', 1)[1]
+    return f"{type(test).__module__}.{type(test).__qualname__}"
+
+
+def discover_classes(start_dir: str = '.', pattern: str = 'test_*.py') -> Dict[str, bool]:
+    """Map the dotted name of every test class to whether it must run serially.
+
+    Classes that set run_serially = True (timing budgets, for example) are
+    run on their own after the parallel shards, so other tests can't skew
+    their measurements.
+    """
+    suite = unittest.TestLoader().discover(start_dir, pattern=pattern)
+    return {_shard_name(test): getattr(test, 'run_serially', False)
+            for test in _iter_tests(suite)}
+
+
+def run_shard(name: str, start_dir: str = '.', verbosity: int = 1,
+              coverage_file: Optional[str] = None) -> ShardResult:
+    """Run one test class, measuring coverage into its own data file if asked.
+
+    This is the worker entry point, so everything it returns is picklable.
+    """
+    start_dir = os.path.abspath(start_dir)
+    if start_dir not in sys.path:
+        sys.path.insert(0, start_dir)
+    cov = None
+    if coverage_file:
+        import coverage
+        cov = coverage.Coverage(data_file=coverage_file, data_suffix=True)
+        cov.start()
+    output = io.StringIO()
+    start = time.perf_counter()
+    try:
+        suite = unittest.defaultTestLoader.loadTestsFromName(name)
+        runner = unittest.TextTestRunner(stream=output, verbosity=verbosity)
+        # Tests that print (game prompts and messages) go into the output too.
+        with redirect_stdout(output), redirect_stderr(output):
+            result = runner.run(suite)
+    finally:
+        if cov is not None:
+            cov.stop()
+            cov.save()
+    return ShardResult(
+        name=name,
+        tests_run=result.testsRun,
+        failures=[(test.id(), text) for test, text in result.failures]
+                 + [(test.id(), "unexpected success") for test in result.unexpectedSuccesses],
+        errors=[(test.id(), text) for test, text in result.errors],
+        skipped=len(result.skipped),
+        seconds=time.perf_counter() - start,
+        output=output.getvalue(),
+    )
+
+
+def run_parallel(classes: Dict[str, bool], workers: int = 1, start_dir: str = '.',
+                 verbosity: int = 1, coverage_file: Optional[str] = None) -> Iterator[ShardResult]:
+    """Yield shard results as they finish, then run the serial classes in-process.
+
+    With workers=1 everything runs in-process.
+    """
+    shared = [name for name, serial in classes.items() if not serial or workers == 1]
+    if workers == 1:
+        for name in shared:
+            yield run_shard(name, start_dir, verbosity, coverage_file)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_shard, name, start_dir, verbosity, coverage_file)
+                   for name in shared]
+        for future in as_completed(futures):
+            yield future.result()
+    for name, serial in classes.items():
+        if serial:
+            yield run_shard(name, start_dir, verbosity, coverage_file)
+
+
+def module_references(path: Path) -> Set[str]:
+    """Top-level module names a source file imports or names in strings.
+
+    Imports inside functions count too, since this repo imports heavy
+    modules lazily; a file that can't be parsed references nothing.
+    """
+    try:
+        tree = ast.parse(path.read_text(), str(path))
+    except (OSError, SyntaxError, ValueError):
+        return set()
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split('.')[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module.split('.')[0])
+        elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+            for match in STRING_REFERENCE.finditer(node.value):
+                names.add(match.group(1) or match.group(2))
+    return names
+
+
+def import_graph(start_dir: str = '.') -> Dict[str, Set[str]]:
+    """Map each module in start_dir to the modules of start_dir it references."""
+    paths = {path.stem: path for path in Path(start_dir).glob('*.py')}
+    return {name: module_references(path) & paths.keys() for name, path in paths.items()}
+
+
+def affected_modules(changed: Set[str], graph: Dict[str, Set[str]]) -> Set[str]:
+    """The changed modules plus every module that depends on one, transitively."""
+    dependents: Dict[str, Set[str]] = {}
+    for module, references in graph.items():
+        for reference in references:
+            dependents.setdefault(reference, set()).add(module)
+    affected = set(changed)
+    stack = list(changed)
+    while stack:
+        for module in dependents.get(stack.pop(), ()):
+            if module not in affected:
+                affected.add(module)
+                stack.append(module)
+    return affected
+
+
+def changed_modules(base: str = 'HEAD', start_dir: str = '.') -> Set[str]:
+    """Modules in start_dir that differ from base, including untracked ones."""
+    def git(*args) -> List[str]:
+        result = subprocess.run(['git', *args], cwd=start_dir, capture_output=True,
+                                text=True, check=True)
+        return result.stdout.split()
+
+    files = git('diff', '--name-only', '--relative', base) \
+        + git('ls-files', '--others', '--exclude-standard')
+    return {Path(name).stem for name in files
+            if name.endswith('.py') and '/' not in name}
+
+
+def select_affected(classes: Dict[str, bool], changed: Set[str],
+                    start_dir: str = '.') -> Dict[str, bool]:
+    """Keep the test classes whose module is affected by the changed modules."""
+    affected = affected_modules(changed, import_graph(start_dir))
+    return {name: serial for name, serial in classes.items() if name.split('.')[0] in affected}
+
+
+def write_reports(cov, html_dir: str = 'htmlcov', xml_file: str = 'coverage.xml') -> float:
+    """Print the coverage summary and write HTML and XML from the loaded data."""
+    print("\n" + "=" * 60)
+    print("COVERAGE REPORT")
+    print("=" * 60)
+    total = cov.report()
+    cov.html_report(directory=html_dir)
+    print(f"\nHTML coverage report generated in '{html_dir}' directory")
+    cov.xml_report(outfile=xml_file)
+    print(f"XML coverage report generated as '{xml_file}'")
+    return total
+
+
+def _print_failures(results: List[ShardResult]) -> None:
+    for result in results:
+        for label, entries in (('FAIL', result.failures), ('ERROR', result.errors)):
+            for test_id, text in entries:
+                print("=" * 70)
+                print(f"{label}: {test_id}")
+                print("-" * 70)
+                print(text)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point; returns 0 when every test passed."""
+    parser = argparse.ArgumentParser(description="Run the test suite across processes")
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument('-p', '--pattern', default='test_*.py')
+    parser.add_argument('-s', '--start-dir', default='.')
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help="print every test's result as unittest -v does")
+    parser.add_argument('--coverage', action='store_true',
+                        help="measure coverage and write the console, HTML and XML reports")
+    parser.add_argument('--changed', nargs='?', const='HEAD', metavar='REF',
+                        help="only run tests affected by modules changed since REF "
+                             "(default: HEAD, i.e. uncommitted changes)")
+    args = parser.parse_args(argv)
+
+    cov = None
+    if args.coverage:
+        try:
+            import coverage
+        except ImportError:
+            print("coverage is not installed; run: pip install coverage")
+            return 2
+        cov = coverage.Coverage(data_file=COVERAGE_FILE)
+        cov.erase()
+        # Discovery imports the modules under test; measure that too so
+        # module-level lines count even when workers inherit the imports.
+        discovery = coverage.Coverage(data_file=COVERAGE_FILE, data_suffix=True)
+        discovery.start()
+    try:
+        classes = discover_classes(args.start_dir, args.pattern)
+    finally:
+        if cov is not None:
+            discovery.stop()
+            discovery.save()
+
+    if args.changed:
+        changed = changed_modules(args.changed, args.start_dir)
+        classes = select_affected(classes, changed, args.start_dir)
+        print(f"Changed modules: {', '.join(sorted(changed)) or 'none'}; "
+              f"running {len(classes)} test classes")
+        if not classes:
+            return 0
+
+    start = time.perf_counter()
+    results = []
+    for result in run_parallel(classes, max(1, args.workers), args.start_dir,
+                               2 if args.verbose else 1,
+                               COVERAGE_FILE if cov is not None else None):
+        results.append(result)
+        if args.verbose:
+            print(result.output, end='')
+        else:
+            status = "ok" if result.ok else "FAILED"
+            print(f"{result.name} ... {status} ({result.tests_run} tests, {result.seconds:.2f}s)")
+    elapsed = time.perf_counter() - start
+
+    _print_failures(results)
+    total = sum(r.tests_run for r in results)
+    failures = sum(len(r.failures) for r in results)
+    errors = sum(len(r.errors) for r in results)
+    skipped = sum(r.skipped for r in results)
+    print("-" * 70)
+    print(f"Ran {total} tests in {elapsed:.3f}s with {max(1, args.workers)} workers")
+    if failures or errors:
+        print(f"\nFAILED (failures={failures}, errors={errors})")
+    else:
+        print(f"\nOK{f' (skipped={skipped})' if skipped else ''}")
+
+    if cov is not None:
+        cov.combine()
+        cov.save()
+        write_reports(cov)
+    return 1 if failures or errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
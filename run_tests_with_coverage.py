@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 """
 Test runner for Tic Tac Toe unit tests with coverage reporting
+Runs the suite serially in one process; run_tests_parallel.py --coverage
+shards it across processes.
 """
 
 import unittest
@@ -8,6 +10,8 @@ import sys
 import os
 import coverage
 
+from run_tests_parallel import write_reports
+
 def run_tests_with_coverage():
     """Run tests with coverage reporting."""
     
@@ -34,22 +38,9 @@ def run_tests_with_coverage():
     cov.stop()
     cov.save()
     
-    # Generate coverage report
-    print("\n" + "="*60)
-    print("COVERAGE REPORT")
-    print("="*60)
-    
-    # Print summary to console
-    cov.report()
-    
-    # Generate HTML report
-    cov.html_report(directory='htmlcov')
-    print(f"\nHTML coverage report generated in 'htmlcov' directory")
-    print(f"Open 'htmlcov/index.html' in your browser to view detailed coverage")
-    
-    # Generate XML report (useful for CI/CD)
-    cov.xml_report(outfile='coverage.xml')
-    print(f"XML coverage report generated as 'coverage.xml'")
+    # Console, HTML and XML reports, all from the data collected above
+    write_reports(cov)
+    print("Open 'htmlcov/index.html' in your browser to view detailed coverage")
     
     # Exit with appropriate code
     return result.wasSuccessful()
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Iterative-deepening alpha-beta search for Tic Tac Toe and its larger boards
+Negamax with alpha-beta pruning over a single TicTacToe (make_move and
+unmake_move walk the tree), moves ordered by the previous iteration's
+principal variation, killer moves and the history heuristic, a pluggable
+leaf evaluation and a hard wall-clock deadline.
+"""
+
+import random
+import time
+from collections import namedtuple
+from functools import lru_cache
+from typing import Callable, List, Optional, Tuple
+
+import openings
+
+
+# A won position scores WIN minus the plies it took, so faster wins (and
+# slower losses) are preferred; evaluations stay well below WIN - MAX_PLY.
+WIN = 1_000_000
+MAX_PLY = 1024
+INFINITY = WIN + 1
+
+# How often (in nodes) the deadline is checked.
+DEADLINE_CHECK = 16
+
+SearchStats = namedtuple('SearchStats', [
+    'nodes',                # nodes visited over all iterations
+    'depth',                # deepest completed iteration
+    'seconds',
+    'nodes_per_sec',
+    'score',                # for the side to move, from the chosen move's iteration
+    'pv',                   # principal variation as (row, col) moves
+    'timed_out',            # whether the deadline stopped the search
+    'legal_moves',          # mean legal moves at expanded nodes
+    'searched_moves',       # mean moves actually searched there
+    'branching_reduction',  # 1 - searched_moves / legal_moves
+    'effective_branching',  # last completed iteration's nodes ** (1 / depth)
+])
+
+# evaluate(game) -> score of the position for game.current_player.
+Evaluator = Callable[[object], int]
+
+
+@lru_cache(maxsize=None)
+def threat_weights(win_length: int) -> Tuple[int, ...]:
+    """Weight of a line holding k marks of one side and none of the other."""
+    return (0,) + tuple(1 << (3 * (k - 1)) for k in range(1, win_length + 1))
+
+
+def threat_eval(game) -> int:
+    """Count open lines for each side, weighting fuller ones exponentially.
+
+    A line still open to one side (no opposing mark) scores
+    threat_weights(win_length)[marks] for that side; the result is the
+    mover's total minus the opponent's.
+    """
+    bits = game.bitboard
+    geo = bits.geometry
+    if game.current_player == 'X':
+        me, opp = bits.x, bits.o
+    else:
+        me, opp = bits.o, bits.x
+    weights = threat_weights(geo.win_length)
+    score = 0
+    for line in geo.lines:
+        mine = me & line
+        theirs = opp & line
+        if mine and not theirs:
+            score += weights[bin(mine).count('1')]
+        elif theirs and not mine:
+            score -= weights[bin(theirs).count('1')]
+    return score
+
+
+@lru_cache(maxsize=None)
+def _neighbourhoods(size: int, radius: int) -> Tuple[int, ...]:
+    """Mask of the cells within radius (king moves) of each cell."""
+    masks = []
+    for cell in range(size * size):
+        row, col = divmod(cell, size)
+        mask = 0
+        for r in range(max(0, row - radius), min(size, row + radius + 1)):
+            for c in range(max(0, col - radius), min(size, col + radius + 1)):
+                mask |= 1 << (r * size + c)
+        masks.append(mask)
+    return tuple(masks)
+
+
+@lru_cache(maxsize=None)
+def _centre_bias(size: int) -> Tuple[int, ...]:
+    """Static ordering tiebreak: cells nearer the centre first."""
+    mid = (size - 1) / 2
+    return tuple(-int(abs(cell // size - mid) + abs(cell % size - mid))
+                 for cell in range(size * size))
+
+
+class _Timeout(Exception):
+    """Raised inside the search when the deadline has passed."""
+
+
+class AlphaBeta:
+    """Iterative-deepening negamax with alpha-beta pruning.
+
+    Budgets: stop after max_depth plies (default: the rest of the game)
+    and/or time_limit seconds.  When the deadline passes mid-iteration the
+    best root move found so far is returned: the deepest iteration's, or the
+    interrupted one's if it had already finished searching a root move (the
+    previous principal variation is always searched first).
+
+    radius limits the moves considered to empty cells within that many
+    king moves of a mark, which keeps large boards tractable; None
+    considers every empty cell.  evaluate scores leaves at the depth limit.
+    """
+
+    def __init__(self, max_depth: Optional[int] = None, time_limit: Optional[float] = None,
+                 evaluate: Evaluator = threat_eval, radius: Optional[int] = 2):
+        self.max_depth = max_depth
+        self.time_limit = time_limit
+        self.evaluate = evaluate
+        self.radius = radius
+        self.stats: Optional[SearchStats] = None
+        self.game = None
+        self._deadline: Optional[float] = None
+        self._nodes = 0
+        self._expanded = 0
+        self._legal = 0
+        self._searched = 0
+        self._killers: List[List[Optional[int]]] = []
+        self._history = {'X': [], 'O': []}
+        self._pv: List[int] = []
+
+    def _candidates(self) -> Tuple[List[int], int]:
+        """Return (cells worth searching, number of legal moves)."""
+        bits = self.game.bitboard
+        geo = bits.geometry
+        occupied = bits.x | bits.o
+        empty = geo.full & ~occupied
+        legal = bin(empty).count('1')
+        if self.radius is not None and occupied:
+            near = 0
+            neighbourhoods = _neighbourhoods(geo.size, self.radius)
+            rest = occupied
+            while rest:
+                low = rest & -rest
+                near |= neighbourhoods[low.bit_length() - 1]
+                rest ^= low
+            empty &= near
+        cells = []
+        while empty:
+            low = empty & -empty
+            cells.append(low.bit_length() - 1)
+            empty ^= low
+        return cells, legal
+
+    def _ordered(self, cells: List[int], ply: int) -> List[int]:
+        """Sort cells: PV move, then killers, then history, then centre first."""
+        pv_move = self._pv[ply] if ply < len(self._pv) else None
+        killers = self._killers[ply]
+        history = self._history[self.game.current_player]
+        bias = _centre_bias(self.game.size)
+
+        def key(cell: int):
+            if cell == pv_move:
+                return (3, 0, 0)
+            if cell in killers:
+                return (2, -killers.index(cell), 0)
+            return (1, history[cell], bias[cell])
+
+        return sorted(cells, key=key, reverse=True)
+
+    def _negamax(self, depth: int, ply: int, alpha: int, beta: int, line: List[int]) -> int:
+        """Score the position for the side to move; fill line with its PV."""
+        self._nodes += 1
+        if self._deadline is not None and not self._nodes % DEADLINE_CHECK \
+                and time.perf_counter() > self._deadline:
+            raise _Timeout
+        game = self.game
+        if game.check_winner():
+            # Play stops at a win, so the side that just moved won.
+            return -(WIN - ply)
+        if game.is_board_full():
+            return 0
+        if depth == 0:
+            return self.evaluate(game)
+
+        cells, legal = self._candidates()
+        self._expanded += 1
+        self._legal += legal
+        size = game.size
+        best = -INFINITY
+        searched = 0
+        for cell in self._ordered(cells, ply):
+            searched += 1
+            child_line: List[int] = []
+            game.make_move(*divmod(cell, size))
+            game.switch_player()
+            score = -self._negamax(depth - 1, ply + 1, -beta, -alpha, child_line)
+            game.unmake_move()
+            if score > best:
+                best = score
+                if score > alpha:
+                    alpha = score
+                    line[:] = [cell] + child_line
+                    if alpha >= beta:
+                        self._cutoff(cell, ply, depth)
+                        break
+        self._searched += searched
+        return best
+
+    def _cutoff(self, cell: int, ply: int, depth: int) -> None:
+        """Remember a move that caused a beta cutoff."""
+        killers = self._killers[ply]
+        if killers[0] != cell:
+            killers[1] = killers[0]
+            killers[0] = cell
+        self._history[self.game.current_player][cell] += depth * depth
+
+    def _search_root(self, depth: int, best: List) -> int:
+        """Search every root move to depth; best is [cell, score, line] so far."""
+        game = self.game
+        size = game.size
+        cells, legal = self._candidates()
+        self._expanded += 1
+        self._legal += legal
+        alpha = -INFINITY
+        for cell in self._ordered(cells, 0):
+            self._searched += 1
+            child_line: List[int] = []
+            game.make_move(*divmod(cell, size))
+            game.switch_player()
+            score = -self._negamax(depth - 1, 1, -INFINITY, -alpha, child_line)
+            game.unmake_move()
+            if score > alpha:
+                alpha = score
+                best[:] = [cell, score, [cell] + child_line]
+        return alpha
+
+    def search(self, game) -> Tuple[int, int]:
+        """Return the chosen (row, col) for game.current_player; game is left as it was."""
+        if game.check_winner() or game.is_board_full():
+            raise ValueError("the game is already over")
+        start = time.perf_counter()
+        self._deadline = start + self.time_limit if self.time_limit else None
+        self.game = game
+        cells = game.size * game.size
+        remaining = bin(game.bitboard.geometry.full
+                        & ~(game.bitboard.x | game.bitboard.o)).count('1')
+        max_depth = min(self.max_depth or remaining, remaining, MAX_PLY)
+        self._nodes = self._expanded = self._legal = self._searched = 0
+        self._killers = [[None, None] for _ in range(max_depth + 1)]
+        for side in ('X', 'O'):
+            history = self._history[side]
+            if len(history) != cells:
+                self._history[side] = [0] * cells
+            else:
+                # Age the previous move's history instead of forgetting it.
+                self._history[side] = [value >> 1 for value in history]
+        self._pv = []
+
+        moves_before = len(game.moves)
+        chosen: Optional[list] = None
+        completed = 0
+        iteration_nodes = 0
+        timed_out = False
+        for depth in range(1, max_depth + 1):
+            nodes_before = self._nodes
+            best: list = []
+            try:
+                score = self._search_root(depth, best)
+            except _Timeout:
+                timed_out = True
+                # The moves on the path being searched were never taken back.
+                while len(game.moves) > moves_before:
+                    game.unmake_move()
+                # The previous PV move is searched first, so once any root
+                # move has finished this iteration's best is the better pick.
+                if best:
+                    chosen = best
+                break
+            chosen = best
+            completed = depth
+            iteration_nodes = self._nodes - nodes_before
+            self._pv = best[2]
+            if abs(score) >= WIN - MAX_PLY:
+                break  # a forced result; deeper iterations can't change it
+        if chosen is None:
+            # Not even one root move finished: fall back to the best-ordered one.
+            cells_searched, _ = self._candidates()
+            chosen = [self._ordered(cells_searched, 0)[0], 0, []]
+
+        elapsed = time.perf_counter() - start
+        legal = self._legal / self._expanded if self._expanded else 0.0
+        searched = self._searched / self._expanded if self._expanded else 0.0
+        self.stats = SearchStats(
+            nodes=self._nodes, depth=completed, seconds=elapsed,
+            nodes_per_sec=self._nodes / elapsed if elapsed else 0.0,
+            score=chosen[1], pv=[divmod(cell, game.size) for cell in chosen[2]],
+            timed_out=timed_out, legal_moves=legal, searched_moves=searched,
+            branching_reduction=1 - searched / legal if legal else 0.0,
+            effective_branching=iteration_nodes ** (1 / completed) if completed else 0.0)
+        self.game = None
+        return divmod(chosen[0], game.size)
+
+
+class AlphaBetaPolicy:
+    """Move policy wrapper: policy(game, rng) -> (row, col).
+
+    Plays the opening book move while the position is in the book for the
+    board (see openings.py) and searches with AlphaBeta otherwise; rng only
+    breaks ties between equally good book moves.  A game without move
+    history (e.g. a CompactGame) is searched on a TicTacToe copy of it.
+    """
+
+    def __init__(self, use_book: bool = True, **options):
+        self.use_book = use_book
+        self.options = options
+        self.searcher: Optional[AlphaBeta] = None
+
+    def __call__(self, game, rng: random.Random) -> Tuple[int, int]:
+        if self.use_book:
+            book = openings.get_book(game.size, game.win_length)
+            move = book.best_move(game, rng) if book else None
+            if move is not None:
+                return move
+        if self.searcher is None:
+            self.searcher = AlphaBeta(**self.options)
+        return self.searcher.search(_searchable(game))
+
+
+def _searchable(game):
+    """game if it can make and unmake moves, else a TicTacToe in its position."""
+    if hasattr(game, 'unmake_move'):
+        return game
+    from tic_tac_toe import TicTacToe
+    copy = TicTacToe(game.size, game.win_length)
+    copy.board = game.bitboard.rows()
+    copy.current_player = game.current_player
+    return copy
+
+
+def main() -> None:
+    """Search one position from the opening of a board and report the stats."""
+    import argparse
+    from tic_tac_toe import TicTacToe
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=3)
+    parser.add_argument('--win-length', type=int)
+    parser.add_argument('--depth', type=int, help="maximum depth (default: rest of the game)")
+    parser.add_argument('--time-limit', type=float, default=1.0)
+    parser.add_argument('--radius', type=int, default=2)
+    parser.add_argument('--moves', default='',
+                        help='moves to play first, e.g. "8,8 7,7" (1-based row,col)')
+    args = parser.parse_args()
+
+    game = TicTacToe(args.size, args.win_length)
+    for text in args.moves.split():
+        row, col = (int(part) - 1 for part in text.split(','))
+        game.make_move(row, col)
+        game.switch_player()
+    searcher = AlphaBeta(args.depth, args.time_limit, radius=args.radius)
+    row, col = searcher.search(game)
+    s = searcher.stats
+    print(f"{args.size}x{args.size}: best move {row + 1} {col + 1}, score {s.score}, "
+          f"depth {s.depth}{' (timed out)' if s.timed_out else ''}")
+    print(f"{s.nodes:,} nodes in {s.seconds:.3f}s ({s.nodes_per_sec:,.0f} nodes/s)")
+    print(f"branching: {s.legal_moves:.1f} legal, {s.searched_moves:.1f} searched per node "
+          f"({s.branching_reduction:.0%} reduction), effective {s.effective_branching:.2f}")
+    print("pv: " + " ".join(f"{r + 1},{c + 1}" for r, c in s.pv))
+
+
+if __name__ == "__main__":
+    main()
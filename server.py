@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Asyncio Tic Tac Toe server
+Hosts many independent games in one process behind a line protocol on TCP.
+
+Protocol (one UTF-8 line per request and per reply):
+
+    row col        play a move for the side to move, e.g. "1 3"
+    new            start a fresh game in this session
+    board          show the current state
+    attach ID      switch this connection to an existing session
+    ai             let the server's move policy play for the side to move
+    quit|exit|q    end the session and close the connection
+
+Every state reply is "OK <id> <cells> <status>": cells is nine characters
+(X, O or . for empty) in row order and status is "TURN X", "TURN O",
+"WIN X", "WIN O" or "DRAW".  Errors are "ERR <message>".  Sessions outlive
+their connection, so a client can reconnect and attach to continue a game.
+"""
+
+import argparse
+import asyncio
+import itertools
+import logging
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from cache import MoveCache
+from compact import CompactGame, GamePool
+from game_io import QUIT_WORDS, parse_move
+from policies import get_policy
+
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 7878
+
+logger = logging.getLogger(__name__)
+
+
+def _status(game: CompactGame) -> str:
+    """Return the protocol status word(s) for a game."""
+    if game.winner:
+        return f"WIN {game.winner}"
+    if game.game_over:
+        return "DRAW"
+    return f"TURN {game.current_player}"
+
+
+def _no_session(session_id: str) -> str:
+    """Return the error reply for a session that has ended or expired."""
+    return f"ERR No session {session_id}; send 'new' to start one"
+
+
+def _copy_game(game: CompactGame) -> CompactGame:
+    """Return an independent copy of a session's game."""
+    copy = CompactGame()
+    copy.bitboard.x, copy.bitboard.o = game.bitboard.x, game.bitboard.o
+    copy.current_player = game.current_player
+    return copy
+
+
+def _cells(game: CompactGame) -> str:
+    """Return the nine-character cell string for a game."""
+    bits = game.bitboard
+    return ''.join('X' if bits.x >> i & 1 else 'O' if bits.o >> i & 1 else '.'
+                   for i in range(9))
+
+
+class SessionStore:
+    """All live games in this process, keyed by session id.
+
+    Games are __slots__ CompactGame objects drawn from a GamePool, so ending
+    a session recycles its game for the next one.  Clients that disconnect
+    without quitting leave their sessions behind for a later attach;
+    expire() drops those that have not been used for idle_timeout seconds.
+    """
+
+    def __init__(self, pool: Optional[GamePool] = None, idle_timeout: Optional[float] = 3600.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.sessions: Dict[str, CompactGame] = {}
+        self.pool = pool or GamePool()
+        self.idle_timeout = idle_timeout
+        self._clock = clock
+        # session id -> clock() when it was last created, fetched or reset
+        self._last_used: Dict[str, float] = {}
+        self._ids = itertools.count(1)
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def create(self) -> str:
+        """Start a new game and return its session id."""
+        session_id = str(next(self._ids))
+        self.sessions[session_id] = self.pool.acquire()
+        self._last_used[session_id] = self._clock()
+        return session_id
+
+    def get(self, session_id: str) -> Optional[CompactGame]:
+        """Return a session's game, or None if there is no such session."""
+        game = self.sessions.get(session_id)
+        if game is not None:
+            self._last_used[session_id] = self._clock()
+        return game
+
+    def reset(self, session_id: str) -> None:
+        """Start a session's game over."""
+        self.sessions[session_id].reset()
+        self._last_used[session_id] = self._clock()
+
+    def drop(self, session_id: str) -> None:
+        """Forget a session and recycle its game."""
+        game = self.sessions.pop(session_id, None)
+        self._last_used.pop(session_id, None)
+        if game is not None:
+            self.pool.release(game)
+
+    def expire(self) -> int:
+        """Drop every session idle for longer than idle_timeout; return how many."""
+        if self.idle_timeout is None:
+            return 0
+        cutoff = self._clock() - self.idle_timeout
+        idle = [session_id for session_id, used in self._last_used.items() if used < cutoff]
+        for session_id in idle:
+            self.drop(session_id)
+        return len(idle)
+
+
+class GameServer:
+    """Line-protocol front end over a SessionStore.
+
+    The ai command asks the named move policy (see policies.py) for a move
+    through a MoveCache shared by every session.
+    """
+
+    def __init__(self, store: Optional[SessionStore] = None, policy: str = 'solver',
+                 cache: Optional[MoveCache] = None, rng: Optional[random.Random] = None):
+        self.store = store or SessionStore()
+        self.policy_id = policy
+        self.policy = get_policy(policy)
+        self.cache = cache or MoveCache()
+        self.rng = rng or random.Random()
+        self.moves = 0
+        # Started on the first ai request served through respond_async.
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def state(self, session_id: str) -> str:
+        """Return the OK reply describing a session (ERR if it has ended)."""
+        game = self.store.get(session_id)
+        if game is None:
+            return _no_session(session_id)
+        return f"OK {session_id} {_cells(game)} {_status(game)}"
+
+    def respond(self, session_id: str, line: str) -> Tuple[str, Optional[str]]:
+        """Handle one request line; return (reply, session id to use next).
+
+        A next session id of None means the connection should close.
+        """
+        command = line.strip()
+        word = command.lower()
+        if word in QUIT_WORDS:
+            self.store.drop(session_id)
+            return "BYE", None
+        if word == 'new':
+            # The session may have been ended from another connection.
+            if self.store.get(session_id) is None:
+                session_id = self.store.create()
+            else:
+                self.store.reset(session_id)
+            return self.state(session_id), session_id
+        if word == 'board':
+            return self.state(session_id), session_id
+        if word.startswith('attach '):
+            target = command.split(None, 1)[1]
+            if self.store.get(target) is None:
+                return _no_session(target), session_id
+            return self.state(target), target
+
+        game = self.store.get(session_id)
+        if game is None:
+            return _no_session(session_id), session_id
+        if game.game_over:
+            return "ERR Game over; send 'new' to play again", session_id
+        if word == 'ai':
+            row, col = self.cache.best_move(game, self.policy_id, self.policy, self.rng)
+        else:
+            try:
+                row, col = parse_move(command, game)
+            except ValueError as e:
+                return f"ERR {e}", session_id
+        return self._play(session_id, game, row, col), session_id
+
+    async def respond_async(self, session_id: str, line: str) -> Tuple[str, Optional[str]]:
+        """respond() for the event loop: ai moves are computed off the loop.
+
+        The policy runs on a copy of the position in a single worker thread
+        (policies such as MCTS keep state and are not thread-safe), so one
+        slow search does not stall every other connection.  If the session
+        moved on meanwhile, e.g. from another attached connection, the
+        reply is an error and nothing is played.
+        """
+        if line.strip().lower() != 'ai':
+            return self.respond(session_id, line)
+        game = self.store.get(session_id)
+        if game is None:
+            return _no_session(session_id), session_id
+        if game.game_over:
+            return "ERR Game over; send 'new' to play again", session_id
+        position = _copy_game(game)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='policy')
+        row, col = await asyncio.get_running_loop().run_in_executor(
+            self._executor, self.cache.best_move, position, self.policy_id, self.policy, self.rng)
+        bits, before = game.bitboard, position.bitboard
+        if (self.store.get(session_id) is not game or game.game_over
+                or (bits.x, bits.o) != (before.x, before.o)):
+            return "ERR Position changed; try again", session_id
+        return self._play(session_id, game, row, col), session_id
+
+    def _play(self, session_id: str, game: CompactGame, row: int, col: int) -> str:
+        """Play a legal move in a session and return the state reply."""
+        game.make_move(row, col)
+        self.moves += 1
+        winner = game.check_winner()
+        if winner:
+            game.game_over = True
+            game.winner = winner
+        elif game.is_board_full():
+            game.game_over = True
+        else:
+            game.switch_player()
+        return self.state(session_id)
+
+    async def expire_idle(self) -> None:
+        """Drop idle sessions every so often, until cancelled."""
+        interval = min(self.store.idle_timeout / 4, 60.0)
+        while True:
+            await asyncio.sleep(interval)
+            self.store.expire()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one client connection."""
+        session_id = self.store.create()
+        writer.write((self.state(session_id) + "\n").encode())
+        try:
+            while session_id is not None:
+                line = await reader.readline()
+                if not line:
+                    break
+                reply, session_id = await self.respond_async(session_id,
+                                                             line.decode(errors='replace'))
+                writer.write((reply + "\n").encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        except Exception:
+            # One bad request must not take the server down with it.
+            logger.exception("error serving session %s", session_id)
+        finally:
+            writer.close()
+
+
+async def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                server: Optional[GameServer] = None) -> asyncio.AbstractServer:
+    """Start listening and return the asyncio server object."""
+    server = server or GameServer()
+    listener = await asyncio.start_server(server.handle, host, port)
+    if server.store.idle_timeout is not None:
+        # Runs for as long as the event loop does.
+        asyncio.get_running_loop().create_task(server.expire_idle())
+    return listener
+
+
+def run(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+        server: Optional[GameServer] = None, snapshot: Optional[str] = None) -> None:
+    """Run the server until interrupted.
+
+    With a snapshot path the move cache is warmed from that file if it
+    exists and written back to it on shutdown.
+    """
+    server = server or GameServer()
+    if snapshot and os.path.exists(snapshot):
+        print(f"Loaded {server.cache.load(snapshot)} cached moves from {snapshot}")
+
+    async def serve_forever():
+        listener = await serve(host, port, server)
+        address = listener.sockets[0].getsockname()
+        print(f"Tic Tac Toe server listening on {address[0]}:{address[1]}")
+        async with listener:
+            await listener.serve_forever()
+
+    try:
+        asyncio.run(serve_forever())
+    except KeyboardInterrupt:
+        print("\nServer stopped")
+    finally:
+        if snapshot:
+            print(f"Saved {server.cache.save(snapshot)} cached moves to {snapshot}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Tic Tac Toe line-protocol server")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--policy', default='solver', help="move policy for the ai command")
+    parser.add_argument('--cache-size', type=int, default=100_000)
+    parser.add_argument('--cache-ttl', type=float,
+                        help="seconds before a cached move expires (default: never)")
+    parser.add_argument('--cache-snapshot', metavar='FILE',
+                        help="warm the move cache from FILE and save it there on exit")
+    parser.add_argument('--idle-timeout', type=float, default=3600.0,
+                        help="seconds before an unused session is dropped (default: 3600)")
+    args = parser.parse_args(argv)
+    game_server = GameServer(store=SessionStore(idle_timeout=args.idle_timeout),
+                             policy=args.policy,
+                             cache=MoveCache(args.cache_size, args.cache_ttl))
+    run(args.host, args.port, game_server, args.cache_snapshot)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Headless self-play simulation for Tic Tac Toe
+Plays many games between named move policies, sharded across worker
+processes, and aggregates win/draw/loss statistics.
+"""
+
+import argparse
+import random
+import sys
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Iterator, List, Optional
+
+from policies import Policy, get_policy
+from tic_tac_toe import TicTacToe
+
+
+# moves is a tuple of cell indices (row * size + col) in play order; winner is
+# 'X', 'O' or None for a draw.
+GameRecord = namedtuple('GameRecord', ['moves', 'winner'])
+
+
+@dataclass
+class SimulationStats:
+    """Aggregate results; mergeable across chunks and workers."""
+
+    games: int = 0
+    x_wins: int = 0
+    o_wins: int = 0
+    draws: int = 0
+    moves: int = 0
+
+    def add(self, record: GameRecord) -> None:
+        """Count one finished game."""
+        self.games += 1
+        self.moves += len(record.moves)
+        if record.winner == 'X':
+            self.x_wins += 1
+        elif record.winner == 'O':
+            self.o_wins += 1
+        else:
+            self.draws += 1
+
+    def merge(self, other: 'SimulationStats') -> None:
+        """Fold another set of statistics into this one."""
+        self.games += other.games
+        self.x_wins += other.x_wins
+        self.o_wins += other.o_wins
+        self.draws += other.draws
+        self.moves += other.moves
+
+    def summary(self) -> str:
+        """Return a one-line win/draw/loss summary from X's point of view."""
+        games = max(self.games, 1)
+        return (f"{self.games} games: X won {self.x_wins} ({self.x_wins / games:.1%}), "
+                f"drew {self.draws} ({self.draws / games:.1%}), "
+                f"lost {self.o_wins} ({self.o_wins / games:.1%}); "
+                f"{self.moves / games:.2f} moves/game")
+
+
+def play_headless(policy_x: Policy, policy_o: Policy, rng: random.Random,
+                  game: Optional[TicTacToe] = None) -> GameRecord:
+    """Play one game to the end with no input or output."""
+    game = game or TicTacToe()
+    policies = {'X': policy_x, 'O': policy_o}
+    moves = []
+    while not game.game_over:
+        row, col = policies[game.current_player](game, rng)
+        if not game.make_move(row, col):
+            raise ValueError(f"policy for {game.current_player} chose illegal move {(row, col)}")
+        moves.append(row * game.size + col)
+        winner = game.check_winner()
+        if winner:
+            game.game_over = True
+            game.winner = winner
+        elif game.is_board_full():
+            game.game_over = True
+        else:
+            game.switch_player()
+    return GameRecord(tuple(moves), game.winner)
+
+
+def _play_chunk(x_name: str, o_name: str, seed: int, shard: int, chunk: int,
+                count: int) -> List[GameRecord]:
+    """Worker entry point: play one chunk of a shard's games."""
+    # String seeds are hashed with SHA-512, so this is stable across
+    # processes regardless of PYTHONHASHSEED.
+    rng = random.Random(f"{seed}:{shard}:{chunk}")
+    policy_x, policy_o = get_policy(x_name), get_policy(o_name)
+    return [play_headless(policy_x, policy_o, rng) for _ in range(count)]
+
+
+def _plan(games: int, workers: int, chunk_size: int):
+    """Yield (shard, chunk, count) tasks splitting games over workers."""
+    for shard in range(workers):
+        shard_games = games // workers + (1 if shard < games % workers else 0)
+        for chunk, start in enumerate(range(0, shard_games, chunk_size)):
+            yield shard, chunk, min(chunk_size, shard_games - start)
+
+
+def iter_chunks(games: int, policy_x: str, policy_o: str, seed: int = 0,
+                workers: int = 1, chunk_size: int = 1000) -> Iterator[List[GameRecord]]:
+    """Stream game records back in chunks.
+
+    Games are split into one shard per worker and each shard into chunks
+    with their own seeded RNG, so the records (and their order) depend only
+    on games, seed, workers and chunk_size.  At most 2 * workers chunks are
+    in flight at once and each is dropped once yielded, so memory stays
+    bounded by the chunk size however many games are played.  With
+    workers=1 everything runs in-process.
+    """
+    tasks = _plan(games, workers, chunk_size)
+    if workers == 1:
+        for shard, chunk, count in tasks:
+            yield _play_chunk(policy_x, policy_o, seed, shard, chunk, count)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for shard, chunk, count in tasks:
+            pending.append(pool.submit(_play_chunk, policy_x, policy_o, seed, shard, chunk, count))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def simulate(games: int, policy_x: str, policy_o: str, seed: int = 0,
+             workers: int = 1, chunk_size: int = 1000) -> SimulationStats:
+    """Play games between two named policies and return aggregate stats."""
+    stats = SimulationStats()
+    for records in iter_chunks(games, policy_x, policy_o, seed, workers, chunk_size):
+        for record in records:
+            stats.add(record)
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Headless Tic Tac Toe self-play")
+    parser.add_argument('--games', type=int, default=10_000)
+    parser.add_argument('-x', '--policy-x', default='random')
+    parser.add_argument('-o', '--policy-o', default='random')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    stats = simulate(args.games, args.policy_x, args.policy_o, args.seed,
+                     args.workers, args.chunk_size)
+    elapsed = time.perf_counter() - start
+    print(f"{args.policy_x} (X) vs {args.policy_o} (O): {stats.summary()}")
+    print(f"{stats.games / elapsed:,.0f} games/s with {args.workers} worker(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Perfect-play solver for Tic Tac Toe
+Negamax with alpha-beta pruning over bitboards, backed by a transposition
+table keyed on the symmetry-reduced position.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from bitboard import FULL_MASK, WINNING, canonical, require_standard
+
+
+WIN, DRAW, LOSS = 1, 0, -1
+
+# Transposition table bound flags.
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Centre, corners, then edges: strong moves first means earlier cutoffs.
+MOVE_ORDER = (4, 0, 2, 6, 8, 1, 3, 5, 7)
+
+
+class Solver:
+    """Negamax solver with a persistent transposition table.
+
+    Positions are always seen from the side to move: me is the mover's mask
+    and opp the opponent's.  Values are WIN, DRAW or LOSS for the mover.
+    """
+
+    def __init__(self):
+        # canonical key -> (value, flag)
+        self.table: Dict[int, Tuple[int, int]] = {}
+        self.nodes = 0
+
+    def clear(self) -> None:
+        """Forget every cached position."""
+        self.table.clear()
+        self.nodes = 0
+
+    def value(self, me: int, opp: int) -> int:
+        """Return the exact game value for the side to move."""
+        return self._negamax(me, opp, LOSS - 1, WIN + 1)
+
+    def move_values(self, me: int, opp: int) -> Dict[int, int]:
+        """Return the exact value of every legal move, keyed by cell index."""
+        if WINNING[me] or WINNING[opp]:
+            return {}
+        values = {}
+        for cell in MOVE_ORDER:
+            bit = 1 << cell
+            if (me | opp) & bit:
+                continue
+            values[cell] = -self._negamax(opp, me | bit, LOSS - 1, WIN + 1)
+        return values
+
+    def best_cells(self, me: int, opp: int) -> List[int]:
+        """Return every optimal move as cell indices, in MOVE_ORDER."""
+        values = self.move_values(me, opp)
+        if not values:
+            return []
+        best = max(values.values())
+        return [cell for cell, value in values.items() if value == best]
+
+    def _negamax(self, me: int, opp: int, alpha: int, beta: int) -> int:
+        self.nodes += 1
+        if WINNING[opp]:
+            return LOSS
+        if WINNING[me]:
+            return WIN
+        occupied = me | opp
+        if occupied == FULL_MASK:
+            return DRAW
+
+        key = canonical(me, opp)[0]
+        entry = self.table.get(key)
+        if entry is not None:
+            value, flag = entry
+            if flag == EXACT:
+                return value
+            if flag == LOWER:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                return value
+
+        original_alpha = alpha
+        best = LOSS - 1
+        for cell in MOVE_ORDER:
+            bit = 1 << cell
+            if occupied & bit:
+                continue
+            value = -self._negamax(opp, me | bit, -beta, -alpha)
+            if value > best:
+                best = value
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        break
+
+        # A bound at the edge of the value range is already exact.
+        if best <= original_alpha and best != LOSS:
+            flag = UPPER
+        elif best >= beta and best != WIN:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table[key] = (best, flag)
+        return best
+
+
+_default_solver = Solver()
+
+
+def default_solver() -> Solver:
+    """Return the process-wide solver whose table persists across games."""
+    return _default_solver
+
+
+def _position(game) -> Tuple[int, int]:
+    """Return (me, opp) masks for a TicTacToe game's side to move."""
+    bits = game.bitboard
+    require_standard(bits, "the solver")
+    if game.current_player == 'X':
+        return bits.x, bits.o
+    return bits.o, bits.x
+
+
+def solve(game, solver: Optional[Solver] = None) -> int:
+    """Return WIN, DRAW or LOSS for game.current_player under perfect play."""
+    solver = solver or _default_solver
+    return solver.value(*_position(game))
+
+
+def best_moves(game, solver: Optional[Solver] = None) -> List[Tuple[int, int]]:
+    """Return every optimal (row, col) move for game.current_player."""
+    solver = solver or _default_solver
+    return [divmod(cell, 3) for cell in solver.best_cells(*_position(game))]
+
+
+def best_move(game, solver: Optional[Solver] = None) -> Optional[Tuple[int, int]]:
+    """Return one optimal (row, col) move, or None if the game is over."""
+    moves = best_moves(game, solver)
+    return moves[0] if moves else None
+
+
+if __name__ == "__main__":
+    solver = default_solver()
+    print(f"Empty board value: {solver.value(0, 0):+d}")
+    print(f"Positions in table: {len(solver.table)}")
+    print(f"Nodes searched: {solver.nodes}")
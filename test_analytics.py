@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the game-log analytics pipeline
+"""
+
+import os
+import random
+import tempfile
+import unittest
+
+import analytics
+import gamelog
+from bitboard import canonical
+from policies import random_policy
+from simulate import play_headless
+from tic_tac_toe import TicTacToe
+
+
+def random_games(count, seed=0, size=3, win_length=None):
+    rng = random.Random(seed)
+    return [play_headless(random_policy, random_policy, rng,
+                          TicTacToe(size, win_length)).moves for _ in range(count)]
+
+
+class TestAnalytics(unittest.TestCase):
+    """Test cases for Analytics and analyze."""
+
+    def setUp(self):
+        self.games = random_games(2000)
+
+    def test_tables(self):
+        """Test totals, canonical position count and per-first-move rows."""
+        result = analytics.analyze(self.games)
+        self.assertEqual(result.games, 2000)
+        self.assertEqual(sum(c[analytics.GAMES] for c in result.first_moves.values()), 2000)
+        self.assertLessEqual(len(result.positions), 765)
+        centre = result.first_moves[4]
+        self.assertEqual(centre[analytics.GAMES],
+                         sum(centre[i] for i in (analytics.X_WINS, analytics.O_WINS,
+                                                 analytics.DRAWS)))
+        # Every game passes through one of the three canonical opening positions.
+        openings = {canonical(1 << cell, 0)[0] for cell in range(9)}
+        self.assertEqual(len(openings), 3)
+        self.assertEqual(sum(result.positions[key][analytics.GAMES] for key in openings), 2000)
+        self.assertEqual(len(result.first_move_report()), 1 + len(result.first_moves))
+
+    def test_merge_matches_single_pass(self):
+        """Test that merged partial tables equal one pass over all games."""
+        whole = analytics.analyze(self.games)
+        left = analytics.analyze(self.games[:700])
+        left.merge(analytics.analyze(self.games[700:]))
+        self.assertEqual(left, whole)
+        with self.assertRaises(ValueError):
+            left.merge(analytics.Analytics(4, 4))
+
+    def test_workers_match_in_process(self):
+        """Test the process-pool path against the in-process one."""
+        serial = analytics.analyze(self.games, chunk_size=300)
+        parallel = analytics.analyze(self.games, workers=2, chunk_size=300)
+        self.assertEqual(parallel, serial)
+
+    def test_invalid_and_unfinished_games(self):
+        """Test that broken records are counted rather than tabulated."""
+        result = analytics.Analytics()
+        result.add_game([4, 4])
+        result.add_game([0, 3, 1, 4, 2, 5])
+        result.add_game([0, 1])
+        self.assertEqual((result.games, result.invalid, result.unfinished), (0, 2, 1))
+        self.assertEqual(result.positions, {})
+
+    def test_bounded_positions_on_large_boards(self):
+        """Test the position cap for boards without a canonical key."""
+        games = random_games(50, seed=1, size=5, win_length=4)
+        result = analytics.analyze(games, 5, 4, max_positions=100)
+        self.assertEqual(len(result.positions), 100)
+        self.assertGreater(result.dropped, 0)
+        self.assertEqual(result.games, 50)
+
+    def test_analyze_log(self):
+        """Test streaming a game-log segment end to end."""
+        handle, path = tempfile.mkstemp(suffix='.tttl')
+        os.close(handle)
+        os.unlink(path)
+        try:
+            gamelog.write_games(path, self.games)
+            self.assertEqual(analytics.analyze_log(path, chunk_size=128),
+                             analytics.analyze(self.games))
+        finally:
+            os.unlink(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the shared-memory session arena
+"""
+
+import multiprocessing
+import unittest
+
+from arena import Session, SessionArena
+from tic_tac_toe import TicTacToe
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional
+    np = None
+
+
+def _claim_many(handle, count, queue):
+    """Worker: claim count slots and report them."""
+    arena = SessionArena.attach(handle)
+    queue.put([arena.claim().slot for _ in range(count)])
+    arena.close()
+
+
+def _play_column(handle, slot, moves):
+    """Worker: play the given (row, col) moves in the game in a slot."""
+    arena = SessionArena.attach(handle)
+    session = arena.session(slot)
+    for row, col in moves:
+        arena.make_move(session, row, col)
+    arena.close()
+
+
+class TestSessionArena(unittest.TestCase):
+    """Test cases for records, claiming, views and cross-process play."""
+
+    def setUp(self):
+        self.arena = SessionArena.create(slots=8, stripes=4)
+        self.addCleanup(self.arena.unlink)
+
+    def test_play_to_a_win_in_place(self):
+        """Test playing a game to a win, rejecting illegal moves."""
+        arena = self.arena
+        session = arena.claim()
+        for row, col in [(0, 0), (1, 0), (0, 1), (1, 1)]:
+            self.assertTrue(arena.make_move(session, row, col))
+        self.assertFalse(arena.make_move(session, 0, 0))
+        self.assertFalse(arena.make_move(session, 3, 0))
+        self.assertEqual(arena.state(session).current_player, 'X')
+        self.assertTrue(arena.make_move(session, 0, 2))
+        state = arena.state(session)
+        self.assertEqual(state.cells, b'XXXOO    ')
+        self.assertEqual((state.game_over, state.winner, state.moves), (True, 'X', 5))
+        self.assertTrue(arena.game_over(session))
+        self.assertFalse(arena.make_move(session, 2, 2))
+
+    def test_draw_matches_tic_tac_toe(self):
+        """Test that a drawn game matches the same moves on a TicTacToe."""
+        arena = self.arena
+        session = arena.claim()
+        game = TicTacToe()
+        for row, col in [(0, 0), (1, 1), (0, 1), (0, 2), (2, 0), (1, 0), (1, 2), (2, 1), (2, 2)]:
+            arena.make_move(session, row, col)
+            game.make_move(row, col)
+            game.switch_player()
+        state = arena.state(session)
+        self.assertEqual((state.game_over, state.winner), (True, None))
+        self.assertEqual(arena.board(session), game.board)
+
+    def test_claim_release_and_generations(self):
+        """Test claiming every slot, releasing one and claiming it again."""
+        arena = self.arena
+        sessions = [arena.claim() for _ in range(8)]
+        self.assertEqual(sorted(slot for slot, _ in sessions), list(range(8)))
+        self.assertEqual({generation for _, generation in sessions}, {1})
+        with self.assertRaises(MemoryError):
+            arena.claim()
+        old = sessions[3]
+        arena.make_move(old, 1, 1)
+        arena.release(old)
+        with self.assertRaises(ValueError):
+            arena.make_move(old, 0, 0)
+        with self.assertRaises(ValueError):
+            arena.session(3)
+        new = arena.claim()
+        self.assertEqual(new, Session(3, 2))
+        self.assertEqual(arena.session(3), new)
+        state = arena.state(new)
+        self.assertEqual((state.cells, state.moves, state.generation), (b' ' * 9, 0, 2))
+
+    def test_stale_sessions_are_rejected(self):
+        """Test that a released or reset game's token no longer reaches the slot."""
+        with SessionArena.create(slots=1) as arena:
+            old = arena.claim()
+            arena.make_move(old, 1, 1)
+            new = arena.reset(old)
+            self.assertEqual(new, Session(0, 2))
+            self.assertEqual(arena.state(new).moves, 0)
+            for operation in (lambda: arena.make_move(old, 0, 0), lambda: arena.state(old),
+                              lambda: arena.game_over(old), lambda: arena.cells(old),
+                              lambda: arena.reset(old), lambda: arena.release(old),
+                              lambda: arena.load(old, TicTacToe())):
+                with self.assertRaises(ValueError):
+                    operation()
+            self.assertEqual(arena.state(new).cells, b' ' * 9)
+            arena.release(new)
+            reclaimed = arena.claim()
+            self.assertEqual(reclaimed, Session(0, 3))
+            with self.assertRaises(ValueError):
+                arena.release(new)
+            self.assertTrue(arena.make_move(reclaimed, 0, 0))
+
+    def test_zero_copy_view_and_game_round_trip(self):
+        """Test the cells view and copying to and from a TicTacToe."""
+        arena = self.arena
+        session = arena.claim()
+        view = arena.cells(session)
+        self.addCleanup(view.release)
+        arena.make_move(session, 2, 2)
+        self.assertEqual(view[8], ord('X'))
+        game = TicTacToe()
+        game.make_move(0, 0)
+        game.switch_player()
+        arena.load(session, game)
+        self.assertEqual(bytes(view), b'X        ')
+        copy = arena.to_game(session)
+        self.assertEqual(copy.board, game.board)
+        self.assertEqual(copy.current_player, 'O')
+        self.assertEqual(copy.moves, [])
+        with self.assertRaises(ValueError):
+            arena.load(session, TicTacToe(4))
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_numpy_view(self):
+        """Test the NumPy view of every slot's cells."""
+        arena = self.arena
+        session = arena.claim()
+        slot = session.slot
+        arena.make_move(session, 1, 2)
+        cells = arena.as_array()
+        self.assertEqual(cells.shape, (8, 3, 3))
+        self.assertEqual(chr(cells[slot, 1, 2]), 'X')
+        arena.make_move(session, 0, 0)
+        self.assertEqual(chr(cells[slot, 0, 0]), 'O')
+        del cells
+
+    def test_larger_board_win_length(self):
+        """Test a 5x5 arena needing four in a row."""
+        with SessionArena.create(slots=2, size=5, win_length=4) as arena:
+            session = arena.claim()
+            for row, col in [(1, 1), (0, 4), (2, 2), (1, 4), (3, 3), (2, 4)]:
+                arena.make_move(session, row, col)
+            self.assertFalse(arena.game_over(session))
+            arena.make_move(session, 4, 4)
+            self.assertEqual(arena.state(session).winner, 'X')
+            self.assertEqual(arena.record_size, 40)
+
+    def test_processes_claim_distinct_slots_and_play_in_place(self):
+        """Test that worker processes claim distinct slots and play in place."""
+        queue = multiprocessing.Queue()
+        workers = [multiprocessing.Process(target=_claim_many,
+                                           args=(self.arena.handle(), 3, queue))
+                   for _ in range(2)]
+        for worker in workers:
+            worker.start()
+        claimed = queue.get(timeout=30) + queue.get(timeout=30)
+        for worker in workers:
+            worker.join()
+        self.assertEqual(len(set(claimed)), 6)
+
+        slot = claimed[0]
+        worker = multiprocessing.Process(target=_play_column, args=(
+            self.arena.handle(), slot, [(0, 1), (0, 0), (1, 1), (1, 0), (2, 1)]))
+        worker.start()
+        worker.join()
+        self.assertEqual(worker.exitcode, 0)
+        self.assertEqual(self.arena.state(self.arena.session(slot)).winner, 'X')
+
+
+if __name__ == '__main__':
+    unittest.main()
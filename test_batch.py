@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Unit tests for batched NumPy evaluation
+"""
+
+import itertools
+import unittest
+
+try:
+    import numpy as np
+    import batch
+except ImportError:  # numpy is optional
+    np = None
+
+from tic_tac_toe import TicTacToe
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestBatch(unittest.TestCase):
+    """Test cases for the batch evaluation API."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.boards = np.array(list(itertools.product((0, 1, 2), repeat=9)), dtype=np.int8)
+
+    def test_matches_tic_tac_toe_for_every_board(self):
+        """Test winner/full/legal against TicTacToe on all 3^9 boards."""
+        result = batch.evaluate(self.boards)
+        for board, winner, full, legal in zip(self.boards, *result):
+            game = batch.to_game(board)
+            expected = game.check_winner()
+            self.assertEqual(batch.PLAYER_NAMES.get(int(winner)), expected)
+            self.assertEqual(bool(full), game.is_board_full())
+            self.assertEqual([bool(v) for v in legal],
+                             [game.is_valid_move(r, c) for r in range(3) for c in range(3)])
+
+    def test_from_games_round_trip(self):
+        """Test encoding games into the array format."""
+        game = TicTacToe()
+        game.make_move(1, 1)
+        game.switch_player()
+        game.make_move(0, 2)
+        encoded = batch.from_games([game, TicTacToe()])
+        self.assertEqual(encoded.dtype, np.int8)
+        self.assertEqual(encoded.tolist(), [[0, 0, 2, 0, 1, 0, 0, 0, 0], [0] * 9])
+        self.assertEqual(batch.to_game(encoded[0]).board, game.board)
+
+    def test_apply_moves(self):
+        """Test applying a batch of moves with inferred players."""
+        boards = np.zeros((3, 9), dtype=np.int8)
+        boards[1, 4] = batch.X
+        new, applied = batch.apply_moves(boards, [4, 4, 9])
+        self.assertEqual(applied.tolist(), [True, False, False])
+        self.assertEqual(new[0, 4], batch.X)
+        self.assertEqual(new[1].tolist(), boards[1].tolist())
+        self.assertEqual(boards[0, 4], 0)  # input untouched
+
+        new, applied = batch.apply_moves(new, [0, 0, 0])
+        self.assertEqual(new[:, 0].tolist(), [batch.O, batch.O, batch.X])
+        self.assertTrue(applied.all())
+
+    def test_apply_moves_explicit_player_inplace(self):
+        """Test an explicit player code and in-place updates."""
+        boards = np.zeros((2, 9), dtype=np.int8)
+        result, _ = batch.apply_moves(boards, [0, 8], players=batch.O, inplace=True)
+        self.assertIs(result, boards)
+        self.assertEqual(boards[:, [0, 8]].tolist(), [[2, 0], [0, 2]])
+
+    def test_rejects_bad_shapes(self):
+        """Test input validation."""
+        with self.assertRaises(ValueError):
+            batch.evaluate(np.zeros((2, 8), dtype=np.int8))
+        with self.assertRaises(ValueError):
+            batch.apply_moves(np.zeros((2, 9), dtype=np.int8), [0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the bitboard game-state engine
+"""
+
+import itertools
+import random
+import unittest
+
+from bitboard import (STANDARD, BitBoard, FULL_MASK, WIN_MASKS, board_geometry, iter_bits,
+                      require_standard)
+from tic_tac_toe import TicTacToe
+
+
+def reference_winner(rows):
+    """The original nested-list winner scan."""
+    for row in rows:
+        if row[0] == row[1] == row[2] != ' ':
+            return row[0]
+    for col in range(3):
+        if rows[0][col] == rows[1][col] == rows[2][col] != ' ':
+            return rows[0][col]
+    if rows[0][0] == rows[1][1] == rows[2][2] != ' ':
+        return rows[0][0]
+    if rows[0][2] == rows[1][1] == rows[2][0] != ' ':
+        return rows[0][2]
+    return None
+
+
+class TestBitBoard(unittest.TestCase):
+    """Test cases for the BitBoard class."""
+
+    def test_winner_matches_reference_for_every_board(self):
+        """Test winner/is_full against the list scan on all 3^9 boards."""
+        for cells in itertools.product(' XO', repeat=9):
+            rows = [list(cells[0:3]), list(cells[3:6]), list(cells[6:9])]
+            bits = BitBoard.from_rows(rows)
+            self.assertEqual(bits.winner(), reference_winner(rows))
+            self.assertEqual(bits.is_full(), ' ' not in cells)
+            self.assertEqual(bits.rows(), rows)
+
+    def test_win_masks(self):
+        """Test there are eight three-cell winning lines."""
+        self.assertEqual(len(WIN_MASKS), 8)
+        for line in WIN_MASKS:
+            self.assertEqual(bin(line).count('1'), 3)
+
+    def test_play_and_legal_moves(self):
+        """Test that moves set bits and legal moves are the empty cells."""
+        bits = BitBoard()
+        self.assertEqual(bits.legal_moves(), list(range(9)))
+        bits.play(4, 'X')
+        bits.play(0, 'O')
+        self.assertEqual(bits.x, 1 << 4)
+        self.assertEqual(bits.o, 1)
+        self.assertEqual(bits.legal_mask(), FULL_MASK & ~0b10001)
+        self.assertNotIn(4, bits.legal_moves())
+        self.assertFalse(bits.is_empty(0))
+        self.assertEqual(bits.get_cell(4), 'X')
+
+    def test_set_cell_overwrites(self):
+        """Test overwriting and clearing cells."""
+        bits = BitBoard()
+        bits.set_cell(2, 'X')
+        bits.set_cell(2, 'O')
+        self.assertEqual((bits.x, bits.o), (0, 1 << 2))
+        bits.set_cell(2, ' ')
+        self.assertEqual((bits.x, bits.o), (0, 0))
+
+    def test_iter_bits(self):
+        """Test set-bit iteration order."""
+        self.assertEqual(list(iter_bits(0b100100101)), [0, 2, 5, 8])
+
+
+class TestGeometry(unittest.TestCase):
+    """Test cases for N x N, K-in-a-row geometries."""
+
+    def test_standard_geometry(self):
+        """Test that the default geometry is the classic board."""
+        self.assertIs(board_geometry(), STANDARD)
+        self.assertIs(board_geometry(3, 3), STANDARD)
+        self.assertEqual(len(STANDARD.cell_lines[4]), 4)
+        self.assertEqual(len(STANDARD.cell_lines[0]), 3)
+        self.assertEqual(len(STANDARD.cell_lines[1]), 2)
+
+    def test_line_counts(self):
+        """Test the number of K-cell windows on larger boards."""
+        gomoku = board_geometry(15, 5)
+        # 15 * 11 windows per orientation for rows and columns, 11 * 11 per diagonal.
+        self.assertEqual(len(gomoku.lines), 2 * 15 * 11 + 2 * 11 * 11)
+        self.assertIsNone(gomoku.winning)
+        self.assertEqual(len(gomoku.cell_lines[7 * 15 + 7]), 4 * 5)
+        self.assertTrue(all(bin(line).count('1') == 5 for line in gomoku.lines))
+
+    def test_invalid_geometry(self):
+        """Test that a win length longer than the board is rejected."""
+        with self.assertRaises(ValueError):
+            board_geometry(3, 4)
+
+    def test_incremental_matches_full_scan(self):
+        """Test wins_at against a full-board scan over random games."""
+        geo = board_geometry(6, 4)
+        rng = random.Random(2)
+        for _ in range(200):
+            bits = BitBoard(geometry=geo)
+            player = 'X'
+            for cell in rng.sample(range(geo.cells), geo.cells):
+                bits.play(cell, player)
+                self.assertEqual(bits.wins_at(cell), bits.winner())
+                if bits.winner():
+                    break
+                player = 'O' if player == 'X' else 'X'
+
+    def test_require_standard(self):
+        """Test the guard used by 3x3-only features."""
+        require_standard(BitBoard(), "test")
+        with self.assertRaises(ValueError):
+            require_standard(BitBoard(geometry=board_geometry(4)), "test")
+
+
+class TestBoardView(unittest.TestCase):
+    """Test that TicTacToe.board stays in sync with its bitboard."""
+
+    def setUp(self):
+        self.game = TicTacToe()
+
+    def test_moves_show_in_board(self):
+        """Test moves made before and after the view exists."""
+        self.game.make_move(0, 0)
+        board = self.game.board
+        self.assertEqual(board[0][0], 'X')
+        self.game.switch_player()
+        self.game.make_move(2, 1)
+        self.assertEqual(board[2][1], 'O')
+
+    def test_cell_writes_reach_bitboard(self):
+        """Test writing single cells of the view."""
+        self.game.board[1][0] = 'O'
+        self.game.board[1][1] = 'O'
+        self.game.board[1][2] = 'O'
+        self.assertEqual(self.game.check_winner(), 'O')
+        self.game.board[1][2] = ' '
+        self.assertIsNone(self.game.check_winner())
+        self.assertTrue(self.game.is_valid_move(1, 2))
+
+    def test_row_and_board_assignment(self):
+        """Test replacing whole rows and the whole board."""
+        self.game.board[2] = ['X', 'X', 'X']
+        self.assertEqual(self.game.check_winner(), 'X')
+        self.game.board[2][0] = 'O'
+        self.assertIsNone(self.game.check_winner())
+        self.game.board = [['O', ' ', ' '], [' ', 'O', ' '], [' ', ' ', 'O']]
+        self.assertEqual(self.game.check_winner(), 'O')
+        self.assertFalse(self.game.is_valid_move(1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the shared best-move cache
+"""
+
+import os
+import random
+import tempfile
+import threading
+import unittest
+
+import cache as cache_module
+from cache import MoveCache, position_key
+from compact import CompactGame
+from policies import heuristic_policy
+from tic_tac_toe import TicTacToe
+
+
+class FakeClock:
+    """A clock the tests move by hand."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestMoveCache(unittest.TestCase):
+    """Test cases for MoveCache."""
+
+    def setUp(self):
+        self.rng = random.Random(0)
+        self.calls = 0
+
+    def counting_policy(self, game, rng):
+        self.calls += 1
+        return heuristic_policy(game, rng)
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry goes first."""
+        cache = MoveCache(max_entries=2)
+        cache.put('p', (3, 3, 1), 0)
+        cache.put('p', (3, 3, 2), 0)
+        self.assertEqual(cache.get('p', (3, 3, 1)), 0)
+        cache.put('p', (3, 3, 3), 0)
+        self.assertIsNone(cache.get('p', (3, 3, 2)))
+        self.assertEqual(cache.get('p', (3, 3, 1)), 0)
+        self.assertEqual(cache.stats(), {'entries': 2, 'hits': 2, 'misses': 1,
+                                         'evictions': 1, 'expirations': 0})
+
+    def test_ttl(self):
+        """Test expiry with the cache default and a per-entry ttl."""
+        clock = FakeClock()
+        cache = MoveCache(ttl=10, clock=clock)
+        cache.put('p', (3, 3, 1), 4)
+        cache.put('p', (3, 3, 2), 4, ttl=100)
+        clock.now = 11
+        self.assertIsNone(cache.get('p', (3, 3, 1)))
+        self.assertEqual(cache.get('p', (3, 3, 2)), 4)
+        self.assertEqual(cache.expirations, 1)
+
+    def test_symmetric_positions_share_an_entry(self):
+        """Test that a rotated position reuses the cached move, mapped back."""
+        cache = MoveCache()
+        game = TicTacToe()
+        game.board = [['X', 'X', ' '], [' ', 'O', ' '], [' ', ' ', 'O']]
+        self.assertEqual(cache.best_move(game, 'solver', self.counting_policy, self.rng), (0, 2))
+        # The same position rotated 90 degrees clockwise.
+        game.board = [[' ', ' ', 'X'], [' ', 'O', 'X'], ['O', ' ', ' ']]
+        self.assertEqual(cache.best_move(game, 'solver', self.counting_policy, self.rng), (2, 2))
+        self.assertEqual(self.calls, 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        # Different policies do not share entries.
+        cache.best_move(game, 'other', self.counting_policy, self.rng)
+        self.assertEqual(self.calls, 2)
+
+    def test_compact_games_and_large_boards(self):
+        """Test the keys for server sessions and non-standard boards."""
+        compact = CompactGame()
+        compact.make_move(1, 1)
+        game = TicTacToe()
+        game.make_move(1, 1)
+        self.assertEqual(position_key(compact), position_key(game))
+        large = TicTacToe(4)
+        large.make_move(0, 0)
+        self.assertEqual(position_key(large), ((4, 4, 1), 0))
+
+    def test_snapshot_round_trip(self):
+        """Test saving and warming a new cache from a snapshot."""
+        clock = FakeClock()
+        cache = MoveCache(clock=clock)
+        cache.put('solver', (3, 3, 5), 4)
+        cache.put('random', (3, 3, 5), 0, ttl=30)
+        cache.put('random', (3, 3, 6), 0, ttl=1)
+        clock.now = 5
+        handle, path = tempfile.mkstemp(suffix='.json')
+        os.close(handle)
+        try:
+            self.assertEqual(cache.save(path), 2)
+            warm = MoveCache(clock=clock)
+            self.assertEqual(warm.load(path), 2)
+        finally:
+            os.unlink(path)
+        self.assertEqual(warm.get('solver', (3, 3, 5)), 4)
+        clock.now = 34
+        self.assertIsNone(warm.get('random', (3, 3, 5)))
+
+    def test_no_expiry_survives_load(self):
+        """Test that entries saved without expiry don't pick up the loader's ttl."""
+        clock = FakeClock()
+        cache = MoveCache(clock=clock)
+        cache.put('solver', (3, 3, 5), 4)
+        handle, path = tempfile.mkstemp(suffix='.json')
+        os.close(handle)
+        try:
+            cache.save(path)
+            warm = MoveCache(ttl=10, clock=clock)
+            warm.load(path)
+        finally:
+            os.unlink(path)
+        clock.now = 1000
+        self.assertEqual(warm.get('solver', (3, 3, 5)), 4)
+        warm.put('solver', (3, 3, 6), 2, ttl=cache_module.NEVER)
+        warm.put('solver', (3, 3, 7), 2)
+        clock.now = 2000
+        self.assertEqual(warm.get('solver', (3, 3, 6)), 2)
+        self.assertIsNone(warm.get('solver', (3, 3, 7)))
+
+    def test_concurrent_access(self):
+        """Test counters and bounds under several threads."""
+        cache = MoveCache(max_entries=50)
+        lookups = 2000
+
+        def worker(seed):
+            rng = random.Random(seed)
+            for _ in range(lookups):
+                key = (3, 3, rng.randrange(100))
+                if cache.get('p', key) is None:
+                    cache.put('p', key, key[2] % 9)
+
+        threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = cache.stats()
+        self.assertEqual(stats['hits'] + stats['misses'], 8 * lookups)
+        self.assertEqual(stats['entries'], 50)
+        # Two threads can miss on the same key; the second put then replaces
+        # rather than adds, so evictions may trail the misses.
+        self.assertLessEqual(stats['evictions'], stats['misses'] - 50)
+        self.assertGreater(stats['evictions'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
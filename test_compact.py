@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Unit tests for compact game sessions and the game pool
+"""
+
+import random
+import unittest
+
+from bitboard import BitBoard
+from compact import CompactGame, GamePool
+from tic_tac_toe import TicTacToe
+
+
+class TestCompactGame(unittest.TestCase):
+    """Test cases for the __slots__ CompactGame class."""
+
+    def setUp(self):
+        self.game = CompactGame()
+
+    def test_has_no_instance_dict(self):
+        """Test that the game is a fixed-size slotted object."""
+        self.assertFalse(hasattr(self.game, '__dict__'))
+        with self.assertRaises(AttributeError):
+            self.game.extra = 1
+
+    def test_matches_tic_tac_toe(self):
+        """Test random games against TicTacToe move by move."""
+        rng = random.Random(4)
+        for _ in range(200):
+            compact, reference = CompactGame(), TicTacToe()
+            while not (reference.check_winner() or reference.is_board_full()):
+                row, col = rng.choice(reference.available_moves())
+                self.assertEqual(compact.is_valid_move(row, col), reference.is_valid_move(row, col))
+                self.assertTrue(compact.make_move(row, col))
+                reference.make_move(row, col)
+                self.assertEqual(compact.check_winner(), reference.check_winner())
+                self.assertEqual(compact.is_board_full(), reference.is_board_full())
+                compact.switch_player()
+                reference.switch_player()
+            self.assertEqual(compact.board, reference.board)
+            self.assertFalse(compact.make_move(3, 0))
+
+    def test_reset(self):
+        """Test returning to the starting position."""
+        self.game.make_move(0, 0)
+        self.game.switch_player()
+        self.game.game_over = True
+        self.game.winner = 'X'
+        self.game.reset()
+        self.assertEqual((self.game.bitboard.x, self.game.bitboard.o), (0, 0))
+        self.assertEqual(self.game.current_player, 'X')
+        self.assertFalse(self.game.game_over)
+        self.assertIsNone(self.game.winner)
+
+    def test_bitboard_keeps_its_contract(self):
+        """Test that game.bitboard is a real BitBoard, not the game itself."""
+        for row, col in [(0, 0), (1, 0), (0, 1), (1, 1), (0, 2)]:
+            self.game.make_move(row, col)
+            self.game.switch_player()
+        bits = self.game.bitboard
+        self.assertIsInstance(bits, BitBoard)
+        self.assertEqual(bits.winner(), 'X')
+        self.assertEqual(bits.copy().winner(), 'X')
+
+
+class TestGamePool(unittest.TestCase):
+    """Test cases for recycling games through a GamePool."""
+
+    def test_release_and_reuse(self):
+        """Test that released games come back reset."""
+        pool = GamePool()
+        game = pool.acquire()
+        game.make_move(1, 1)
+        pool.release(game)
+        self.assertEqual(len(pool), 1)
+        again = pool.acquire()
+        self.assertIs(again, game)
+        self.assertTrue(again.is_valid_move(1, 1))
+        self.assertEqual((pool.created, pool.reused), (1, 1))
+
+    def test_max_size(self):
+        """Test that the pool keeps at most max_size spare games."""
+        pool = GamePool(max_size=2)
+        games = [pool.acquire() for _ in range(3)]
+        for game in games:
+            pool.release(game)
+        self.assertEqual(len(pool), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
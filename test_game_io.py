@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the pluggable I/O backends
+"""
+
+import os
+import tempfile
+import unittest
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+from game_io import (BufferedRenderer, NullRenderer, ScriptedInput, TerminalRenderer,
+                     format_board, parse_move)
+from tic_tac_toe import TicTacToe
+
+
+class TestParseMove(unittest.TestCase):
+    """Test cases for the shared "row col" grammar."""
+
+    def setUp(self):
+        self.game = TicTacToe()
+
+    def test_valid_and_quit(self):
+        """Test parsing moves and quit words."""
+        self.assertEqual(parse_move(' 1 2 ', self.game), (0, 1))
+        for word in ('quit', 'EXIT', 'q'):
+            self.assertIsNone(parse_move(word, self.game))
+
+    def test_errors(self):
+        """Test the player-facing error messages."""
+        self.game.make_move(0, 0)
+        cases = {
+            '1': "Please enter two numbers separated by a space (row col)",
+            'a b': "Please enter valid numbers",
+            '4 1': "Please enter numbers between 1 and 3",
+            '1 1': "That position is already taken! Choose another.",
+        }
+        for text, message in cases.items():
+            with self.assertRaises(ValueError) as ctx:
+                parse_move(text, self.game)
+            self.assertEqual(str(ctx.exception), message)
+
+
+class TestRenderers(unittest.TestCase):
+    """Test cases for the renderers."""
+
+    def setUp(self):
+        self.game = TicTacToe()
+        self.game.make_move(1, 1)
+
+    def test_format_board_matches_display_board(self):
+        """Test that a buffered frame is byte-identical to display_board."""
+        with patch('sys.stdout', new_callable=StringIO) as stdout:
+            self.game.display_board()
+        self.assertEqual(format_board(self.game), stdout.getvalue())
+
+    def test_buffered_renderer_single_write(self):
+        """Test one write call per frame."""
+        stream = MagicMock()
+        BufferedRenderer(stream).render(self.game)
+        stream.write.assert_called_once_with(format_board(self.game))
+
+    def test_terminal_renderer_uses_display_board(self):
+        """Test that the default renderer keeps the old behaviour."""
+        with patch.object(self.game, 'display_board') as display, \
+                patch('builtins.print') as mock_print:
+            renderer = TerminalRenderer()
+            renderer.render(self.game)
+            renderer.message('hello')
+        display.assert_called_once_with()
+        mock_print.assert_called_once_with('hello')
+
+    def test_null_renderer(self):
+        """Test that the null renderer prints nothing."""
+        with patch('builtins.print') as mock_print:
+            NullRenderer().render(self.game)
+            NullRenderer().message('hello')
+        mock_print.assert_not_called()
+
+
+class TestScriptedInput(unittest.TestCase):
+    """Test cases for scripted move sources and injected game loops."""
+
+    def test_skips_bad_lines(self):
+        """Test that invalid lines are recorded and skipped."""
+        game = TicTacToe()
+        source = ScriptedInput(['', 'nonsense', '2 2', 'quit', '1 1'])
+        self.assertEqual(source.read_move(game), (1, 1))
+        self.assertEqual(source.errors[0][0], 'nonsense')
+        self.assertIsNone(source.read_move(game))
+        self.assertEqual(source.read_move(game), (0, 0))
+        self.assertIsNone(source.read_move(game))
+
+    def test_play_game_headless(self):
+        """Test a full scripted game with no output."""
+        game = TicTacToe()
+        with patch('builtins.print') as mock_print, patch('builtins.input') as mock_input:
+            game.play_game(NullRenderer(), ScriptedInput(['1 1', '2 1', '1 2', '2 2', '1 3']))
+        mock_print.assert_not_called()
+        mock_input.assert_not_called()
+        self.assertTrue(game.game_over)
+        self.assertEqual(game.winner, 'X')
+
+    def test_play_game_buffered_from_file(self):
+        """Test a scripted game read from a file into a buffered renderer."""
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+            f.write('1 1\n2 2\n')
+        try:
+            source = ScriptedInput.from_file(f.name)
+        finally:
+            os.unlink(f.name)
+        stream = StringIO()
+        game = TicTacToe()
+        game.play_game(BufferedRenderer(stream), source)
+        self.assertFalse(game.game_over)
+        self.assertIn('2    | O |  ', stream.getvalue())
+        self.assertTrue(stream.getvalue().endswith('Thanks for playing!\n'))
+
+
+if __name__ == '__main__':
+    unittest.main()
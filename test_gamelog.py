@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the binary game log
+"""
+
+import os
+import random
+import tempfile
+import unittest
+
+import gamelog
+from game_io import NullRenderer, ScriptedInput
+from policies import random_policy
+from simulate import play_headless
+from tic_tac_toe import TicTacToe
+
+
+class TestGameLog(unittest.TestCase):
+    """Test cases for the game log writer and readers."""
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.tttl')
+        os.close(handle)
+        os.unlink(self.path)
+        rng = random.Random(3)
+        self.games = [play_headless(random_policy, random_policy, rng).moves for _ in range(500)]
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def test_record_encoding(self):
+        """Test one byte per move with the side in the top bit."""
+        record = gamelog.encode_game([4, 0, 8])
+        self.assertEqual(record, bytes([3, 4, 0 | 0x80, 8]))
+        self.assertEqual(gamelog.decode_moves(record[1:]), [(4, 'X'), (0, 'O'), (8, 'X')])
+        with self.assertRaises(ValueError):
+            gamelog.encode_game([200])
+
+    def test_recorded_sides(self):
+        """Test that the side bit holds each move's actual mover."""
+        record = gamelog.encode_game([4, 0, 8], 'OXX')
+        self.assertEqual(gamelog.decode_moves(record[1:]), [(4, 'O'), (0, 'X'), (8, 'X')])
+        with self.assertRaises(ValueError):
+            gamelog.encode_game([4, 0], 'X')
+        with self.assertRaises(ValueError):
+            gamelog.encode_game([4], 'Z')
+        # O opens this game, so strict alternation from X would mislabel it.
+        game = TicTacToe()
+        game.current_player = 'O'
+        for row, col in [(1, 1), (0, 0), (2, 2)]:
+            game.make_move(row, col)
+            game.switch_player()
+        with gamelog.GameLogWriter(self.path) as writer:
+            offset = writer.append_game(game)
+        with gamelog.GameLog(self.path) as log:
+            self.assertEqual(log.read_moves(offset), [(4, 'O'), (0, 'X'), (8, 'O')])
+            self.assertEqual(log.read(offset), (4, 0, 8))
+
+    def test_round_trip_streaming(self):
+        """Test writing in small batches and streaming back in small chunks."""
+        with gamelog.GameLogWriter(self.path, buffer_size=64) as writer:
+            offsets = [writer.append(moves) for moves in self.games]
+        self.assertEqual(list(gamelog.iter_games(self.path, chunk_size=7)), self.games)
+        self.assertEqual([offset for offset, _ in gamelog.iter_records(self.path)], offsets)
+        expected_bytes = gamelog.HEADER.size + sum(1 + len(moves) for moves in self.games)
+        self.assertEqual(os.path.getsize(self.path), expected_bytes)
+
+    def test_mmap_random_access(self):
+        """Test reading records by offset through the memory map."""
+        with gamelog.GameLogWriter(self.path) as writer:
+            offsets = [writer.append(moves) for moves in self.games]
+        with gamelog.GameLog(self.path) as log:
+            self.assertEqual(len(log), len(self.games))
+            for index in (0, 17, len(self.games) - 1):
+                self.assertEqual(log.read(offsets[index]), self.games[index])
+            self.assertEqual(list(log.offsets()), offsets)
+            self.assertEqual(log.read_moves(offsets[0])[0], (self.games[0][0], 'X'))
+
+    def test_append_to_existing_segment(self):
+        """Test reopening a segment and the geometry check."""
+        gamelog.write_games(self.path, self.games[:10])
+        gamelog.write_games(self.path, self.games[10:20])
+        self.assertEqual(list(gamelog.iter_games(self.path)), self.games[:20])
+        with self.assertRaises(ValueError):
+            gamelog.GameLogWriter(self.path, size=4)
+
+    def test_truncated_segment(self):
+        """Test that a partial trailing record is reported."""
+        gamelog.write_games(self.path, self.games[:3])
+        with open(self.path, 'ab') as f:
+            f.write(bytes([5, 1]))
+        with self.assertRaises(ValueError):
+            list(gamelog.iter_games(self.path))
+
+    def test_play_game_logs_history(self):
+        """Test that play_game appends the finished game's moves."""
+        game = TicTacToe()
+        script = ScriptedInput(["1 1", "2 2", "1 2", "3 3", "1 3"])
+        with gamelog.GameLogWriter(self.path) as writer:
+            game.play_game(NullRenderer(), script, writer)
+        self.assertEqual(game.moves, [0, 4, 1, 8, 2])
+        self.assertEqual(list(gamelog.iter_games(self.path)), [(0, 4, 1, 8, 2)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the test report generator
+"""
+
+import io
+import os
+import sys
+import tempfile
+import textwrap
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import generate_test_report as reporting
+from perf_tic_tac_toe import BenchResult
+
+
+SAMPLE_TESTS = textwrap.dedent('''
+    import time
+    import unittest
+
+    class Sample(unittest.TestCase):
+        def test_passes(self):
+            """A test that passes."""
+            pass
+
+        def test_slow(self):
+            """A test slow enough to top the slowest-tests table."""
+            time.sleep(0.05)
+
+        def test_fails(self):
+            """A test that fails."""
+            self.fail("expected")
+
+        @unittest.skip("not today")
+        def test_skipped(self):
+            """A test that is skipped."""
+            pass
+''')
+
+
+class TestReportGenerator(unittest.TestCase):
+    """Test cases for structured results, report sections and deltas."""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        Path(self.dir.name, 'sample_report_case.py').write_text(SAMPLE_TESTS)
+
+    def tearDown(self):
+        # discover() imported the sample from (and added) the temporary dir.
+        sys.modules.pop('sample_report_case', None)
+        if self.dir.name in sys.path:
+            sys.path.remove(self.dir.name)
+        self.dir.cleanup()
+
+    def run_sample(self):
+        with redirect_stdout(io.StringIO()):
+            return reporting.run_tests('sample_report_case.py', self.dir.name)
+
+    def test_structured_results(self):
+        """Test the counts, failures, skips and durations of a run."""
+        run = self.run_sample()
+        self.assertEqual(run.total, 4)
+        self.assertEqual(run.failed, ['sample_report_case.Sample.test_fails'])
+        self.assertEqual(run.skipped, ['sample_report_case.Sample.test_skipped'])
+        self.assertEqual(run.passed, 2)
+        self.assertFalse(run.success)
+        self.assertEqual(len(run.durations), 4)
+        self.assertEqual(run.slowest(1)[0][0], 'sample_report_case.Sample.test_slow')
+
+    def test_report_sections_and_deltas(self):
+        """Test the report sections and the deltas against a previous report."""
+        run = self.run_sample()
+        bench = [BenchResult('make_move', 1, 1, 1, 900.0, 1000.0, 1000.0, 0.0)]
+        profile = reporting.ProfileSummary(10, 0.5, [('make_move (tic_tac_toe.py:1)', 60, 0.1, 0.2)])
+        first = reporting.generate_report(run, bench, profile)
+        for heading in ("### Failed Tests", "### Slowest Tests", "## Performance Benchmarks",
+                        "## Profile", "`make_move (tic_tac_toe.py:1)`"):
+            self.assertIn(heading, first)
+
+        path = os.path.join(self.dir.name, 'REPORT.md')
+        Path(path).write_text(first)
+        previous = reporting.load_previous_metrics(path)
+        self.assertEqual(previous['benchmarks'], {'make_move': 1000.0})
+
+        bench = [BenchResult('make_move', 1, 1, 1, 1100.0, 1250.0, 1250.0, 0.0)]
+        second = reporting.generate_report(run, bench, profile, previous)
+        self.assertIn("| make_move | 1,250 ns | 1,100 ns | 800,000 | +25.0% |", second)
+
+    def test_missing_previous_report(self):
+        """Test that a missing previous report gives no metrics and no deltas."""
+        self.assertIsNone(reporting.load_previous_metrics(os.path.join(self.dir.name, 'none.md')))
+        self.assertEqual(reporting._delta(1.0, None), "–")
+
+    def test_profile_games(self):
+        """Test profiling a batch of games, sorted by own time."""
+        with redirect_stdout(io.StringIO()):
+            profile = reporting.profile_games(games=50, top=5)
+        self.assertEqual(profile.games, 50)
+        self.assertEqual(len(profile.rows), 5)
+        own_times = [row[2] for row in profile.rows]
+        self.assertEqual(own_times, sorted(own_times, reverse=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the Monte Carlo Tree Search player
+"""
+
+import random
+import unittest
+
+import policies
+from mcts import MCTS, MCTSPolicy
+from simulate import play_headless
+from tic_tac_toe import TicTacToe
+
+
+class TestMCTS(unittest.TestCase):
+    """Test cases for the MCTS class."""
+
+    def setUp(self):
+        self.rng = random.Random(0)
+
+    def test_takes_the_win_and_blocks(self):
+        """Test the two obvious tactical moves."""
+        game = TicTacToe()
+        game.board = [['X', 'X', ' '], ['O', 'O', ' '], [' ', ' ', ' ']]
+        self.assertEqual(MCTS(2000, rng=self.rng).search(game), (0, 2))
+        game.board = [['X', ' ', ' '], ['O', 'O', ' '], [' ', ' ', 'X']]
+        self.assertEqual(MCTS(2000, rng=self.rng).search(game), (1, 2))
+
+    def test_playout_budget_and_stats(self):
+        """Test that the playout budget is honoured and reported."""
+        searcher = MCTS(300, rng=self.rng)
+        searcher.search(TicTacToe())
+        self.assertEqual(searcher.stats.playouts, 300)
+        self.assertEqual(searcher.root.visits, 300)
+        self.assertGreater(searcher.stats.playouts_per_sec, 0)
+
+    def test_time_limit(self):
+        """Test a time-only budget."""
+        searcher = MCTS(None, time_limit=0.05, rng=self.rng)
+        searcher.search(TicTacToe())
+        self.assertGreater(searcher.stats.playouts, 0)
+        self.assertLess(searcher.stats.seconds, 0.5)
+        with self.assertRaises(ValueError):
+            MCTS(None, None)
+
+    def test_tree_reuse(self):
+        """Test that the subtree of the moves played since the last search is kept."""
+        game = TicTacToe()
+        searcher = MCTS(1000, rng=self.rng)
+        row, col = searcher.search(game)
+        game.make_move(row, col)
+        game.switch_player()
+        reply = game.available_moves()[0]
+        game.make_move(*reply)
+        game.switch_player()
+        searcher.search(game)
+        self.assertGreater(searcher.stats.reused_visits, 0)
+        self.assertEqual(searcher.root.visits, searcher.stats.reused_visits + 1000)
+        # An unrelated position starts a fresh tree.
+        searcher.search(TicTacToe())
+        self.assertEqual(searcher.stats.reused_visits, 0)
+
+    def test_no_tree_reuse_across_board_sizes(self):
+        """Test that a search on another board size starts a fresh tree."""
+        searcher = MCTS(300, rng=self.rng)
+        searcher.search(TicTacToe())
+        row, col = searcher.search(TicTacToe(4, 3))
+        self.assertEqual(searcher.stats.reused_visits, 0)
+        self.assertEqual(sorted(searcher.root.children), list(range(16)))
+        self.assertTrue(TicTacToe(4, 3).is_valid_move(row, col))
+
+    def test_never_loses_to_random_play(self):
+        """Test a handful of full games against the random policy."""
+        policy = MCTSPolicy(playouts=1000)
+        for _ in range(5):
+            record = play_headless(policy, policies.random_policy, self.rng)
+            self.assertNotEqual(record.winner, 'O')
+
+    def test_large_board(self):
+        """Test completing four in a row on a 7x7 board."""
+        game = TicTacToe(7, 4)
+        for row in range(3):
+            game.board[row][3] = 'X'
+        game.board[6][0] = 'O'
+        game.board[6][1] = 'O'
+        game.board[6][2] = 'O'
+        self.assertEqual(MCTS(3000, rng=self.rng).search(game), (3, 3))
+
+    def test_root_parallel_merges_workers(self):
+        """Test that worker playouts are added to the local ones."""
+        searcher = MCTS(200, workers=2, rng=self.rng)
+        try:
+            row, col = searcher.search(TicTacToe())
+        finally:
+            searcher.close()
+        self.assertEqual(searcher.stats.playouts, 400)
+        self.assertEqual(searcher.stats.workers, 2)
+        self.assertTrue(TicTacToe().is_valid_move(row, col))
+
+
+if __name__ == '__main__':
+    unittest.main()
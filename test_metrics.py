@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the opt-in TicTacToe instrumentation
+"""
+
+import json
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+import metrics
+import policies
+from metrics import Histogram
+from simulate import play_headless
+from tic_tac_toe import TicTacToe
+
+
+class TestHistogram(unittest.TestCase):
+    """Test cases for bucketing and percentile estimates."""
+
+    def test_buckets_and_percentiles(self):
+        """Test bucket counts and percentile estimates."""
+        histogram = Histogram()
+        self.assertEqual(histogram.percentile(0.5), 0.0)
+        for ns in [100] * 90 + [5000] * 10:
+            histogram.observe(ns)
+        self.assertEqual(histogram.count, 100)
+        self.assertEqual(histogram.total, 59000)
+        self.assertEqual(histogram.max, 5000)
+        # 100 ns falls in (64, 128], 5000 ns in (4096, 8192].
+        self.assertEqual(histogram.counts[1], 90)
+        self.assertEqual(histogram.counts[7], 10)
+        self.assertTrue(64 <= histogram.percentile(0.5) <= 128)
+        self.assertTrue(4096 <= histogram.percentile(0.99) <= 5000)
+
+    def test_bucket_bound_is_inclusive_and_overflow(self):
+        """Test that a bucket includes its upper bound and that the last one takes overflow."""
+        histogram = Histogram()
+        histogram.observe(64)
+        histogram.observe(2 ** 40)
+        self.assertEqual(histogram.counts[0], 1)
+        self.assertEqual(histogram.counts[-1], 1)
+        self.assertEqual(histogram.percentile(1.0), 2 ** 40)
+
+
+class TestInstrumentation(unittest.TestCase):
+    """Test cases for enabling, recording, exporting and disabling."""
+
+    def tearDown(self):
+        metrics.disable()
+
+    def test_disable_restores_original_functions(self):
+        """Test that disable() puts back the original TicTacToe methods."""
+        originals = {name: TicTacToe.__dict__[name] for name in metrics.INSTRUMENTED}
+        self.assertIsNone(metrics.current())
+        with metrics.instrumented() as recorded:
+            self.assertIs(metrics.current(), recorded)
+            self.assertIsNot(TicTacToe.__dict__['make_move'], originals['make_move'])
+        self.assertIsNone(metrics.current())
+        for name, original in originals.items():
+            self.assertIs(TicTacToe.__dict__[name], original)
+        self.assertNotIn('game_over', TicTacToe.__dict__)
+
+    def test_counts_moves_games_and_calls(self):
+        """Test counting moves, finished games and method calls."""
+        rng = random.Random(1)
+        existing = TicTacToe()
+        recorded = metrics.enable()
+        for _ in range(20):
+            play_headless(policies.random_policy, policies.random_policy, rng)
+        existing.make_move(0, 0)
+        existing.make_move(0, 0)
+        existing.unmake_move()
+        existing.game_over = True
+        existing.game_over = True
+        snapshot = recorded.snapshot()
+        self.assertEqual(snapshot['games'], 21)
+        moves = snapshot['moves']
+        self.assertGreaterEqual(moves, 20 * 5 + 1)
+        self.assertEqual(snapshot['methods']['make_move']['calls'], moves + 1)
+        self.assertEqual(snapshot['methods']['is_valid_move']['calls'], moves + 1)
+        self.assertEqual(snapshot['methods']['unmake_move']['calls'], 1)
+        self.assertGreater(snapshot['moves_per_sec'], 0)
+        self.assertGreater(snapshot['methods']['check_winner']['p50_ns'], 0)
+        metrics.disable()
+        self.assertTrue(existing.game_over)
+        existing.reset()
+        self.assertEqual(recorded.games, 21)
+        recorded.reset()
+        self.assertEqual(recorded.snapshot()['methods']['make_move']['calls'], 0)
+
+    def test_prometheus_text(self):
+        """Test the Prometheus text export."""
+        with metrics.instrumented(('make_move', 'check_winner')) as recorded:
+            game = TicTacToe()
+            game.make_move(1, 1)
+            game.check_winner()
+        text = recorded.prometheus()
+        self.assertIn('# TYPE tictactoe_call_duration_seconds histogram', text)
+        self.assertIn('tictactoe_moves_total 1\n', text)
+        self.assertIn('tictactoe_call_duration_seconds_bucket{method="make_move",le="+Inf"} 1',
+                      text)
+        self.assertIn('tictactoe_call_duration_seconds_count{method="check_winner"} 1', text)
+        self.assertIn('quantile="0.99"', text)
+        self.assertNotIn('is_board_full', text)
+
+    def test_periodic_json_dump(self):
+        """Test writing snapshots to a JSON file in the background."""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'metrics.json')
+        with metrics.instrumented() as recorded:
+            with metrics.PeriodicDump(recorded, path, interval=0.01):
+                TicTacToe().make_move(0, 0)
+        with open(path) as f:
+            snapshot = json.load(f)
+        self.assertEqual(snapshot['moves'], 1)
+        self.assertEqual(os.listdir(directory), ['metrics.json'])
+
+
+if __name__ == '__main__':
+    unittest.main()
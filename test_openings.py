@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the opening book
+"""
+
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import openings
+from mcts import MCTSPolicy
+from policies import random_policy, solver_policy
+from simulate import play_headless
+from tic_tac_toe import TicTacToe
+
+
+class TestOpeningBook(unittest.TestCase):
+    """Test cases for building, storing and using opening books."""
+
+    def setUp(self):
+        self.rng = random.Random(0)
+
+    def test_solver_book(self):
+        """Test the solver book's positions and rankings."""
+        book = openings.build_from_solver(3)
+        # 1 empty board, 3 distinct first moves, 12 distinct replies.
+        self.assertEqual(len(book), 16)
+        game = TicTacToe()
+        self.assertEqual([score for _, score in book.moves(game)], [0] * 9)
+        game.make_move(2, 2)
+        game.switch_player()
+        ranked = book.moves(game)
+        self.assertEqual(ranked[0], ((1, 1), 0))
+        self.assertTrue(all(score == -1000 for _, score in ranked[1:]))
+        self.assertEqual(book.best_move(game, self.rng), (1, 1))
+        game.make_move(1, 1)
+        game.switch_player()
+        game.make_move(0, 1)
+        self.assertEqual(book.moves(game), [])
+
+    def test_committed_book_matches_solver(self):
+        """Test that tic_tac_toe_book.bin is up to date."""
+        committed = openings.get_book()
+        self.assertIs(openings.get_book(3, 3), committed)
+        self.assertEqual(committed.entries, openings.build_from_solver(committed.plies).entries)
+        self.assertIsNone(openings.get_book(9, 9))
+
+    def test_save_and_load(self):
+        """Test the file round trip, including a large board's wide keys."""
+        records = [play_headless(random_policy, random_policy, self.rng, TicTacToe(6, 4))
+                   for _ in range(200)]
+        book = openings.build_from_games(records, 6, 4, plies=2)
+        handle, path = tempfile.mkstemp(suffix='.bin')
+        os.close(handle)
+        try:
+            book.save(path)
+            loaded = openings.OpeningBook.load(path)
+        finally:
+            os.unlink(path)
+        self.assertEqual((loaded.size, loaded.win_length, loaded.plies), (6, 4, 2))
+        self.assertEqual(loaded.entries, book.entries)
+
+    def test_selfplay_book_maps_moves_back(self):
+        """Test that self-play statistics are shared across symmetric positions."""
+        records = [play_headless(solver_policy, random_policy, self.rng) for _ in range(300)]
+        book = openings.build_from_games(records, plies=2)
+        game = TicTacToe()
+        first = book.moves(game)
+        # The solver never loses, so every first move it played scores >= 0.
+        self.assertTrue(first and all(score >= 0 for _, score in first))
+        for row, col in [(0, 0), (0, 2), (2, 0), (2, 2)]:
+            game.reset()
+            game.make_move(row, col)
+            game.switch_player()
+            for move, _ in book.moves(game):
+                self.assertTrue(game.is_valid_move(*move))
+
+    def test_large_board_canonical_position(self):
+        """Test that rotated 5x5 positions share a key."""
+        key, _ = openings.canonical_position(1 << 0, 1 << 6, 5)
+        rotated, _ = openings.canonical_position(1 << 4, 1 << 8, 5)
+        self.assertEqual(key, rotated)
+
+    def test_mcts_policy_plays_book_moves(self):
+        """Test that the MCTS policy answers from the book without searching."""
+        policy = MCTSPolicy(playouts=10)
+        game = TicTacToe()
+        game.make_move(0, 0)
+        game.switch_player()
+        self.assertEqual(policy(game, self.rng), (1, 1))
+        self.assertIsNone(policy.searcher)
+
+    def test_import_does_not_load_books(self):
+        """Test that importing the game module leaves the book subsystem alone."""
+        code = "import sys, tic_tac_toe; print('openings' in sys.modules)"
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+        self.assertEqual(output.stdout.strip(), 'False')
+
+
+if __name__ == '__main__':
+    unittest.main()
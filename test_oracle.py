@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the memory-mapped game-tree oracle
+"""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+import oracle
+from solver import DRAW, WIN, Solver
+from tic_tac_toe import TicTacToe
+
+
+class TestOracle(unittest.TestCase):
+    """Test cases for building and reading the oracle table."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.path = Path(cls.tmpdir.name) / 'oracle.bin'
+        cls.count = oracle.build(cls.path)
+        cls.table = oracle.Oracle(cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.table.close()
+        cls.tmpdir.cleanup()
+
+    def test_position_count(self):
+        """Test that every legal position is enumerated."""
+        self.assertEqual(self.count, 5478)
+        self.assertEqual(os.path.getsize(self.path),
+                         oracle.HEADER.size + 3 ** 9 * oracle.RECORD.size)
+
+    def test_shipped_table_is_current(self):
+        """Test that the committed table matches a fresh build."""
+        self.assertEqual(oracle.DEFAULT_PATH.read_bytes(), self.path.read_bytes())
+
+    def test_empty_board(self):
+        """Test the entry for the opening position."""
+        entry = self.table.lookup_game(TicTacToe())
+        self.assertEqual(entry, oracle.OracleEntry('draw', 9, 0b111111111))
+
+    def test_win_in_one(self):
+        """Test that a win in one has distance 1 and a single best move."""
+        game = TicTacToe()
+        game.board = [['X', 'X', ' '], ['O', 'O', ' '], [' ', ' ', ' ']]
+        entry = self.table.lookup_game(game)
+        self.assertEqual(entry.outcome, 'X')
+        self.assertEqual(entry.distance, 1)
+        self.assertEqual(self.table.best_moves(game), [(0, 2)])
+
+    def test_finished_game(self):
+        """Test that a won position has no moves left."""
+        game = TicTacToe()
+        game.board = [['X', 'X', 'X'], ['O', 'O', ' '], [' ', ' ', ' ']]
+        self.assertEqual(self.table.lookup_game(game), oracle.OracleEntry('X', 0, 0))
+
+    def test_outcomes_agree_with_solver(self):
+        """Test every legal position against the negamax solver."""
+        solver = Solver()
+        for x, o in oracle.reachable_positions().values():
+            x_to_move = bin(x).count('1') == bin(o).count('1')
+            me, opp = (x, o) if x_to_move else (o, x)
+            value = solver.value(me, opp)
+            outcome = self.table.lookup(x, o).outcome
+            if value == DRAW:
+                self.assertEqual(outcome, 'draw')
+            else:
+                mover = 'X' if x_to_move else 'O'
+                self.assertEqual(outcome == mover, value == WIN)
+
+    def test_unreachable_position(self):
+        """Test that an illegal position raises KeyError."""
+        with self.assertRaises(KeyError):
+            self.table.lookup(0b111, 0)
+
+    def test_rejects_other_files(self):
+        """Test that a file without the oracle header is refused."""
+        bogus = Path(self.tmpdir.name) / 'bogus.bin'
+        bogus.write_bytes(b'\0' * 64)
+        with self.assertRaises(ValueError):
+            oracle.Oracle(bogus)
+
+
+if __name__ == '__main__':
+    unittest.main()
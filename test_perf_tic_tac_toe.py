@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the performance suite's measurement and baseline handling
+"""
+
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+import perf_tic_tac_toe as perf
+
+
+def result(name, median_ns):
+    return perf.BenchResult(name, 1, 1, 3, median_ns, median_ns, median_ns, 0.0)
+
+
+class TestPerfSuite(unittest.TestCase):
+    """Test cases for running, saving and comparing benchmarks."""
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.json')
+        os.close(handle)
+
+    def tearDown(self):
+        os.unlink(self.path)
+
+    def test_every_benchmark_runs(self):
+        """Test that every registered benchmark runs and reports sane timings."""
+        results = perf.run_suite(round_time=0.0, rounds=2)
+        self.assertEqual([r.name for r in results], list(perf.BENCHMARKS))
+        for r in results:
+            self.assertGreater(r.ops, 0)
+            self.assertGreater(r.median_ns, 0)
+            self.assertLessEqual(r.min_ns, r.median_ns)
+
+    def test_save_and_load_round_trip(self):
+        """Test saving results as a baseline and loading them back."""
+        results = [result('make_move', 1500.0), result('check_winner', 90.0)]
+        with open(self.path, 'w') as f:
+            json.dump(perf.to_json(results), f)
+        loaded = perf.load_results(self.path)
+        self.assertEqual(loaded, {r.name: r for r in results})
+        with open(self.path) as f:
+            self.assertIn('python', json.load(f)['machine_info'])
+
+    def test_compare_flags_regressions_over_threshold(self):
+        """Test that only slowdowns beyond the threshold count as regressions."""
+        baseline = {'a': result('a', 100.0), 'b': result('b', 100.0), 'c': result('c', 100.0)}
+        current = [result('a', 105.0), result('b', 125.0), result('c', 80.0), result('new', 1.0)]
+        comparisons = perf.compare(current, baseline, threshold=0.10)
+        self.assertEqual([c.name for c in comparisons], ['a', 'b', 'c'])
+        self.assertEqual([c.regressed for c in comparisons], [False, True, False])
+        self.assertAlmostEqual(comparisons[1].change, 0.25)
+        self.assertFalse(perf.compare(current, baseline, threshold=0.30)[1].regressed)
+
+    def test_main_exits_nonzero_on_regression(self):
+        """Test the exit status of --compare against a much faster baseline."""
+        # A baseline far faster than anything real makes every run a regression.
+        with open(self.path, 'w') as f:
+            json.dump(perf.to_json([result('is_board_full', 0.001)]), f)
+        args = ['-k', 'is_board_full', '--rounds', '2', '--round-time', '0']
+        with redirect_stdout(io.StringIO()) as out:
+            self.assertEqual(perf.main(args + ['--compare', self.path]), 1)
+            self.assertEqual(perf.main(args + ['--compare', self.path, '--threshold', '1e9']), 0)
+        self.assertIn('REGRESSED', out.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the perft node counter
+"""
+
+import unittest
+
+import perft
+from tic_tac_toe import TicTacToe
+
+
+# Nodes at each depth of the full 3x3 tree.
+STANDARD_NODES = [1, 9, 72, 504, 3024, 15120, 54720, 148176, 200448, 127872]
+
+
+class TestPerft(unittest.TestCase):
+    """Test cases for perft counts, splitting and game restoration."""
+
+    def test_full_tree_known_totals(self):
+        """Test the full 3x3 tree, root moves split across processes."""
+        result = perft.perft(TicTacToe(), workers=2)
+        self.assertEqual(result.games, perft.STANDARD_GAMES)
+        self.assertEqual(result.positions, perft.STANDARD_POSITIONS)
+        self.assertEqual([c.nodes for c in result.depths], STANDARD_NODES)
+        self.assertEqual(sum(c.x_wins for c in result.depths), 131184)
+        self.assertEqual(sum(c.o_wins for c in result.depths), 77904)
+        self.assertEqual(result.depths[9].draws, 46080)
+        self.assertGreater(result.nodes_per_sec, 0)
+
+    def test_depth_limit_matches_split(self):
+        """Test that a depth-limited count is the same split or not."""
+        serial = perft.perft(TicTacToe(), depth=5)
+        split = perft.perft(TicTacToe(), depth=5, workers=2)
+        self.assertEqual(serial.depths, split.depths)
+        self.assertEqual(serial.positions, split.positions)
+        self.assertEqual([c.nodes for c in serial.depths], STANDARD_NODES[:6])
+        self.assertEqual(serial.depths[5].x_wins, 1440)
+
+    def test_from_position_leaves_game_unchanged(self):
+        """Test counting from a position and restoring the game."""
+        game = TicTacToe()
+        for row, col in [(1, 1), (0, 0), (0, 2)]:
+            game.make_move(row, col)
+            game.switch_player()
+        board = [row[:] for row in game.board]
+        result = perft.perft(game)
+        self.assertEqual(result.depths[0].nodes, 1)
+        self.assertEqual(result.depths[1].nodes, 6)
+        self.assertEqual(game.board, board)
+        self.assertEqual(game.moves, [4, 0, 2])
+        self.assertEqual(game.current_player, 'O')
+
+    def test_finished_game_is_one_terminal_node(self):
+        """Test that a finished game counts as one terminal node."""
+        game = TicTacToe()
+        game.board = [['X', 'X', 'X'], ['O', 'O', ' '], [' ', ' ', ' ']]
+        result = perft.perft(game, workers=2, distinct=False)
+        self.assertEqual([(c.nodes, c.x_wins) for c in result.depths[:1]], [(1, 1)])
+        self.assertEqual(result.nodes, 1)
+        self.assertIsNone(result.positions)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the headless move policies
+"""
+
+import random
+import unittest
+
+import policies
+from tic_tac_toe import TicTacToe
+
+
+class TestPolicies(unittest.TestCase):
+    """Test cases for the built-in move policies."""
+
+    def setUp(self):
+        self.game = TicTacToe()
+        self.rng = random.Random(0)
+
+    def test_every_policy_returns_a_legal_move(self):
+        """Test each registered policy on a part-played board."""
+        self.game.board = [['X', 'O', ' '], [' ', 'X', ' '], [' ', ' ', 'O']]
+        for name, policy in policies.POLICIES.items():
+            with self.subTest(policy=name):
+                row, col = policy(self.game, self.rng)
+                self.assertTrue(self.game.is_valid_move(row, col))
+
+    def test_heuristic_wins_then_blocks(self):
+        """Test the heuristic's win and block priorities."""
+        self.game.board = [['X', 'X', ' '], ['O', 'O', ' '], [' ', ' ', ' ']]
+        self.assertEqual(policies.heuristic_policy(self.game, self.rng), (0, 2))
+        self.game.current_player = 'O'
+        self.assertEqual(policies.heuristic_policy(self.game, self.rng), (1, 2))
+        self.game.board = [['X', 'X', ' '], [' ', ' ', ' '], [' ', ' ', ' ']]
+        self.assertEqual(policies.heuristic_policy(self.game, self.rng), (0, 2))
+
+    def test_heuristic_prefers_center(self):
+        """Test the heuristic's opening move."""
+        self.assertEqual(policies.heuristic_policy(self.game, self.rng), (1, 1))
+
+    def test_registry(self):
+        """Test registering and looking up policies by name."""
+        self.assertIs(policies.get_policy('random'), policies.random_policy)
+        policies.register_policy('first', lambda game, rng: game.available_moves()[0])
+        try:
+            self.assertEqual(policies.get_policy('first')(self.game, self.rng), (0, 0))
+        finally:
+            del policies.POLICIES['first']
+        with self.assertRaises(ValueError):
+            policies.get_policy('nope')
+
+
+if __name__ == '__main__':
+    unittest.main()
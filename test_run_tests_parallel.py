@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the parallel and incremental test runner
+"""
+
+import glob
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import run_tests_parallel as runner
+
+try:
+    import coverage
+except ImportError:  # coverage is optional
+    coverage = None
+
+
+SAMPLE = {
+    'sample_core.py': '''
+        def add(a, b):
+            return a + b
+    ''',
+    'sample_cli.py': '''
+        def main():
+            import sample_core  # imported lazily, as the game's CLI does
+            return sample_core.add(1, 2)
+    ''',
+    'test_sample_core.py': '''
+        import unittest
+        import sample_core
+
+        class TestAdd(unittest.TestCase):
+            def test_add(self):
+                """A test that passes."""
+                self.assertEqual(sample_core.add(2, 2), 4)
+
+            def test_broken(self):
+                """A test that fails."""
+                self.assertEqual(sample_core.add(2, 2), 5)
+
+        class TestTiming(unittest.TestCase):
+            run_serially = True
+
+            def test_fast(self):
+                """A test in a class that must run serially."""
+                pass
+    ''',
+    'test_sample_cli.py': '''
+        import unittest
+        import sample_cli
+
+        class TestMain(unittest.TestCase):
+            def test_main(self):
+                """A test of a module that imports another lazily."""
+                self.assertEqual(sample_cli.main(), 3)
+    ''',
+    'test_sample_script.py': '''
+        import subprocess, sys, unittest
+
+        class TestScript(unittest.TestCase):
+            @unittest.skip("only referenced by name")
+            def test_runs(self):
+                """A test that names a script instead of importing it."""
+                subprocess.run([sys.executable, 'sample_script.py'], check=True)
+    ''',
+    'sample_script.py': '''
+        print("hello")
+    ''',
+}
+
+
+class TestParallelRunner(unittest.TestCase):
+    """Test cases for sharding, the import graph and changed-module selection."""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.root = self.dir.name
+        for name, source in SAMPLE.items():
+            Path(self.root, name).write_text(textwrap.dedent(source))
+
+    def tearDown(self):
+        # discover() imported the samples from (and added) the temporary dir.
+        for name in SAMPLE:
+            sys.modules.pop(name[:-3], None)
+        while self.root in sys.path:
+            sys.path.remove(self.root)
+        self.dir.cleanup()
+
+    def test_discover_classes(self):
+        """Test finding every test class and its run_serially flag."""
+        classes = runner.discover_classes(self.root)
+        self.assertEqual(classes, {
+            'test_sample_cli.TestMain': False,
+            'test_sample_core.TestAdd': False,
+            'test_sample_core.TestTiming': True,
+            'test_sample_script.TestScript': False,
+        })
+
+    def test_parallel_matches_serial(self):
+        """Test that one and two workers report the same results."""
+        classes = runner.discover_classes(self.root)
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                results = {r.name: r for r in runner.run_parallel(classes, workers, self.root)}
+                self.assertEqual(set(results), set(classes))
+                self.assertEqual(sum(r.tests_run for r in results.values()), 5)
+                self.assertEqual(sum(r.skipped for r in results.values()), 1)
+                failures = results['test_sample_core.TestAdd'].failures
+                self.assertEqual([test_id for test_id, _ in failures],
+                                 ['test_sample_core.TestAdd.test_broken'])
+                self.assertIn("AssertionError", failures[0][1])
+                self.assertTrue(results['test_sample_cli.TestMain'].ok)
+
+    def test_serial_classes_run_last(self):
+        """Test that run_serially classes run after the parallel ones."""
+        classes = runner.discover_classes(self.root)
+        names = [r.name for r in runner.run_parallel(classes, 2, self.root)]
+        self.assertEqual(names[-1], 'test_sample_core.TestTiming')
+
+    def test_affected_tests_follow_lazy_imports_and_scripts(self):
+        """Test selecting the classes a changed module can reach."""
+        classes = runner.discover_classes(self.root)
+        graph = runner.import_graph(self.root)
+        self.assertEqual(graph['sample_cli'], {'sample_core'})
+        self.assertEqual(graph['test_sample_script'], {'sample_script'})
+        selected = runner.select_affected(classes, {'sample_core'}, self.root)
+        self.assertEqual(set(selected), {'test_sample_cli.TestMain', 'test_sample_core.TestAdd',
+                                         'test_sample_core.TestTiming'})
+        selected = runner.select_affected(classes, {'sample_cli'}, self.root)
+        self.assertEqual(set(selected), {'test_sample_cli.TestMain'})
+        selected = runner.select_affected(classes, {'sample_script'}, self.root)
+        self.assertEqual(set(selected), {'test_sample_script.TestScript'})
+
+    def test_changed_modules_from_git(self):
+        """Test reading changed and untracked modules from git."""
+        def git(*args):
+            subprocess.run(['git', '-c', 'user.name=test', '-c', 'user.email=test@example.com',
+                            *args], cwd=self.root, check=True, capture_output=True)
+
+        git('init', '-q')
+        git('add', '.')
+        git('commit', '-q', '-m', 'sample')
+        self.assertEqual(runner.changed_modules('HEAD', self.root), set())
+        Path(self.root, 'sample_cli.py').write_text("def main():\n    return 3\n")
+        Path(self.root, 'sample_new.py').write_text("")
+        Path(self.root, 'notes.txt').write_text("not a module")
+        self.assertEqual(runner.changed_modules('HEAD', self.root), {'sample_cli', 'sample_new'})
+
+    @unittest.skipIf(coverage is None, "coverage is not installed")
+    def test_coverage_data_file_per_shard(self):
+        """Test that every shard writes its own coverage data file."""
+        data_file = os.path.join(self.root, '.coverage')
+        rcfile = os.path.join(self.root, '.coveragerc')
+        Path(rcfile).write_text(f"[run]\nsource = {self.root}\n")
+        classes = runner.discover_classes(self.root)
+        with mock.patch.dict(os.environ, {'COVERAGE_RCFILE': rcfile}):
+            list(runner.run_parallel(classes, 2, self.root, coverage_file=data_file))
+        self.assertEqual(len(glob.glob(data_file + '.*')), len(classes))
+        cov = coverage.Coverage(data_file=data_file)
+        cov.combine()
+        measured = {Path(name).name for name in cov.get_data().measured_files()}
+        self.assertIn('sample_core.py', measured)
+
+
+if __name__ == '__main__':
+    unittest.main()
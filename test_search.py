@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the iterative-deepening alpha-beta search
+"""
+
+import random
+import unittest
+
+import openings
+import policies
+import search
+from search import AlphaBeta, AlphaBetaPolicy
+from simulate import play_headless
+from tic_tac_toe import TicTacToe
+
+
+class TestAlphaBeta(unittest.TestCase):
+    """Test cases for the AlphaBeta class and its policy wrapper."""
+
+    # Keep run_tests_parallel.py from timing the deadline tests next to other busy workers.
+    run_serially = True
+
+    def test_takes_the_win_and_blocks(self):
+        """Test the two obvious tactical moves."""
+        game = TicTacToe()
+        game.board = [['X', 'X', ' '], ['O', 'O', ' '], [' ', ' ', ' ']]
+        self.assertEqual(AlphaBeta().search(game), (0, 2))
+        game.board = [['X', ' ', ' '], ['O', 'O', ' '], [' ', ' ', 'X']]
+        self.assertEqual(AlphaBeta().search(game), (1, 2))
+
+    def test_full_search_of_empty_board_is_a_draw(self):
+        """Test that a full search of the empty board scores a draw."""
+        game = TicTacToe()
+        searcher = AlphaBeta()
+        searcher.search(game)
+        stats = searcher.stats
+        self.assertEqual(stats.score, 0)
+        self.assertEqual(stats.depth, 9)
+        self.assertEqual(len(stats.pv), 9)
+        self.assertFalse(stats.timed_out)
+        self.assertGreater(stats.nodes, 0)
+        self.assertLess(stats.searched_moves, stats.legal_moves)
+        self.assertGreater(stats.branching_reduction, 0)
+        self.assertEqual(game.moves, [])
+        self.assertEqual(game.current_player, 'X')
+
+    def test_forced_win_found_and_scored(self):
+        """Test finding a forced win and scoring it as a win."""
+        # X must block at 3 1, which forks the first column and the bottom row:
+        # X moves, O blocks one line, X completes the other.
+        game = TicTacToe()
+        game.board = [['X', ' ', 'O'], [' ', 'O', ' '], [' ', ' ', 'X']]
+        searcher = AlphaBeta()
+        self.assertEqual(searcher.search(game), (2, 0))
+        self.assertGreater(searcher.stats.score, search.WIN - search.MAX_PLY)
+        self.assertEqual(len(searcher.stats.pv), 3)
+
+    def test_never_loses_to_random(self):
+        """Test that the policy never loses to random play."""
+        rng = random.Random(5)
+        player = AlphaBetaPolicy(use_book=False)
+        for i in range(10):
+            if i % 2:
+                record = play_headless(policies.random_policy, player, rng)
+                self.assertNotEqual(record.winner, 'X')
+            else:
+                record = play_headless(player, policies.random_policy, rng)
+                self.assertNotEqual(record.winner, 'O')
+
+    def test_deadline_on_large_board(self):
+        """Test stopping at the deadline on a 15x15 board."""
+        game = TicTacToe(15, 5)
+        for row, col in [(7, 7), (6, 7), (7, 8)]:
+            game.make_move(row, col)
+            game.switch_player()
+        searcher = AlphaBeta(time_limit=0.05)
+        row, col = searcher.search(game)
+        self.assertTrue(game.is_valid_move(row, col))
+        self.assertTrue(searcher.stats.timed_out)
+        self.assertEqual(game.moves, [112, 97, 113])
+        self.assertEqual(game.current_player, 'O')
+
+    def test_answer_even_when_time_is_already_up(self):
+        """Test that a search always returns a legal move."""
+        searcher = AlphaBeta(time_limit=1e-9)
+        game = TicTacToe(15, 5)
+        row, col = searcher.search(game)
+        self.assertTrue(game.is_valid_move(row, col))
+
+    def test_pluggable_evaluation(self):
+        """Test searching with a custom evaluation function."""
+        # A one-ply search plays wherever the evaluation likes best.
+        def prefer_corner(game):
+            mover_just_played = game.bitboard.o if game.current_player == 'X' else game.bitboard.x
+            return -1000 if mover_just_played >> 8 & 1 else 0
+
+        game = TicTacToe()
+        self.assertEqual(AlphaBeta(max_depth=1, evaluate=prefer_corner).search(game), (2, 2))
+        self.assertEqual(AlphaBeta(max_depth=1).search(game), (1, 1))
+
+    def test_policy_uses_the_book(self):
+        """Test that the policy plays from the opening book."""
+        game = TicTacToe()
+        rng = random.Random(0)
+        ranked = openings.get_book().moves(game)
+        top = [move for move, score in ranked if score == ranked[0][1]]
+        self.assertIsInstance(policies.get_policy('alphabeta'), AlphaBetaPolicy)
+        policy = AlphaBetaPolicy()
+        self.assertIn(policy(game, rng), top)
+        self.assertIsNone(policy.searcher)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the asyncio game server and its load generator
+"""
+
+import asyncio
+import threading
+import unittest
+from unittest import mock
+
+import loadgen
+import server
+
+
+class TestGameServer(unittest.TestCase):
+    """Test cases for the line protocol, without sockets."""
+
+    def setUp(self):
+        self.server = server.GameServer()
+        self.session = self.server.store.create()
+
+    def send(self, line):
+        reply, self.session = self.server.respond(self.session, line)
+        return reply
+
+    def test_moves_and_win(self):
+        """Test a game played to a win over the protocol."""
+        self.assertEqual(self.send('1 1'), f"OK {self.session} X........ TURN O")
+        for line in ('2 1', '1 2', '2 2'):
+            self.send(line)
+        self.assertEqual(self.send('1 3'), f"OK {self.session} XXXOO.... WIN X")
+        self.assertTrue(self.send('3 3').startswith('ERR Game over'))
+        self.assertEqual(self.send('new'), f"OK {self.session} ......... TURN X")
+
+    def test_errors_use_the_input_grammar(self):
+        """Test that bad input gets get_player_input's messages."""
+        self.assertEqual(self.send('9 9'), "ERR Please enter numbers between 1 and 3")
+        self.send('1 1')
+        self.assertEqual(self.send('1 1'), "ERR That position is already taken! Choose another.")
+
+    def test_attach_and_quit(self):
+        """Test switching sessions and ending one."""
+        other = self.server.store.create()
+        self.assertTrue(self.send(f'attach {other}').startswith(f"OK {other} "))
+        self.assertEqual(self.session, other)
+        self.assertTrue(self.send('attach 999').startswith('ERR No session'))
+        self.assertEqual(self.send('quit'), 'BYE')
+        self.assertIsNone(self.session)
+        self.assertIsNone(self.server.store.get(other))
+
+    def test_session_ended_from_another_connection(self):
+        """Test that a session dropped elsewhere gets an error, not an exception."""
+        other = self.server.store.create()
+        self.send(f'attach {other}')
+        self.server.respond(other, 'quit')
+        self.assertEqual(self.send('1 1'), f"ERR No session {other}; send 'new' to start one")
+        self.assertTrue(self.send('board').startswith('ERR No session'))
+        self.assertTrue(self.send('ai').startswith('ERR No session'))
+        reply = self.send('new')
+        self.assertNotEqual(self.session, other)
+        self.assertEqual(reply, f"OK {self.session} ......... TURN X")
+
+    def test_idle_sessions_expire(self):
+        """Test that only sessions unused for idle_timeout are dropped."""
+        now = [0.0]
+        store = server.SessionStore(idle_timeout=10, clock=lambda: now[0])
+        idle, busy = store.create(), store.create()
+        now[0] = 8
+        store.get(busy)
+        now[0] = 15
+        self.assertEqual(store.expire(), 1)
+        self.assertIsNone(store.get(idle))
+        self.assertIsNotNone(store.get(busy))
+        self.assertEqual(len(store.pool), 1)
+        self.assertEqual(server.SessionStore(idle_timeout=None).expire(), 0)
+
+    def test_ai_moves_through_the_cache(self):
+        """Test that ai plays the policy's move and shares it across sessions."""
+        self.server = server.GameServer(policy='heuristic')
+        self.session = self.server.store.create()
+        for line in ('1 1', '2 1', '1 2'):
+            self.send(line)
+        self.assertEqual(self.send('ai'), f"OK {self.session} XXOO..... TURN X")
+        # The mirror image of that position in another session hits the cache.
+        self.session = self.server.store.create()
+        for line in ('1 3', '2 3', '1 2'):
+            self.send(line)
+        self.assertEqual(self.send('ai'), f"OK {self.session} OXX..O... TURN X")
+        self.assertEqual((self.server.cache.hits, self.server.cache.misses), (1, 1))
+
+
+    def test_alphabeta_plays_a_full_game(self):
+        """Test that the alphabeta policy can play both sides to the end."""
+        self.server = server.GameServer(policy='alphabeta')
+        self.session = self.server.store.create()
+        for _ in range(9):
+            reply = self.send('ai')
+            self.assertTrue(reply.startswith('OK '), reply)
+        self.assertTrue(reply.endswith(' DRAW'), reply)
+
+
+class TestServerSockets(unittest.IsolatedAsyncioTestCase):
+    """End-to-end tests over a localhost socket."""
+
+    async def asyncSetUp(self):
+        self.game_server = server.GameServer()
+        self.listener = await server.serve('127.0.0.1', 0, self.game_server)
+        self.port = self.listener.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.listener.close()
+        await self.listener.wait_closed()
+
+    async def test_session_survives_reconnect(self):
+        """Test that a session can be resumed from a new connection."""
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+        session = (await reader.readline()).decode().split()[1]
+        writer.write(b"2 2\n")
+        await reader.readline()
+        writer.close()
+
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+        await reader.readline()
+        writer.write(f"attach {session}\n".encode())
+        reply = (await reader.readline()).decode().strip()
+        self.assertEqual(reply, f"OK {session} ....X.... TURN O")
+        writer.write(b"quit\n")
+        self.assertEqual((await reader.readline()).decode().strip(), "BYE")
+        writer.close()
+
+    async def test_unexpected_error_closes_only_that_connection(self):
+        """Test that an exception in respond is logged and the server keeps serving."""
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+        await reader.readline()
+        with mock.patch.object(self.game_server, 'respond', side_effect=RuntimeError("boom")), \
+                self.assertLogs('server', 'ERROR'):
+            writer.write(b"1 1\n")
+            self.assertEqual(await reader.readline(), b"")
+        writer.close()
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+        self.assertTrue((await reader.readline()).startswith(b"OK "))
+        writer.close()
+
+    async def test_slow_ai_does_not_block_other_connections(self):
+        """Test that an ai search runs off the event loop."""
+        release = threading.Event()
+
+        def slow_policy(game, rng):
+            release.wait(5)
+            return game.available_moves()[0]
+
+        self.game_server.policy = slow_policy
+        thinker_reader, thinker = await asyncio.open_connection('127.0.0.1', self.port)
+        await thinker_reader.readline()
+        thinker.write(b"ai\n")
+        await thinker.drain()
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+        await reader.readline()
+        writer.write(b"2 2\n")
+        reply = await asyncio.wait_for(reader.readline(), 2)
+        self.assertTrue(reply.endswith(b"....X.... TURN O\n"))
+        release.set()
+        reply = await asyncio.wait_for(thinker_reader.readline(), 5)
+        self.assertTrue(reply.endswith(b"X........ TURN O\n"))
+        for stream in (thinker, writer):
+            stream.close()
+
+    async def test_ai_reply_when_position_changed(self):
+        """Test that an ai move is dropped if the session moved meanwhile."""
+        session = self.game_server.store.create()
+
+        def policy(game, rng):
+            self.game_server.respond(session, '3 3')
+            return game.available_moves()[0]
+
+        self.game_server.policy = policy
+        reply, _ = await self.game_server.respond_async(session, 'ai')
+        self.assertEqual(reply, "ERR Position changed; try again")
+        self.assertEqual(self.game_server.state(session), f"OK {session} ........X TURN O")
+
+    async def test_load_generator(self):
+        """Test a short load run against the server."""
+        stats = await loadgen.run_load('127.0.0.1', self.port, clients=5, moves=20)
+        self.assertEqual(stats['requests'], 100)
+        self.assertGreaterEqual(self.game_server.moves, 50)
+        self.assertGreater(stats['p99_ms'], 0)
+
+
+class TestPercentile(unittest.TestCase):
+    """Test cases for the latency percentile helper."""
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles, including an empty sample."""
+        samples = list(range(1, 101))
+        self.assertEqual(loadgen.percentile(samples, 0.99), 99)
+        self.assertEqual(loadgen.percentile(samples, 0.5), 50)
+        self.assertEqual(loadgen.percentile([], 0.5), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
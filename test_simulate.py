@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the headless simulation runner
+"""
+
+import random
+import unittest
+from concurrent.futures import Future
+from unittest import mock
+
+import simulate
+from policies import random_policy
+
+
+class TestSimulate(unittest.TestCase):
+    """Test cases for headless play and the sharded simulation runner."""
+
+    def test_play_headless(self):
+        """Test that a headless game ends with a consistent record."""
+        record = simulate.play_headless(random_policy, random_policy, random.Random(1))
+        self.assertGreaterEqual(len(record.moves), 5)
+        self.assertEqual(len(set(record.moves)), len(record.moves))
+        self.assertIn(record.winner, ('X', 'O', None))
+
+    def test_illegal_policy_move(self):
+        """Test that a policy choosing an occupied cell is reported."""
+        with self.assertRaises(ValueError):
+            simulate.play_headless(lambda game, rng: (0, 0), random_policy, random.Random(0))
+
+    def test_solver_never_loses(self):
+        """Test perfect play against random play."""
+        stats = simulate.simulate(200, 'solver', 'random', seed=3)
+        self.assertEqual(stats.games, 200)
+        self.assertEqual(stats.o_wins, 0)
+        stats = simulate.simulate(50, 'solver', 'solver', seed=3)
+        self.assertEqual(stats.draws, 50)
+
+    def test_deterministic_for_seed_and_workers(self):
+        """Test that repeated runs give the same records."""
+        first = list(simulate.iter_chunks(300, 'random', 'heuristic', seed=7, workers=2, chunk_size=64))
+        second = list(simulate.iter_chunks(300, 'random', 'heuristic', seed=7, workers=2, chunk_size=64))
+        self.assertEqual(first, second)
+        self.assertEqual(sum(len(chunk) for chunk in first), 300)
+        other = list(simulate.iter_chunks(300, 'random', 'heuristic', seed=8, workers=2, chunk_size=64))
+        self.assertNotEqual(first, other)
+
+    def test_bounded_chunks_in_flight(self):
+        """Test that at most 2 * workers chunks are submitted ahead of the consumer."""
+        submitted = []
+
+        class FakePool:
+            def __init__(self, max_workers):
+                pass
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc_info):
+                return False
+
+            def submit(self, fn, *args):
+                future = Future()
+                future.set_result(fn(*args))
+                submitted.append(future)
+                return future
+
+        with mock.patch.object(simulate, 'ProcessPoolExecutor', FakePool):
+            chunks = simulate.iter_chunks(100, 'random', 'random', workers=2, chunk_size=5)
+            next(chunks)
+            self.assertEqual(len(submitted), 4)
+            self.assertEqual(sum(len(chunk) for chunk in chunks), 95)
+        self.assertEqual(len(submitted), 20)
+
+    def test_plan_splits_games(self):
+        """Test sharding of games into per-worker chunks."""
+        tasks = list(simulate._plan(10, 3, 2))
+        self.assertEqual(sum(count for _, _, count in tasks), 10)
+        self.assertEqual({shard for shard, _, _ in tasks}, {0, 1, 2})
+        self.assertTrue(all(count <= 2 for _, _, count in tasks))
+
+    def test_stats_merge(self):
+        """Test adding records and merging statistics."""
+        a = simulate.SimulationStats()
+        a.add(simulate.GameRecord((0, 3, 1, 4, 2), 'X'))
+        b = simulate.SimulationStats()
+        b.add(simulate.GameRecord(tuple(range(9)), None))
+        a.merge(b)
+        self.assertEqual((a.games, a.x_wins, a.o_wins, a.draws, a.moves), (2, 1, 0, 1, 14))
+        self.assertIn('2 games', a.summary())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the perfect-play solver
+"""
+
+import unittest
+from functools import lru_cache
+
+from bitboard import FULL_MASK, WINNING, canonical
+from solver import DRAW, LOSS, WIN, Solver, best_move, best_moves, solve
+from tic_tac_toe import TicTacToe
+
+
+@lru_cache(maxsize=None)
+def plain_minimax(me, opp):
+    """Reference value without pruning or symmetry."""
+    if WINNING[opp]:
+        return LOSS
+    if me | opp == FULL_MASK:
+        return DRAW
+    return max(-plain_minimax(opp, me | 1 << cell)
+               for cell in range(9) if not (me | opp) >> cell & 1)
+
+
+def reachable_positions():
+    """Every (me, opp) position reachable in legal play, side to move first."""
+    seen = set()
+    stack = [(0, 0)]
+    while stack:
+        me, opp = stack.pop()
+        if (me, opp) in seen:
+            continue
+        seen.add((me, opp))
+        if WINNING[opp] or me | opp == FULL_MASK:
+            continue
+        for cell in range(9):
+            if not (me | opp) >> cell & 1:
+                stack.append((opp, me | 1 << cell))
+    return seen
+
+
+class TestSolver(unittest.TestCase):
+    """Test cases for the Solver class and its game helpers."""
+
+    def test_empty_board_is_a_draw(self):
+        """Test the value of the opening position."""
+        self.assertEqual(Solver().value(0, 0), DRAW)
+        self.assertEqual(solve(TicTacToe()), DRAW)
+
+    def test_values_match_plain_minimax(self):
+        """Test every reachable position against an unpruned search."""
+        solver = Solver()
+        positions = reachable_positions()
+        self.assertEqual(len(positions), 5478)
+        for me, opp in positions:
+            self.assertEqual(solver.value(me, opp), plain_minimax(me, opp))
+
+    def test_table_is_symmetry_reduced(self):
+        """Test the table holds at most one entry per canonical position."""
+        solver = Solver()
+        for me, opp in reachable_positions():
+            solver.value(me, opp)
+        canonical_keys = {canonical(me, opp)[0] for me, opp in reachable_positions()}
+        self.assertEqual(len(canonical_keys), 765)
+        self.assertLessEqual(len(solver.table), 765)
+        self.assertTrue(set(solver.table) <= canonical_keys)
+
+    def test_repeat_queries_hit_the_table(self):
+        """Test that a second query does no search."""
+        solver = Solver()
+        solver.best_cells(0, 0)
+        nodes = solver.nodes
+        solver.best_cells(0, 0)
+        # One probe per legal move, each answered by the table.
+        self.assertEqual(solver.nodes - nodes, 9)
+
+    def test_best_moves_finds_the_win(self):
+        """Test that a win in one is the only optimal move."""
+        game = TicTacToe()
+        game.board = [['X', 'X', ' '], ['O', 'O', ' '], [' ', ' ', ' ']]
+        self.assertEqual(solve(game), WIN)
+        self.assertEqual(best_moves(game), [(0, 2)])
+
+    def test_best_moves_blocks(self):
+        """Test that the side to move blocks an open line."""
+        game = TicTacToe()
+        game.board = [['X', 'X', ' '], [' ', 'O', ' '], [' ', ' ', ' ']]
+        game.current_player = 'O'
+        self.assertEqual(best_moves(game), [(0, 2)])
+
+    def test_finished_game_has_no_moves(self):
+        """Test that a won position offers no moves."""
+        game = TicTacToe()
+        game.board = [['X', 'X', 'X'], ['O', 'O', ' '], [' ', ' ', ' ']]
+        game.current_player = 'O'
+        self.assertEqual(solve(game), LOSS)
+        self.assertIsNone(best_move(game))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Startup-time regression tests for the tic_tac_toe module
+"""
+
+import statistics
+import unittest
+
+import bench_startup
+
+
+class TestStartup(unittest.TestCase):
+    """Test import time and first-prompt latency against their budgets."""
+
+    # Keep run_tests_parallel.py from timing these next to other busy workers.
+    run_serially = True
+
+    def test_no_heavy_imports(self):
+        """Test that importing the game loads none of the optional subsystems."""
+        heavy = bench_startup.loaded_modules() & set(bench_startup.HEAVY_MODULES)
+        self.assertEqual(heavy, set())
+
+    def test_import_time(self):
+        """Test cold and warm "import tic_tac_toe" times."""
+        for mode, budget in bench_startup.IMPORT_BUDGET_MS.items():
+            with self.subTest(mode=mode):
+                median = statistics.median(bench_startup.import_times_ms(mode == 'warm', runs=3))
+                self.assertLess(median, budget)
+
+    def test_first_prompt_latency(self):
+        """Test the time from spawning the game to its first move prompt."""
+        median = statistics.median(bench_startup.first_prompt_ms(runs=3))
+        self.assertLess(median, bench_startup.FIRST_PROMPT_BUDGET_MS)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -77,6 +77,95 @@ class TestTicTacToe(unittest.TestCase):
         self.assertFalse(self.game.make_move(3, 0))
         self.assertFalse(self.game.make_move(0, 3))
     
+    def test_available_moves(self):
+        """Test listing the empty cells."""
+        self.assertEqual(len(self.game.available_moves()), 9)
+        self.game.make_move(1, 1)
+        self.game.board[0][0] = 'O'
+        moves = self.game.available_moves()
+        self.assertEqual(len(moves), 7)
+        self.assertNotIn((1, 1), moves)
+        self.assertNotIn((0, 0), moves)
+    
+    def test_reset(self):
+        """Test reusing a game object for a new game."""
+        board = self.game.board
+        self.game.make_move(0, 0)
+        self.game.switch_player()
+        self.game.game_over = True
+        self.game.winner = 'X'
+        self.game.reset()
+        self.assertEqual(board[0][0], ' ')
+        self.assertTrue(self.game.is_valid_move(0, 0))
+        self.assertEqual(self.game.current_player, 'X')
+        self.assertFalse(self.game.game_over)
+        self.assertIsNone(self.game.winner)
+        self.assertEqual(self.game.moves, [])
+    
+    def test_move_history(self):
+        """Test that successful moves are recorded as cell indices."""
+        self.game.make_move(1, 1)
+        self.game.switch_player()
+        self.assertFalse(self.game.make_move(1, 1))
+        self.game.make_move(2, 0)
+        self.assertEqual(self.game.moves, [4, 6])
+    
+    def test_unmake_move_restores_state(self):
+        """Test taking back a winning move after play_game-style bookkeeping."""
+        for row, col in [(0, 0), (1, 0), (0, 1), (1, 1)]:
+            self.game.make_move(row, col)
+            self.game.switch_player()
+        before = (self.game.zobrist_hash, self.game.current_player, self.game.bitboard.x)
+        board = self.game.board
+        self.game.make_move(0, 2)
+        self.assertEqual(self.game.check_winner(), 'X')
+        self.game.game_over = True
+        self.game.winner = 'X'
+        self.assertEqual(self.game.unmake_move(), (0, 2))
+        self.assertEqual((self.game.zobrist_hash, self.game.current_player,
+                          self.game.bitboard.x), before)
+        self.assertFalse(self.game.game_over)
+        self.assertIsNone(self.game.winner)
+        self.assertIsNone(self.game.check_winner())
+        self.assertEqual(board[0][2], ' ')
+        self.assertEqual(self.game.moves, [0, 3, 1, 4])
+    
+    def test_board_edits_clear_move_history(self):
+        """Test that editing the board drops history unmake_move can't replay."""
+        with self.assertRaises(ValueError):
+            self.game.unmake_move()
+        self.game.make_move(1, 1)
+        self.game.board[0][0] = 'O'
+        self.assertEqual(self.game.moves, [])
+        with self.assertRaises(ValueError):
+            self.game.unmake_move()
+        self.game.make_move(2, 2)
+        self.game.board = [['X', ' ', ' '], [' ', ' ', ' '], [' ', ' ', ' ']]
+        with self.assertRaises(ValueError):
+            self.game.unmake_move()
+        reference = TicTacToe()
+        reference.make_move(0, 0)
+        self.assertEqual(self.game.bitboard.x, 1)
+        self.assertEqual(self.game.zobrist_hash, reference.zobrist_hash)
+    
+    def test_make_unmake_tree_walk(self):
+        """Test a depth-first walk on one object returns it to the start."""
+        def walk(depth):
+            nodes = 1
+            if depth == 0 or self.game.check_winner():
+                return nodes
+            for row, col in self.game.available_moves():
+                self.game.make_move(row, col)
+                self.game.switch_player()
+                nodes += walk(depth - 1)
+                self.game.unmake_move()
+            return nodes
+        self.assertEqual(walk(4), 1 + 9 + 9 * 8 + 9 * 8 * 7 + 9 * 8 * 7 * 6)
+        self.assertEqual(self.game.moves, [])
+        self.assertEqual(self.game.zobrist_hash, 0)
+        self.assertEqual(self.game.current_player, 'X')
+        self.assertEqual(self.game.board, [[' '] * 3 for _ in range(3)])
+    
     def test_switch_player(self):
         """Test player switching."""
         self.assertEqual(self.game.current_player, 'X')
@@ -156,6 +245,44 @@ class TestTicTacToe(unittest.TestCase):
         ]
         self.assertTrue(self.game.is_board_full())
     
+    def test_large_board_win_detection(self):
+        """Test a 15x15, five-in-a-row game."""
+        game = TicTacToe(size=15, win_length=5)
+        self.assertEqual(len(game.board), 15)
+        for i in range(4):
+            self.assertTrue(game.make_move(7, 3 + i))
+            self.assertIsNone(game.check_winner())
+            game.switch_player()
+            self.assertTrue(game.make_move(0, i))
+            game.switch_player()
+        self.assertTrue(game.make_move(7, 7))
+        self.assertEqual(game.check_winner(), 'X')
+        self.assertFalse(game.is_valid_move(15, 0))
+        self.assertTrue(game.is_valid_move(14, 14))
+    
+    def test_large_board_diagonal_and_edits(self):
+        """Test diagonal wins and direct edits on a 4x4 board."""
+        game = TicTacToe(size=4, win_length=3)
+        for i in range(3):
+            game.board[i + 1][3 - i] = 'O'
+        self.assertEqual(game.check_winner(), 'O')
+        game.board[2][2] = ' '
+        self.assertIsNone(game.check_winner())
+        self.assertFalse(game.is_board_full())
+    
+    def test_large_board_display_and_input(self):
+        """Test the board drawing and prompt range on a 4x4 board."""
+        game = TicTacToe(size=4)
+        with patch('builtins.print') as mock_print:
+            game.display_board()
+        mock_print.assert_any_call('\n   1   2   3   4')
+        mock_print.assert_any_call('1    |   |   |  ')
+        mock_print.assert_any_call('  ---------------')
+        with patch('builtins.input', side_effect=['5 1', '4 4']), \
+                patch('builtins.print') as mock_print:
+            self.assertEqual(game.get_player_input(), (3, 3))
+        mock_print.assert_any_call('Please enter numbers between 1 and 4')
+    
     def test_get_player_input_valid(self):
         """Test valid player input."""
         with patch('builtins.input', return_value='1 2'):
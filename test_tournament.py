@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the round-robin tournament runner
+"""
+
+import contextlib
+import io
+import unittest
+from unittest import mock
+
+import policies
+import tournament
+from tournament import SPRT, Pairing
+
+
+class CountingPolicy:
+    """Plays the first empty cell for its first few moves, then the last."""
+
+    def __init__(self):
+        self.moves = 0
+
+    def __call__(self, game, rng):
+        self.moves += 1
+        cells = game.available_moves()
+        return cells[0] if self.moves <= 3 else cells[-1]
+
+
+class TestSPRT(unittest.TestCase):
+    """Test cases for the sequential probability ratio test."""
+
+    def test_bounds_and_direction(self):
+        """Test the SPRT bounds and the sign of the log-likelihood ratio."""
+        sprt = SPRT(0, 50, 0.05, 0.05)
+        self.assertAlmostEqual(sprt.upper, 2.944, places=3)
+        self.assertAlmostEqual(sprt.lower, -2.944, places=3)
+        self.assertEqual(sprt.llr(0, 0, 0), 0)
+        self.assertGreater(sprt.llr(30, 10, 10), sprt.upper)
+        self.assertLess(sprt.llr(10, 10, 30), sprt.lower)
+
+    def test_pairing_decisions(self):
+        """Test each decision a pairing can reach."""
+        sprt = SPRT()
+        pairing = Pairing('a', 'b')
+        pairing.update(15, 5, 0, sprt)
+        self.assertEqual(pairing.decision, tournament.A_BETTER)
+        pairing = Pairing('a', 'b')
+        pairing.update(0, 5, 15, sprt)
+        self.assertEqual(pairing.decision, tournament.B_BETTER)
+        pairing = Pairing('a', 'b')
+        pairing.update(0, 2, 0, sprt)
+        self.assertEqual(pairing.decision, tournament.INCONCLUSIVE)
+        pairing.update(0, 58, 0, sprt)
+        self.assertEqual(pairing.decision, tournament.EQUAL)
+        self.assertEqual(pairing.elo(), (0.0, 0.0))
+
+
+class TestTournament(unittest.TestCase):
+    """Test cases for scheduling, early stopping and rating fits."""
+
+    def test_elo_helpers(self):
+        """Test the Elo conversion helpers."""
+        self.assertAlmostEqual(tournament.expected_score(0), 0.5)
+        self.assertAlmostEqual(tournament.elo_difference(tournament.expected_score(120)), 120)
+        self.assertEqual(tournament.elo_difference(1.0), float('inf'))
+
+    def test_fit_ratings_orders_and_centres(self):
+        """Test that fitted ratings are ordered by strength and centred on 0."""
+        pairings = [Pairing('strong', 'weak', wins=80, draws=10, losses=10),
+                    Pairing('middle', 'weak', wins=50, draws=20, losses=30),
+                    Pairing('strong', 'middle', wins=60, draws=20, losses=20)]
+        ratings = tournament.fit_ratings(pairings)
+        self.assertEqual([r.name for r in ratings], ['strong', 'middle', 'weak'])
+        self.assertAlmostEqual(sum(r.elo for r in ratings), 0, places=6)
+        self.assertTrue(all(0 < r.error < 200 for r in ratings))
+        self.assertEqual(ratings[0].games, 200)
+        self.assertAlmostEqual(ratings[0].score, 0.775)
+
+    def test_perfect_score_has_finite_rating(self):
+        """Test that a perfect score still gets a finite rating."""
+        ratings = tournament.fit_ratings([Pairing('a', 'b', wins=20)])
+        self.assertTrue(all(abs(r.elo) < 1000 for r in ratings))
+
+    def test_early_stop_and_pool_matches_serial(self):
+        """Test stopping early on a decided SPRT, in-process and on a pool."""
+        args = (['random', 'solver', 'heuristic'],)
+        options = dict(max_games=200, batch=5, seed=3)
+        serial = tournament.run_tournament(*args, **options)
+        pooled = tournament.run_tournament(*args, workers=2, **options)
+        self.assertEqual(serial.pairings, pooled.pairings)
+        by_name = {(p.a, p.b): p for p in serial.pairings}
+        random_solver = by_name['random', 'solver']
+        self.assertEqual(random_solver.decision, tournament.B_BETTER)
+        self.assertLess(random_solver.games, 200)
+        self.assertEqual(random_solver.wins, 0)
+        self.assertEqual(serial.ratings[-1].name, 'random')
+        self.assertEqual(serial.games, sum(p.games for p in serial.pairings))
+
+    def test_stateful_policy_starts_fresh_each_batch(self):
+        """Test that a policy's state does not carry over between batches or runs."""
+        policy = CountingPolicy()
+        policies.register_policy('counting', policy)
+        self.addCleanup(policies.POLICIES.pop, 'counting')
+        options = dict(max_games=8, batch=1, sprt=SPRT(0, 5))
+        first = tournament.run_tournament(['counting', 'heuristic'], **options)
+        second = tournament.run_tournament(['counting', 'heuristic'], **options)
+        self.assertEqual(first.pairings, second.pairings)
+        self.assertEqual(policy.moves, 0)
+
+    def test_max_games_caps_undecided_pairing(self):
+        """Test that max_games stops a pairing that never decides."""
+        # Two perfect players only ever draw.
+        result = tournament.run_tournament(['solver', 'alphabeta'], max_games=6, batch=2,
+                                           sprt=SPRT(0, 5))
+        pairing, = result.pairings
+        self.assertEqual(pairing.games, 6)
+        self.assertEqual(pairing.draws, 6)
+        self.assertEqual(pairing.decision, tournament.INCONCLUSIVE)
+
+    def test_unknown_policy_and_cli(self):
+        """Test rejecting unknown or repeated policies, and the CLI."""
+        with self.assertRaises(ValueError):
+            tournament.run_tournament(['random', 'nope'])
+        with self.assertRaises(ValueError):
+            tournament.run_tournament(['random', 'random'])
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out), \
+                mock.patch('builtins.input', side_effect=AssertionError("input called")):
+            self.assertEqual(tournament.main(['-p', 'random', 'heuristic', '--max-games', '20']), 0)
+        self.assertIn('random vs heuristic', out.getvalue())
+        self.assertIn('rank policy', out.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
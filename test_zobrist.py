@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Unit tests for Zobrist position hashing
+"""
+
+import random
+import unittest
+
+import oracle
+import zobrist
+from bitboard import BitBoard, canonical
+from tic_tac_toe import TicTacToe
+
+
+class TestZobrist(unittest.TestCase):
+    """Test cases for the incremental and canonical hashes."""
+
+    def test_no_collisions_over_reachable_positions(self):
+        """Test every reachable position hashes uniquely, and each symmetry class too."""
+        keys = zobrist.zobrist_keys(BitBoard().geometry)
+        hashes = {}
+        classes = {}
+        for x, o in oracle.reachable_positions().values():
+            packed = keys.packed(BitBoard(x, o))
+            hashes.setdefault(zobrist.position_hash(packed), set()).add((x, o))
+            classes.setdefault(zobrist.canonical_hash(packed), set()).add(canonical(x, o)[0])
+        self.assertEqual(len(hashes), 5478)
+        self.assertEqual(len(classes), 765)
+        self.assertTrue(all(len(keys) == 1 for keys in classes.values()))
+
+    def test_incremental_matches_scratch(self):
+        """Test make_move/unmake_move updates against a full recomputation."""
+        game = TicTacToe(5, 4)
+        keys = zobrist.zobrist_keys(game.bitboard.geometry)
+        rng = random.Random(4)
+        seen = [game.zobrist_hash]
+        for row, col in rng.sample(game.available_moves(), 12):
+            game.make_move(row, col)
+            game.switch_player()
+            self.assertEqual(game._zobrist, keys.packed(game.bitboard))
+            seen.append(game.zobrist_hash)
+        while game.moves:
+            seen.pop()
+            game.unmake_move()
+            self.assertEqual(game.zobrist_hash, seen[-1])
+        self.assertEqual(game.zobrist_hash, 0)
+
+    def test_symmetric_positions_share_canonical_hash(self):
+        """Test rotations/reflections agree on canonical_hash but not zobrist_hash."""
+        corner, other = TicTacToe(), TicTacToe()
+        corner.make_move(0, 0)
+        other.make_move(2, 2)
+        self.assertEqual(corner.canonical_hash, other.canonical_hash)
+        self.assertNotEqual(corner.zobrist_hash, other.zobrist_hash)
+        edge = TicTacToe()
+        edge.make_move(0, 1)
+        self.assertNotEqual(edge.canonical_hash, corner.canonical_hash)
+
+    def test_direct_edits_and_reset(self):
+        """Test that board edits rehash and reset clears the hash."""
+        game = TicTacToe()
+        game.make_move(1, 1)
+        moved = game.zobrist_hash
+        game.reset()
+        self.assertEqual(game.zobrist_hash, 0)
+        game.board[1][1] = 'X'
+        self.assertEqual(game.zobrist_hash, moved)
+        game.board = [[' '] * 3 for _ in range(3)]
+        self.assertEqual(game.zobrist_hash, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
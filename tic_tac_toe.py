@@ -4,65 +4,228 @@ Tic Tac Toe Game
 A simple command-line tic-tac-toe game for two players.
 """
 
+from __future__ import annotations
+
 import sys
-from typing import List, Optional, Tuple
+
+import zobrist
+from bitboard import BitBoard, board_geometry
+from game_io import (RENDERERS, ScriptedInput, TerminalInput, TerminalRenderer, board_lines,
+                     parse_move)
+from type_checking import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import List, Optional, Tuple
+
+
+class _BoardRow(list):
+    """One row of TicTacToe.board; item writes are mirrored into the bitboard."""
+
+    __slots__ = ('_game', '_row')
+
+    def __init__(self, game: 'TicTacToe', row: int, cells):
+        super().__init__(cells)
+        self._game = game
+        self._row = row
+
+    def __setitem__(self, col, value):
+        list.__setitem__(self, col, value)
+        self._game._sync_row(self._row)
+
+
+class _BoardView(list):
+    """List-of-lists view of a TicTacToe bitboard, kept in sync both ways."""
+
+    __slots__ = ('_game',)
+
+    def __init__(self, game: 'TicTacToe', rows: List[List[str]]):
+        super().__init__(_BoardRow(game, r, row) for r, row in enumerate(rows))
+        self._game = game
+
+    def __setitem__(self, index, value):
+        list.__setitem__(self, index, value)
+        for r, cells in enumerate(list(self)):
+            if type(cells) is not _BoardRow or cells._row != r:
+                list.__setitem__(self, r, _BoardRow(self._game, r, cells))
+            self._game._sync_row(r)
+
+
+# Marks check_winner's cache as stale after the board was edited directly.
+_UNSCANNED = object()
 
 
 class TicTacToe:
-    """A tic-tac-toe game implementation."""
+    """A tic-tac-toe game implementation.
+    
+    The board is size x size and win_length marks in a row (horizontally,
+    vertically or diagonally) win; the defaults are the classic 3 and 3.
+    """
+    
+    def __init__(self, size: int = 3, win_length: Optional[int] = None):
+        if win_length is None:
+            win_length = size
+        self._bits = BitBoard(geometry=board_geometry(size, win_length))
+        self._view = None
+        self._result = None
+        self._zobrist_keys = zobrist.zobrist_keys(self._bits.geometry)
+        # Packed Zobrist hashes of the position under all 8 symmetries.
+        self._zobrist = 0
+        self.size = size
+        self.win_length = win_length
+        self.current_player = 'X'
+        self.game_over = False
+        self.winner = None
+        # Cell indices (row * size + col) of every make_move, in play order.
+        self.moves: List[int] = []
+        # Three entries per move (cached result, game_over, winner as they
+        # were before it) so unmake_move can restore them without allocating.
+        self._undo: list = []
     
-    def __init__(self):
-        self.board = [[' ' for _ in range(3)] for _ in range(3)]
+    def reset(self) -> None:
+        """Clear the board and result so this object can host a new game."""
+        self._bits.x = self._bits.o = 0
+        if self._view is not None:
+            for row in self._view:
+                list.__setitem__(row, slice(None), [' '] * self.size)
+        self._result = None
+        self._zobrist = 0
         self.current_player = 'X'
         self.game_over = False
         self.winner = None
+        self.moves.clear()
+        self._undo.clear()
+    
+    @property
+    def board(self) -> List[List[str]]:
+        """The board as rows of ' '/'X'/'O' cells, backed by the bitboard."""
+        if self._view is None:
+            self._view = _BoardView(self, self._bits.rows())
+        return self._view
+    
+    @board.setter
+    def board(self, rows: List[List[str]]) -> None:
+        self._bits = BitBoard.from_rows(rows, self._bits.geometry)
+        self._view = _BoardView(self, rows)
+        self._result = _UNSCANNED
+        self._zobrist = self._zobrist_keys.packed(self._bits)
+        self._forget_history()
+    
+    @property
+    def bitboard(self) -> BitBoard:
+        """The underlying bitboard (read it, don't mutate it)."""
+        return self._bits
+    
+    @property
+    def zobrist_hash(self) -> int:
+        """64-bit Zobrist hash of the position, usable as a dict key."""
+        return self._zobrist & zobrist.MASK
+    
+    @property
+    def canonical_hash(self) -> int:
+        """64-bit hash shared by the position and its 7 symmetric images."""
+        return zobrist.canonical_hash(self._zobrist)
+    
+    def _sync_row(self, row: int) -> None:
+        """Copy one row of the list view back into the bitboard."""
+        cells = self._view[row]
+        for col in range(self.size):
+            self._bits.set_cell(row * self.size + col, cells[col])
+        self._result = _UNSCANNED
+        self._zobrist = self._zobrist_keys.packed(self._bits)
+        self._forget_history()
+    
+    def _forget_history(self) -> None:
+        """Drop the move history after a direct board edit.
+        
+        The recorded moves no longer lead to the edited position, so
+        unmake_move must not replay them against it.
+        """
+        self.moves.clear()
+        self._undo.clear()
     
     def display_board(self) -> None:
         """Display the current game board."""
-        print("\n   1   2   3")
-        for i, row in enumerate(self.board):
-            print(f"{i + 1}  {row[0]} | {row[1]} | {row[2]}")
-            if i < 2:
-                print("  -----------")
+        header, *lines = board_lines(self)
+        print("\n" + header)
+        for line in lines:
+            print(line)
         print()
     
     def is_valid_move(self, row: int, col: int) -> bool:
         """Check if a move is valid."""
-        return (0 <= row < 3 and 
-                0 <= col < 3 and 
-                self.board[row][col] == ' ')
+        bits = self._bits
+        size = self.size
+        return (0 <= row < size and 
+                0 <= col < size and 
+                not ((bits.x | bits.o) >> (row * size + col)) & 1)
+    
+    def available_moves(self) -> List[Tuple[int, int]]:
+        """List every empty (row, col) cell."""
+        return [divmod(cell, self.size) for cell in self._bits.legal_moves()]
     
     def make_move(self, row: int, col: int) -> bool:
         """Make a move on the board."""
         if self.is_valid_move(row, col):
-            self.board[row][col] = self.current_player
+            index = row * self.size + col
+            player = self.current_player
+            self._bits.play(index, player)
+            self.moves.append(index)
+            undo = self._undo
+            undo.append(self._result)
+            undo.append(self.game_over)
+            undo.append(self.winner)
+            keys = self._zobrist_keys
+            self._zobrist ^= (keys.x if player == 'X' else keys.o)[index]
+            if self._view is not None:
+                list.__setitem__(self._view[row], col, player)
+            # Only lines through the new mark can have been completed.
+            if self._result is None:
+                self._result = self._bits.wins_at(index)
             return True
         return False
     
+    def unmake_move(self) -> Tuple[int, int]:
+        """Take back the last make_move; return its (row, col).
+        
+        Restores the state from just before that make_move: the cell, the
+        hash, the player to move (the side whose mark is removed), game_over,
+        winner and the cached check_winner result.  Together with make_move
+        this lets a search walk the tree on one object.  Raises ValueError
+        when there is nothing to take back (no moves yet, or the board was
+        edited directly since).
+        """
+        if not self.moves:
+            raise ValueError("no move to take back")
+        index = self.moves.pop()
+        undo = self._undo
+        self.winner = undo.pop()
+        self.game_over = undo.pop()
+        self._result = undo.pop()
+        bits = self._bits
+        keys = self._zobrist_keys
+        if (bits.x >> index) & 1:
+            bits.x &= ~(1 << index)
+            self._zobrist ^= keys.x[index]
+            self.current_player = 'X'
+        else:
+            bits.o &= ~(1 << index)
+            self._zobrist ^= keys.o[index]
+            self.current_player = 'O'
+        row, col = divmod(index, self.size)
+        if self._view is not None:
+            list.__setitem__(self._view[row], col, ' ')
+        return row, col
+    
     def check_winner(self) -> Optional[str]:
         """Check if there's a winner."""
-        # Check rows
-        for row in self.board:
-            if row[0] == row[1] == row[2] != ' ':
-                return row[0]
-        
-        # Check columns
-        for col in range(3):
-            if self.board[0][col] == self.board[1][col] == self.board[2][col] != ' ':
-                return self.board[0][col]
-        
-        # Check diagonals
-        if self.board[0][0] == self.board[1][1] == self.board[2][2] != ' ':
-            return self.board[0][0]
-        
-        if self.board[0][2] == self.board[1][1] == self.board[2][0] != ' ':
-            return self.board[0][2]
-        
-        return None
+        result = self._result
+        if result is _UNSCANNED:
+            result = self._result = self._bits.winner()
+        return result
     
     def is_board_full(self) -> bool:
         """Check if the board is full."""
-        return all(cell != ' ' for row in self.board for cell in row)
+        return self._bits.is_full()
     
     def switch_player(self) -> None:
         """Switch to the other player."""
@@ -72,77 +235,123 @@ class TicTacToe:
         """Get valid input from the current player."""
         while True:
             try:
-                move = input(f"Player {self.current_player}, enter your move (row col): ").strip()
+                move = parse_move(
+                    input(f"Player {self.current_player}, enter your move (row col): "), self)
                 
-                if move.lower() in ['quit', 'exit', 'q']:
+                if move is None:
                     print("Thanks for playing!")
                     sys.exit(0)
                 
-                parts = move.split()
-                if len(parts) != 2:
-                    print("Please enter two numbers separated by a space (row col)")
-                    continue
-                
-                row, col = int(parts[0]) - 1, int(parts[1]) - 1
+                return move
                 
-                if not (0 <= row < 3 and 0 <= col < 3):
-                    print("Please enter numbers between 1 and 3")
-                    continue
-                
-                if not self.is_valid_move(row, col):
-                    print("That position is already taken! Choose another.")
-                    continue
-                
-                return row, col
-                
-            except ValueError:
-                print("Please enter valid numbers")
+            except ValueError as e:
+                print(str(e))
             except KeyboardInterrupt:
                 print("\nThanks for playing!")
                 sys.exit(0)
     
-    def play_game(self) -> None:
-        """Main game loop."""
-        print("🎮 Welcome to Tic Tac Toe! 🎮")
-        print("Enter moves as 'row col' (e.g., '1 2' for row 1, column 2)")
-        print("Type 'quit' to exit the game")
+    def play_game(self, renderer=None, source=None, log=None) -> None:
+        """Main game loop.
+        
+        renderer and source default to the terminal backends in game_io;
+        pass e.g. BufferedRenderer/NullRenderer and ScriptedInput instead.
+        A finished game's moves are appended to log (a gamelog.GameLogWriter)
+        when one is given.
+        """
+        renderer = renderer or TerminalRenderer()
+        source = source or TerminalInput()
+        renderer.message("🎮 Welcome to Tic Tac Toe! 🎮")
+        renderer.message("Enter moves as 'row col' (e.g., '1 2' for row 1, column 2)")
+        renderer.message("Type 'quit' to exit the game")
         
         while not self.game_over:
-            self.display_board()
+            renderer.render(self)
             
             # Get player move
-            row, col = self.get_player_input()
+            move = source.read_move(self)
+            if move is None:
+                renderer.message("Thanks for playing!")
+                return
+            row, col = move
             
             # Make the move
             if self.make_move(row, col):
                 # Check for winner
                 winner = self.check_winner()
                 if winner:
-                    self.display_board()
-                    print(f"🎉 Player {winner} wins! 🎉")
+                    renderer.render(self)
+                    renderer.message(f"🎉 Player {winner} wins! 🎉")
                     self.game_over = True
                     self.winner = winner
                 elif self.is_board_full():
-                    self.display_board()
-                    print("🤝 It's a tie! 🤝")
+                    renderer.render(self)
+                    renderer.message("🤝 It's a tie! 🤝")
                     self.game_over = True
                 else:
                     self.switch_player()
+                if self.game_over and log is not None:
+                    log.append_game(self)
             else:
-                print("Invalid move! Try again.")
+                renderer.message("Invalid move! Try again.")
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """Main function to run the game."""
+    # Imported here so that "import tic_tac_toe" stays cheap; see bench_startup.py.
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Command-line tic-tac-toe for two players.")
+    parser.add_argument('--script', metavar='FILE',
+                        help="play one game with moves read from FILE ('row col' per line)")
+    parser.add_argument('--renderer', choices=sorted(RENDERERS), default='terminal',
+                        help="how to draw the board (default: terminal)")
+    parser.add_argument('--size', type=int, default=3,
+                        help="board size N for an N x N game (default: 3)")
+    parser.add_argument('--win-length', type=int,
+                        help="marks in a row needed to win (default: the board size)")
+    parser.add_argument('--log', metavar='FILE',
+                        help="append every finished game to the binary game log FILE")
+    parser.add_argument('--serve', action='store_true',
+                        help="host games over TCP instead of playing in this terminal")
+    parser.add_argument('--host', default='127.0.0.1', help="address for --serve")
+    parser.add_argument('--port', type=int, default=7878, help="port for --serve")
+    args = parser.parse_args(argv)
+    
+    if args.serve:
+        # asyncio is only needed here, so keep it out of the normal startup path.
+        import server
+        server.run(args.host, args.port)
+        return
+    
+    renderer = RENDERERS[args.renderer]()
+    log = None
+    if args.log:
+        import gamelog
+        log = gamelog.GameLogWriter(args.log, args.size, args.win_length)
+    try:
+        _play_sessions(args, renderer, log)
+    finally:
+        if log is not None:
+            log.close()
+
+
+def _play_sessions(args, renderer, log) -> None:
+    """Play one scripted game, or interactive games until the players stop."""
+    if args.script:
+        game = TicTacToe(args.size, args.win_length)
+        game.play_game(renderer, ScriptedInput.from_file(args.script), log)
+        return
+    
+    game = TicTacToe(args.size, args.win_length)
     while True:
-        game = TicTacToe()
-        game.play_game()
+        game.play_game(renderer, log=log)
         
         # Ask if players want to play again
         while True:
             try:
                 play_again = input("\nWould you like to play again? (y/n): ").strip().lower()
                 if play_again in ['y', 'yes']:
+                    game.reset()
                     break
                 elif play_again in ['n', 'no']:
                     print("Thanks for playing! Goodbye! 👋")
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Round-robin tournament for Tic Tac Toe move policies
+Plays every pair of named policies headlessly with colours alternated,
+schedules the games in batches across worker processes, stops a pairing
+early once a sequential probability ratio test (SPRT) is decided and fits
+Elo ratings with confidence intervals to all the results.
+
+    python3 tournament.py
+    python3 tournament.py -p heuristic mcts alphabeta --max-games 400 --workers 4
+"""
+
+import argparse
+import copy
+import itertools
+import math
+import random
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from policies import POLICIES, get_policy
+from simulate import play_headless
+from tic_tac_toe import TicTacToe
+
+
+# z for a two-sided 95% confidence interval.
+Z95 = 1.959964
+
+# Per-game score variance never goes below this in the SPRT, so a run of
+# identical results (say, all draws between two perfect players) still has
+# to accumulate evidence over several batches.
+MIN_VARIANCE = 0.01
+
+A_BETTER, B_BETTER, EQUAL, INCONCLUSIVE = 'a>b', 'b>a', 'equal', 'inconclusive'
+
+
+def expected_score(elo: float) -> float:
+    """Expected score of a player rated elo points above its opponent."""
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def elo_difference(score: float) -> float:
+    """Elo difference implied by an expected score (infinite at 0 and 1)."""
+    if score <= 0:
+        return -math.inf
+    if score >= 1:
+        return math.inf
+    return -400 * math.log10(1 / score - 1)
+
+
+@dataclass(frozen=True)
+class SPRT:
+    """Test H0: elo = elo0 against H1: elo = elo1 at error rates alpha/beta."""
+
+    elo0: float = 0.0
+    elo1: float = 50.0
+    alpha: float = 0.05
+    beta: float = 0.05
+
+    @property
+    def lower(self) -> float:
+        """Accept H0 when the log-likelihood ratio falls to this."""
+        return math.log(self.beta / (1 - self.alpha))
+
+    @property
+    def upper(self) -> float:
+        """Accept H1 when the log-likelihood ratio rises to this."""
+        return math.log((1 - self.beta) / self.alpha)
+
+    def llr(self, wins: int, draws: int, losses: int) -> float:
+        """Approximate log-likelihood ratio of H1 over H0 for these results.
+
+        Uses the normal approximation to the trinomial (generalised SPRT):
+        N * (s1 - s0) * (2 * mean - s0 - s1) / (2 * variance), where s0 and
+        s1 are the expected scores under each hypothesis.
+        """
+        games = wins + draws + losses
+        if not games:
+            return 0.0
+        mean = (wins + 0.5 * draws) / games
+        variance = max((wins + 0.25 * draws) / games - mean * mean, MIN_VARIANCE)
+        s0, s1 = expected_score(self.elo0), expected_score(self.elo1)
+        return games * (s1 - s0) * (2 * mean - s0 - s1) / (2 * variance)
+
+
+@dataclass
+class Pairing:
+    """Results of one pair of policies, counted from a's point of view."""
+
+    a: str
+    b: str
+    wins: int = 0
+    draws: int = 0
+    losses: int = 0
+    # Log-likelihood ratios for "a stronger by elo1" and "b stronger by elo1".
+    llr_a: float = 0.0
+    llr_b: float = 0.0
+    decision: str = INCONCLUSIVE
+
+    @property
+    def games(self) -> int:
+        return self.wins + self.draws + self.losses
+
+    @property
+    def score(self) -> float:
+        return (self.wins + 0.5 * self.draws) / self.games if self.games else 0.5
+
+    def elo(self) -> Tuple[float, float]:
+        """(Elo difference of a over b, half-width of its 95% interval)."""
+        games = self.games
+        if not games:
+            return 0.0, math.inf
+        mean = self.score
+        deviation = math.sqrt(max((self.wins + 0.25 * self.draws) / games - mean * mean, 0.0)
+                              / games)
+        low = elo_difference(mean - Z95 * deviation)
+        high = elo_difference(mean + Z95 * deviation)
+        return elo_difference(mean), (high - low) / 2
+
+    def update(self, wins: int, draws: int, losses: int, sprt: SPRT) -> None:
+        """Add a batch of results and re-run both one-sided tests."""
+        self.wins += wins
+        self.draws += draws
+        self.losses += losses
+        self.llr_a = sprt.llr(self.wins, self.draws, self.losses)
+        self.llr_b = sprt.llr(self.losses, self.draws, self.wins)
+        if self.llr_a >= sprt.upper:
+            self.decision = A_BETTER
+        elif self.llr_b >= sprt.upper:
+            self.decision = B_BETTER
+        elif self.llr_a <= sprt.lower and self.llr_b <= sprt.lower:
+            self.decision = EQUAL
+        else:
+            self.decision = INCONCLUSIVE
+
+
+@dataclass
+class Rating:
+    """A policy's fitted Elo rating (mean 0) with its 95% interval half-width."""
+
+    name: str
+    elo: float
+    error: float
+    games: int
+    score: float
+
+
+@dataclass
+class TournamentResult:
+    pairings: List[Pairing]
+    ratings: List[Rating]
+    games: int
+    seconds: float
+
+
+def _play_batch(a: str, b: str, pairs: int, seed: int, pairing: int, batch: int,
+                size: int, win_length: Optional[int]) -> Tuple[int, int, int]:
+    """Worker entry point: play pairs games each way; return a's (W, D, L).
+
+    Plays with fresh copies of the registered policies, so a stateful one
+    (e.g. an MCTS keeping its tree) carries nothing over from whatever
+    batch this worker process ran before.
+    """
+    rng = random.Random(f"{seed}:{pairing}:{batch}")
+    policy_a, policy_b = copy.deepcopy(get_policy(a)), copy.deepcopy(get_policy(b))
+    wins = draws = losses = 0
+    for _ in range(pairs):
+        for a_plays in ('X', 'O'):
+            if a_plays == 'X':
+                record = play_headless(policy_a, policy_b, rng, TicTacToe(size, win_length))
+            else:
+                record = play_headless(policy_b, policy_a, rng, TicTacToe(size, win_length))
+            if record.winner is None:
+                draws += 1
+            elif record.winner == a_plays:
+                wins += 1
+            else:
+                losses += 1
+    return wins, draws, losses
+
+
+def fit_ratings(pairings: Sequence[Pairing], iterations: int = 1000) -> List[Rating]:
+    """Fit Elo ratings to every pairing's results, strongest first.
+
+    Maximum likelihood under the logistic Elo model (draws count as half a
+    win each way), found with Hunter's MM iteration.  Each player also gets
+    one virtual draw against a fixed 0-rated opponent so that a perfect or
+    zero score still has a finite rating.  Intervals come from the Fisher
+    information of each rating with the others held fixed.
+    """
+    names = sorted({p.a for p in pairings} | {p.b for p in pairings})
+    points = {name: 0.5 for name in names}
+    games: Dict[str, int] = {name: 0 for name in names}
+    # (i, j) -> games between them
+    played: Dict[Tuple[str, str], int] = {}
+    for p in pairings:
+        points[p.a] += p.wins + 0.5 * p.draws
+        points[p.b] += p.losses + 0.5 * p.draws
+        games[p.a] += p.games
+        games[p.b] += p.games
+        played[p.a, p.b] = played.get((p.a, p.b), 0) + p.games
+        played[p.b, p.a] = played.get((p.b, p.a), 0) + p.games
+
+    strength = {name: 1.0 for name in names}
+    for _ in range(iterations):
+        updated = {}
+        for i in names:
+            # The virtual opponent has strength 1 and one game against i.
+            denominator = 1 / (strength[i] + 1)
+            for j in names:
+                if j != i and played.get((i, j)):
+                    denominator += played[i, j] / (strength[i] + strength[j])
+            updated[i] = points[i] / denominator
+        strength = updated
+
+    scale = 400 / math.log(10)
+    elo = {name: scale * math.log(strength[name]) for name in names}
+    shift = sum(elo.values()) / len(names) if names else 0.0
+    ratings = []
+    for i in names:
+        information = 1.0 * _variance(elo[i], 0.0)
+        for j in names:
+            if j != i and played.get((i, j)):
+                information += played[i, j] * _variance(elo[i], elo[j])
+        error = Z95 * scale / math.sqrt(information) if information else math.inf
+        score = (points[i] - 0.5) / games[i] if games[i] else 0.5
+        ratings.append(Rating(i, elo[i] - shift, error, games[i], score))
+    ratings.sort(key=lambda r: -r.elo)
+    return ratings
+
+
+def _variance(elo_i: float, elo_j: float) -> float:
+    """p * (1 - p) for i's expected score against j."""
+    p = expected_score(elo_i - elo_j)
+    return p * (1 - p)
+
+
+def run_tournament(players: Sequence[str], max_games: int = 1000, batch: int = 10,
+                   sprt: SPRT = SPRT(), workers: int = 1, seed: int = 0,
+                   size: int = 3, win_length: Optional[int] = None) -> TournamentResult:
+    """Play a round robin between named policies and fit ratings.
+
+    Each pairing plays batches of batch games with each colour until its
+    SPRT is decided or it has played max_games games.  One batch per
+    pairing is in flight at a time and every batch starts from fresh
+    copies of the policies, so the results depend only on the arguments,
+    not on how the pool schedules work, unless a policy is bounded by
+    wall-clock time (alphabeta on boards it cannot search to the end).
+    With workers=1 everything runs in-process.
+    """
+    for name in players:
+        get_policy(name)
+    if len(set(players)) != len(players):
+        raise ValueError("each policy can only enter the tournament once")
+    pairings = [Pairing(a, b) for a, b in itertools.combinations(players, 2)]
+    start = time.perf_counter()
+
+    def task(index: int, number: int):
+        pairing = pairings[index]
+        pairs = min(batch, (max_games - pairing.games + 1) // 2)
+        return (pairing.a, pairing.b, pairs, seed, index, number, size, win_length)
+
+    def finished(pairing: Pairing) -> bool:
+        return pairing.decision != INCONCLUSIVE or pairing.games >= max_games
+
+    batches = [0] * len(pairings)
+    if workers == 1:
+        for index, pairing in enumerate(pairings):
+            while not finished(pairing):
+                pairing.update(*_play_batch(*task(index, batches[index])), sprt)
+                batches[index] += 1
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = {pool.submit(_play_batch, *task(index, 0)): index
+                       for index in range(len(pairings)) if max_games > 0}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    pairings[index].update(*future.result(), sprt)
+                    batches[index] += 1
+                    if not finished(pairings[index]):
+                        pending[pool.submit(_play_batch, *task(index, batches[index]))] = index
+
+    return TournamentResult(pairings, fit_ratings(pairings), sum(p.games for p in pairings),
+                            time.perf_counter() - start)
+
+
+def format_result(result: TournamentResult, sprt: SPRT) -> List[str]:
+    """Lines of the pairing and rating tables."""
+    lines = [f"{'pairing':<26} {'games':>6} {'W-D-L':>13} {'score':>6} "
+             f"{'elo diff':>15} {'decision':>12}"]
+    for p in result.pairings:
+        diff, error = p.elo()
+        lines.append(f"{p.a + ' vs ' + p.b:<26} {p.games:>6} "
+                     f"{f'{p.wins}-{p.draws}-{p.losses}':>13} {p.score:>6.1%} "
+                     f"{f'{diff:+.0f} ± {error:.0f}':>15} {p.decision:>12}")
+    lines.append(f"\nSPRT elo0={sprt.elo0:g} elo1={sprt.elo1:g} alpha={sprt.alpha:g} "
+                 f"beta={sprt.beta:g} (LLR bounds {sprt.lower:.2f}, {sprt.upper:.2f})\n")
+    lines.append(f"{'rank':>4} {'policy':<12} {'elo':>16} {'games':>6} {'score':>6}")
+    for rank, r in enumerate(result.ratings, start=1):
+        lines.append(f"{rank:>4} {r.name:<12} {f'{r.elo:+.0f} ± {r.error:.0f}':>16} "
+                     f"{r.games:>6} {r.score:>6.1%}")
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Round-robin tournament between move policies")
+    parser.add_argument('-p', '--policies', nargs='+', default=sorted(POLICIES),
+                        help="policies to play (default: all registered)")
+    parser.add_argument('--max-games', type=int, default=1000, help="games per pairing at most")
+    parser.add_argument('--batch', type=int, default=10,
+                        help="games with each colour per scheduled batch")
+    parser.add_argument('--elo0', type=float, default=0.0)
+    parser.add_argument('--elo1', type=float, default=50.0)
+    parser.add_argument('--alpha', type=float, default=0.05)
+    parser.add_argument('--beta', type=float, default=0.05)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--size', type=int, default=3)
+    parser.add_argument('--win-length', type=int)
+    args = parser.parse_args(argv)
+
+    sprt = SPRT(args.elo0, args.elo1, args.alpha, args.beta)
+    result = run_tournament(args.policies, args.max_games, args.batch, sprt, args.workers,
+                            args.seed, args.size, args.win_length)
+    for line in format_result(result, sprt):
+        print(line)
+    print(f"\n{result.games:,} games in {result.seconds:.1f}s with {args.workers} worker(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+"""
+TYPE_CHECKING without importing typing
+typing (with the re and enum modules it pulls in) used to be most of the
+import time of tic_tac_toe, bitboard, zobrist and game_io.  Their annotations
+are never evaluated (they use "from __future__ import annotations"), so only
+type checkers need the names, and they treat TYPE_CHECKING as true:
+
+    from type_checking import TYPE_CHECKING
+    if TYPE_CHECKING:
+        from typing import List, Optional
+"""
+
+TYPE_CHECKING = False
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Zobrist hashing for Tic Tac Toe positions
+Each (side, cell) pair has a fixed random 64-bit key and a position's hash is
+the XOR of the keys of its marks, so a move (or its undo) updates the hash
+with a single XOR.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+from bitboard import BitBoard, Geometry, board_symmetries, iter_bits
+from type_checking import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Tuple
+
+
+BITS = 64
+MASK = (1 << BITS) - 1
+SYMMETRY_COUNT = 8
+
+
+class ZobristKeys:
+    """Keys for one board size, packed for all 8 symmetries at once.
+
+    x[cell] and o[cell] are 8 * 64-bit integers: slot s (bits 64*s and up)
+    holds the key of the cell that symmetry s moves cell onto.  XOR-ing them
+    into a packed hash therefore keeps the hash of every symmetric image of
+    the position up to date together; slot 0 is the position's own hash and
+    the smallest slot is the hash of its canonical form.
+    """
+
+    __slots__ = ('size', 'x', 'o')
+
+    def __init__(self, size: int):
+        cells = size * size
+        numbers = _splitmix64(size)
+        base_x = [next(numbers) for _ in range(cells)]
+        base_o = [next(numbers) for _ in range(cells)]
+        perms = board_symmetries(size)
+        self.size = size
+        self.x: Tuple[int, ...] = tuple(
+            sum(base_x[perm[cell]] << (BITS * s) for s, perm in enumerate(perms))
+            for cell in range(cells))
+        self.o: Tuple[int, ...] = tuple(
+            sum(base_o[perm[cell]] << (BITS * s) for s, perm in enumerate(perms))
+            for cell in range(cells))
+
+    def packed(self, bits: BitBoard) -> int:
+        """Compute a board's packed hash from scratch."""
+        value = 0
+        for cell in iter_bits(bits.x):
+            value ^= self.x[cell]
+        for cell in iter_bits(bits.o):
+            value ^= self.o[cell]
+        return value
+
+
+def _splitmix64(seed: int):
+    """Yield SplitMix64 outputs for seed.
+
+    Keys only need to be well mixed and stable across runs and processes;
+    this avoids importing random on the game's startup path.
+    """
+    state = seed
+    while True:
+        state = (state + 0x9e3779b97f4a7c15) & MASK
+        z = state
+        z = ((z ^ (z >> 30)) * 0xbf58476d1ce4e5b9) & MASK
+        z = ((z ^ (z >> 27)) * 0x94d049bb133111eb) & MASK
+        yield z ^ (z >> 31)
+
+
+@lru_cache(maxsize=None)
+def _keys_for_size(size: int) -> ZobristKeys:
+    return ZobristKeys(size)
+
+
+def zobrist_keys(geometry: Geometry) -> ZobristKeys:
+    """Return the shared keys for a board geometry (they depend on size only)."""
+    return _keys_for_size(geometry.size)
+
+
+def position_hash(packed: int) -> int:
+    """The 64-bit hash of the position itself."""
+    return packed & MASK
+
+
+def canonical_hash(packed: int) -> int:
+    """The 64-bit hash of the position's symmetry-reduced form."""
+    return min((packed >> (BITS * s)) & MASK for s in range(SYMMETRY_COUNT))